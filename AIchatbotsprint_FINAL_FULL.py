@@ -1,9 +1,39 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import base64
-from io import BytesIO
+from charts import (
+    MEMBER_CHART_LIMIT,
+    TIMELINE_DETAIL_LIMIT,
+    cached_plotly,
+    cached_png,
+    capacity_utilization_figure,
+    priority_distribution_figure,
+    sprint_capacity_png,
+    task_timeline_figure,
+    timeline_blocks_figure,
+)
+from plan_metrics import (
+    cube_priority_counts,
+    cube_sprint_totals,
+    member_capacity_frame,
+    plan_cube,
+    plan_hash,
+    timeline_blocks,
+    timeline_frame,
+    top_n_with_others,
+)
+from exports import (
+    EXPORT_FORMATS,
+    export_filename,
+    file_format,
+    lazy_export,
+    plan_bundle_bytes,
+    plan_workbook_bytes,
+    task_export_bytes,
+)
+from column_mapping import resolve_column_mapping
+from ingest import TASK_FILE_TYPES, load_task_upload, read_task_header
+from reports import REPORT_FORMATS, plan_report
+from task_table import get_task_index, show_task_table
 from datetime import datetime, timedelta
 import requests
 import json
@@ -165,26 +195,6 @@ def run_sprint_planner():
         
         return results
     
-    # Helper functions
-    def to_excel(df):
-        """Convert DataFrame to Excel bytes"""
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Tasks')
-        return output.getvalue()
-    
-    def get_download_link(df, filename, format_type):
-        """Generate a download link for dataframe"""
-        if format_type == 'excel':
-            data = to_excel(df)
-            b64 = base64.b64encode(data).decode()
-            href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="{filename}" class="download-link">Download Excel File</a>'
-        elif format_type == 'csv':
-            csv = df.to_csv(index=False)
-            b64 = base64.b64encode(csv.encode()).decode()
-            href = f'<a href="data:text/csv;base64,{b64}" download="{filename}" class="download-link">Download CSV File</a>'
-        return href
-    
     # Title and description
     st.title("Sprint Task Planner")
     st.markdown("""
@@ -209,40 +219,62 @@ def run_sprint_planner():
         st.header("Upload Task Data")
         
         # File upload
-        uploaded_file = st.file_uploader("Upload your CSV file with tasks", type=["csv"])
+        uploaded_file = st.file_uploader("Upload your task file (CSV, Parquet or Feather)", type=TASK_FILE_TYPES)
         
         if uploaded_file is not None:
             try:
-                # Load data
-                df = pd.read_csv(uploaded_file)
+                upload_format = file_format(uploaded_file.name)
+                
+                # Resolve the column mapping once per uploaded file
+                known_mapping = st.session_state.get("column_mapping")
+                if known_mapping is None or known_mapping[0] != uploaded_file.file_id:
+                    header = read_task_header(uploaded_file.getvalue(), upload_format)
+                    known_mapping = (uploaded_file.file_id, resolve_column_mapping(header)[1])
+                    st.session_state.column_mapping = known_mapping
+                column_mapping = known_mapping[1]
+                if column_mapping:
+                    st.caption("Columns read as: " + ", ".join(f"{name} → {target}" for name, target in column_mapping.items()))
+                
+                # Parsed uploads are cached by content hash; the same selected file is only hashed once
+                known_upload = st.session_state.get("task_upload")
+                new_upload = known_upload is None or known_upload[0] != uploaded_file.file_id
+                upload_key, parsed = load_task_upload(
+                    uploaded_file.getvalue(),
+                    key=None if new_upload else known_upload[1],
+                    file_format=upload_format,
+                    column_mapping=column_mapping
+                )
+                
+                # Store the active tasks once per upload, so later edits to the task list are kept
+                if new_upload:
+                    st.session_state.task_upload = (uploaded_file.file_id, upload_key)
+                    if parsed["df"] is not None:
+                        st.session_state.df_tasks = parsed["df"]
                 
                 # Preview data
                 st.subheader("Data Preview")
-                st.dataframe(df.head(10), use_container_width=True)
+                st.dataframe(parsed["preview"], use_container_width=True)
                 
                 # Check if required columns are present
-                required_columns = ["ID", "Title", "Priority", "Original Estimates"]
-                missing_columns = [col for col in required_columns if col not in df.columns]
+                missing_columns = parsed["missing_columns"]
                 
                 if missing_columns:
                     st.error(f"Missing required columns: {', '.join(missing_columns)}")
                 else:
-                    # Process the data
-                    # Filter out completed tasks
-                    if "State" in df.columns:
-                        df = df[df["State"].str.lower() != "done"]
-                    
-                    # Store the filtered data
-                    st.session_state.df_tasks = df
+                    # Tasks left out of planning by validation
+                    if parsed["summary"]["quarantined"]:
+                        st.warning(f"{parsed['summary']['quarantined']} tasks were quarantined (missing or duplicate ID, or no positive estimate)")
+                        with st.expander("Validation Report"):
+                            st.dataframe(parsed["issues"], use_container_width=True, hide_index=True)
                     
                     # Show some statistics
-                    total_tasks = len(df)
+                    total_tasks = parsed["summary"]["total_tasks"]
                     
                     # Count priority levels
-                    priority_counts = df["Priority"].value_counts().to_dict()
+                    priority_counts = parsed["summary"]["priority_counts"]
                     
                     # Calculate total estimate
-                    total_estimate = df["Original Estimates"].sum()
+                    total_estimate = parsed["summary"]["total_estimate"]
                     
                     # Display stats in columns
                     col1, col2, col3 = st.columns(3)
@@ -713,6 +745,7 @@ def run_sprint_planner():
                             "assigned_hours": assigned_hours,
                             "assigned_priorities": assigned_priorities,
                             "team_members": team_members,
+                            "cube": plan_cube(df),
                             "sprint_data": {
                                 "sprint_assignments": sprint_assignments,
                                 "sprint_capacities": sprint_capacities,
@@ -733,8 +766,13 @@ def run_sprint_planner():
             results = st.session_state.results
             df = results["df"]
             assigned_hours = results["assigned_hours"]
-            assigned_priorities = results["assigned_priorities"]
             team_members = results["team_members"]
+            plan_key = plan_hash(df, team_members, num_sprints=results.get("sprint_data", {}).get("num_sprints"))
+            
+            # Sprint x member x priority aggregates; results from older sessions are built here once
+            if "cube" not in results:
+                results["cube"] = plan_cube(df)
+            cube = results["cube"]
             
             # Assignment summary
             st.subheader("Summary")
@@ -754,124 +792,84 @@ def run_sprint_planner():
             with col3:
                 st.metric("Capacity Utilized", f"{percent_utilized:.1f}%")
                 
-            # Detailed results
+            # Detailed results, filtered and paged on the server
             st.subheader("Assigned Tasks")
-            st.dataframe(
-                df,
-                column_config={
-                    "Priority": st.column_config.Column(
-                        "Priority",
-                        help="Task priority level",
-                        width="medium",
-                    ),
-                    "Original Estimates": st.column_config.NumberColumn(
-                        "Hours",
-                        help="Estimated work hours",
-                        format="%.1f",
-                    ),
-                    "Assigned To": st.column_config.Column(
-                        "Assigned To",
-                        help="Team member assigned to the task",
-                        width="medium",
-                    ),
-                    "Sprint": st.column_config.Column(
-                        "Sprint",
-                        help="Sprint assignment",
-                        width="medium",
-                    ),
-                },
-                use_container_width=True
-            )
+            task_index = get_task_index(plan_key, df)
+            task_column_config = {
+                "Priority": st.column_config.Column(
+                    "Priority",
+                    help="Task priority level",
+                    width="medium",
+                ),
+                "Original Estimates": st.column_config.NumberColumn(
+                    "Hours",
+                    help="Estimated work hours",
+                    format="%.1f",
+                ),
+                "Assigned To": st.column_config.Column(
+                    "Assigned To",
+                    help="Team member assigned to the task",
+                    width="medium",
+                ),
+                "Sprint": st.column_config.Column(
+                    "Sprint",
+                    help="Sprint assignment",
+                    width="medium",
+                ),
+            }
+            show_task_table(task_index, "results_tasks", task_column_config)
             
             # Visualizations
             st.subheader("Capacity Utilization")
             
             # Prepare data for visualization
             members = list(team_members.keys())
-            capacities = [team_members[m] for m in members]
-            used_capacities = [assigned_hours[m] for m in members]
-            remaining_capacities = [capacities[i] - used_capacities[i] for i in range(len(members))]
-            
-            # Create capacity chart with dark theme
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 5))
-            bar_width = 0.35
-            x = np.arange(len(members))
+            members_shown = MEMBER_CHART_LIMIT
+            if len(members) > MEMBER_CHART_LIMIT:
+                members_shown = st.slider("Members shown individually", 5, len(members), MEMBER_CHART_LIMIT, key="members_shown")
+                st.caption("Member charts group everyone else into one \"Others\" bar.")
             
-            # Use more vibrant colors for dark theme
-            ax.bar(x, used_capacities, bar_width, label='Used', color='#81c784')
-            ax.bar(x, remaining_capacities, bar_width, bottom=used_capacities, label='Remaining', color='#455a64')
+            capacity = member_capacity_frame(cube, team_members)
             
-            ax.set_ylabel('Hours', color='#e0e0e0')
-            ax.set_title('Overall Capacity Utilization by Team Member', color='#81c784')
-            ax.set_xticks(x)
-            ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-            ax.tick_params(axis='y', colors='#e0e0e0')
-            ax.spines['bottom'].set_color('#555555')
-            ax.spines['top'].set_color('#555555')
-            ax.spines['left'].set_color('#555555')
-            ax.spines['right'].set_color('#555555')
-            ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-            ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
+            # Create interactive capacity chart, largest capacities first when grouped
+            fig = cached_plotly(
+                ("capacity", plan_key, members_shown),
+                capacity_utilization_figure,
+                top_n_with_others(capacity[["Used", "Remaining"]], members_shown, capacity["Capacity"])
+            )
+            st.plotly_chart(fig, use_container_width=True)
             
-            fig.patch.set_facecolor('#1e1e1e')
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Charts drawn on this tab are reused by the plan report
+            report_charts = [("Capacity Utilization", fig)]
             
             # Priority distribution
             st.subheader("Priority Distribution")
             
             # Prepare data for priority chart
-            priorities = ["high", "medium", "low", "other"]
-            priority_data = {member: [assigned_priorities[member].get(p, 0) for p in priorities] for member in members}
-            
-            # Create stacked bar chart with dark theme
-            # We're already using dark_background style from the previous chart
-            fig, ax = plt.subplots(figsize=(10, 5))
-            bottom = np.zeros(len(members))
-            
-            # Enhanced colors for better visibility on dark background
-            colors = {'high': '#ef5350', 'medium': '#ffb74d', 'low': '#81c784', 'other': '#b0bec5'}
-            
-            for i, priority in enumerate(priorities):
-                priority_counts = [priority_data[member][i] for member in members]
-                ax.bar(members, priority_counts, bottom=bottom, label=priority.capitalize(), color=colors[priority])
-                bottom += priority_counts
+            priority_counts = cube_priority_counts(cube, members)
             
-            ax.set_ylabel('Number of Tasks', color='#e0e0e0')
-            ax.set_title('Overall Priority Distribution by Team Member', color='#81c784')
-            ax.set_xticks(range(len(members)))
-            ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-            ax.tick_params(axis='y', colors='#e0e0e0')
-            ax.spines['bottom'].set_color('#555555')
-            ax.spines['top'].set_color('#555555')
-            ax.spines['left'].set_color('#555555')
-            ax.spines['right'].set_color('#555555')
-            ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-            ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
-            
-            fig.patch.set_facecolor('#1e1e1e')
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Create stacked bar chart, members with the most tasks first when grouped
+            fig = cached_plotly(
+                ("priority", plan_key, members_shown),
+                priority_distribution_figure,
+                top_n_with_others(priority_counts, members_shown, priority_counts.sum(axis=1)),
+                'Overall Priority Distribution by Team Member'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            report_charts.append(("Priority Distribution", fig))
             
             # Add detailed priority distribution as tables
             st.subheader("Detailed Priority Mix by Team Member")
             st.write("This table shows exactly how many tasks of each priority level were assigned to each team member:")
             
             # Create a dataframe showing the priority distribution
-            priority_df = pd.DataFrame(assigned_priorities).T
+            priority_df = priority_counts.rename(columns=str.capitalize)
             priority_df.index.name = "Team Member"
-            priority_df.columns = [col.capitalize() for col in priority_df.columns]
             
             # Add percentage columns to show proportion of each priority
-            for member in priority_df.index:
-                total = priority_df.loc[member].sum()
-                if total > 0:
-                    for col in priority_df.columns:
-                        priority_df.loc[member, f"{col} %"] = round(priority_df.loc[member, col] / total * 100, 1)
-                else:
-                    for col in priority_df.columns:
-                        priority_df.loc[member, f"{col} %"] = 0.0
+            member_totals = priority_df.sum(axis=1)
+            priority_shares = priority_df.div(member_totals.where(member_totals > 0), axis=0).mul(100).round(1).fillna(0.0)
+            priority_df = pd.concat([priority_df, priority_shares.add_suffix(" %")], axis=1)
             
             # Display the dataframe
             st.dataframe(priority_df, use_container_width=True)
@@ -918,27 +916,29 @@ def run_sprint_planner():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Create sprint tabs for detailed view
-                sprint_tabs = st.tabs([f"Sprint {i}" for i in range(1, num_sprints + 1)])
+                # Per-sprint totals from the plan cube
+                sprint_names = [f"Sprint {i}" for i in range(1, num_sprints + 1)]
+                sprint_totals = cube_sprint_totals(cube, sprint_names)
                 
-                for i, sprint_tab in enumerate(sprint_tabs):
-                    sprint_name = f"Sprint {i+1}"
+                # Only the selected sprint is computed and drawn, so reruns do not grow with the sprint count
+                sprint_name = st.radio("Sprint", sprint_names, horizontal=True, key="results_sprint")
+                i = sprint_names.index(sprint_name)
+                
+                with st.container(border=True):
+                    st.subheader(f"{sprint_name} Assignments")
                     
-                    with sprint_tab:
-                        st.subheader(f"{sprint_name} Assignments")
-                        
-                        # Sprint Statistics
-                        sprint_tasks = df[df["Sprint"] == sprint_name]
-                        
-                        if len(sprint_tasks) == 0:
-                            st.info(f"No tasks assigned to {sprint_name}.")
-                            continue
+                    # Sprint Statistics
+                    sprint_task_count = int(sprint_totals.at[sprint_name, "Tasks"])
+                    
+                    if sprint_task_count == 0:
+                        st.info(f"No tasks assigned to {sprint_name}.")
+                    else:
                         
                         # Display key metrics for this sprint
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            st.metric("Tasks", len(sprint_tasks))
+                            st.metric("Tasks", sprint_task_count)
                         
                         with col2:
                             sprint_hours = sum(sprint_capacities[sprint_name].values())
@@ -952,27 +952,7 @@ def run_sprint_planner():
                         
                         # Tasks assigned to this sprint
                         st.subheader("Tasks")
-                        st.dataframe(
-                            sprint_tasks,
-                            column_config={
-                                "Priority": st.column_config.Column(
-                                    "Priority",
-                                    help="Task priority level",
-                                    width="medium"
-                                ),
-                                "Original Estimates": st.column_config.NumberColumn(
-                                    "Hours",
-                                    help="Estimated work hours",
-                                    format="%.1f"
-                                ),
-                                "Assigned To": st.column_config.Column(
-                                    "Assigned To",
-                                    help="Team member assigned to the task",
-                                    width="medium"
-                                )
-                            },
-                            use_container_width=True
-                        )
+                        show_task_table(task_index, "sprint_tasks", task_column_config, sprint=sprint_name)
                         
                         # Create visualization of capacity used in this sprint
                         st.subheader("Sprint Capacity")
@@ -993,161 +973,112 @@ def run_sprint_planner():
                         else:
                             carried_over = [0] * len(members)
                         
-                        # Create sprint capacity chart
-                        plt.style.use('dark_background')
-                        fig, ax = plt.subplots(figsize=(10, 5))
-                        bar_width = 0.35
-                        x = np.arange(len(members))
-                        
                         # Member's standard capacity for this sprint
                         standard_capacity = [team_members[m] / num_sprints for m in members]
                         
-                        # Visualize standard capacity, carried over capacity, and used capacity
-                        ax.bar(x, standard_capacity, bar_width, label='Standard Capacity', color='#455a64', alpha=0.6)
-                        if any(c > 0 for c in carried_over):
-                            ax.bar(x, carried_over, bar_width, bottom=standard_capacity, label='Carried Over', color='#5c6bc0')
-                        ax.bar(x, sprint_used, bar_width/1.5, label='Used', color='#81c784')
-                        
-                        # Styling
-                        ax.set_ylabel('Hours', color='#e0e0e0')
-                        ax.set_title(f'{sprint_name} Capacity Utilization', color='#81c784')
-                        ax.set_xticks(x)
-                        ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-                        ax.tick_params(axis='y', colors='#e0e0e0')
-                        ax.spines['bottom'].set_color('#555555')
-                        ax.spines['top'].set_color('#555555')
-                        ax.spines['left'].set_color('#555555')
-                        ax.spines['right'].set_color('#555555')
-                        ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                        ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
-                        
-                        fig.patch.set_facecolor('#1e1e1e')
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        # Create sprint capacity chart
+                        st.image(cached_png(
+                            ("sprint_capacity", plan_key, sprint_name),
+                            sprint_capacity_png, members, standard_capacity, carried_over, sprint_used, sprint_name
+                        ))
                         
                         # Create priority breakdown for this sprint
                         st.subheader("Sprint Priority Distribution")
                         
-                        # Get priority distribution for this sprint
-                        sprint_priority_counts = {}
-                        for member in members:
-                            sprint_priority_counts[member] = {"high": 0, "medium": 0, "low": 0, "other": 0}
-                        
-                        for _, task in sprint_tasks.iterrows():
-                            member = task["Assigned To"]
-                            priority = task["Priority"].lower()
-                            if priority not in ["high", "medium", "low"]:
-                                priority = "other"
-                            sprint_priority_counts[member][priority] += 1
-                        
                         # Create stacked bar chart for sprint priority distribution
-                        priority_data = {m: [sprint_priority_counts[m].get(p, 0) for p in priorities] for m in members}
-                        
-                        fig, ax = plt.subplots(figsize=(10, 5))
-                        bottom = np.zeros(len(members))
-                        
-                        for i, priority in enumerate(priorities):
-                            priority_counts = [priority_data[member][i] for member in members]
-                            ax.bar(members, priority_counts, bottom=bottom, label=priority.capitalize(), color=colors[priority])
-                            bottom += priority_counts
-                        
-                        ax.set_ylabel('Number of Tasks', color='#e0e0e0')
-                        ax.set_title(f'{sprint_name} Priority Distribution', color='#81c784')
-                        ax.set_xticks(range(len(members)))
-                        ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-                        ax.tick_params(axis='y', colors='#e0e0e0')
-                        ax.spines['bottom'].set_color('#555555')
-                        ax.spines['top'].set_color('#555555')
-                        ax.spines['left'].set_color('#555555')
-                        ax.spines['right'].set_color('#555555')
-                        ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                        ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
-                        
-                        fig.patch.set_facecolor('#1e1e1e')
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        sprint_priority_counts = cube_priority_counts(cube, members, sprint_name)
+                        fig = cached_plotly(
+                            ("sprint_priority", plan_key, sprint_name, members_shown),
+                            priority_distribution_figure,
+                            top_n_with_others(sprint_priority_counts, members_shown, sprint_priority_counts.sum(axis=1)),
+                            f'{sprint_name} Priority Distribution'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
                 
                 # Create a Gantt chart visualization of tasks across sprints
                 st.header("Sprint Timeline")
                 
-                # Prepare data for Gantt chart
-                gantt_data = []
-                for _, task in df.iterrows():
-                    if task["Assigned To"] and task["Sprint"]:
-                        sprint_num = int(task["Sprint"].split(" ")[1])
-                        gantt_data.append({
-                            "Task": f"{task['ID']}: {task['Title']}",
-                            "Start": sprint_num,
-                            "Duration": 1,  # Each task takes 1 sprint
-                            "Member": task["Assigned To"],
-                            "Priority": task["Priority"]
-                        })
-                
-                if gantt_data:
-                    # Convert to DataFrame for easier plotting
-                    gantt_df = pd.DataFrame(gantt_data)
-                    
-                    # Sort by Member and Sprint
-                    gantt_df = gantt_df.sort_values(["Member", "Start"])
-                    
-                    # Create figure and axes - adjust height based on task count
-                    max_height = max(8, min(20, len(gantt_df) * 0.3))  # Limit max height 
-                    fig, ax = plt.subplots(figsize=(12, max_height))
-                    
-                    # Plot each task as a horizontal bar
-                    y_pos = np.arange(len(gantt_df))
-                    
-                    # Use colors based on priority
-                    task_colors = [colors.get(task["Priority"].lower(), colors.get("other")) for _, task in gantt_df.iterrows()]
-                    
-                    # Plot bars
-                    ax.barh(y_pos, gantt_df["Duration"], left=gantt_df["Start"], color=task_colors, alpha=0.9)
-                    
-                    # Add vertical lines for sprint boundaries
-                    for sprint in range(1, num_sprints + 1):
-                        ax.axvline(sprint, color='white', linestyle='--', alpha=0.3)
-                    
-                    # Set y-axis labels to task names
-                    ax.set_yticks(y_pos)
-                    ax.set_yticklabels(gantt_df["Task"], fontsize=8, color='#e0e0e0')
-                    
-                    # Set x-axis labels to sprint numbers
-                    ax.set_xticks(range(1, num_sprints + 2))
-                    ax.set_xticklabels([f"Sprint {i}" for i in range(1, num_sprints + 2)], color='#e0e0e0')
-                    
-                    # Add member name annotations
-                    for i, (_, task) in enumerate(gantt_df.iterrows()):
-                        ax.text(task["Start"] + 0.5, i, task["Member"], 
-                               ha='center', va='center', color='#1e1e1e', fontweight='bold')
-                    
-                    # Add labels
-                    ax.set_xlabel('Sprints', color='#e0e0e0')
-                    ax.set_title('Task Timeline Across Sprints', color='#81c784')
-                    
-                    # Style the chart
-                    ax.tick_params(axis='x', colors='#e0e0e0')
-                    ax.spines['bottom'].set_color('#555555')
-                    ax.spines['top'].set_color('#555555')
-                    ax.spines['left'].set_color('#555555')
-                    ax.spines['right'].set_color('#555555')
-                    ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                    
-                    fig.patch.set_facecolor('#1e1e1e')
-                    plt.tight_layout()
-                    st.pyplot(fig)
+                timeline = timeline_frame(df)
+
+                if not timeline.empty:
+                    blocks = timeline_blocks(timeline)
+
+                    if len(timeline) > TIMELINE_DETAIL_LIMIT:
+                        st.caption(f"{len(timeline)} assigned tasks: showing hours per member and sprint. "
+                                   "Use the drill-down below to list the tasks in a block.")
+                        timeline_view = "Member × Sprint"
+                    else:
+                        timeline_view = st.radio("Timeline view", ["Tasks", "Member × Sprint"], horizontal=True, key="timeline_view")
+
+                    if timeline_view == "Tasks":
+                        fig = cached_plotly(("timeline", plan_key, num_sprints), task_timeline_figure, timeline, num_sprints)
+                    else:
+                        fig = cached_plotly(("timeline_blocks", plan_key, num_sprints), timeline_blocks_figure, blocks, num_sprints)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    with st.expander("Drill down into tasks"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            drill_member = st.selectbox("Team member", ["All"] + blocks["Member"].unique().tolist(), key="timeline_member")
+                        with col2:
+                            drill_sprint = st.selectbox("Sprint", ["All"] + [f"Sprint {i}" for i in blocks["Start"].unique()], key="timeline_sprint")
+
+                        mask = pd.Series(True, index=timeline.index)
+                        if drill_member != "All":
+                            mask &= timeline["Member"] == drill_member
+                        if drill_sprint != "All":
+                            mask &= timeline["Start"] == int(drill_sprint.split(" ")[1])
+
+                        drill_tasks = timeline.loc[mask, ["ID", "Task", "Member", "Start", "Priority", "Hours"]]
+                        st.write(f"{len(drill_tasks)} tasks, {drill_tasks['Hours'].sum():.1f} hours")
+                        st.dataframe(drill_tasks.rename(columns={"Start": "Sprint"}), hide_index=True, use_container_width=True)
                 else:
                     st.info("No tasks have been assigned to sprints yet.")
             
             # Download options
             st.subheader("Export Results")
             
-            col1, col2 = st.columns(2)
+            # Files are generated only when a download is requested and cached by plan hash
+            st.download_button(
+                "Download Excel Workbook",
+                lazy_export(
+                    plan_key, "excel", plan_workbook_bytes,
+                    df, cube, team_members, results.get("sprint_data", {}).get("sprint_assignments")
+                ),
+                file_name="Task_Assignments.xlsx",
+                mime=EXPORT_FORMATS["excel"][1],
+                help="Capacity and priority mix summaries plus one sheet per sprint"
+            )
+            for col, fmt in zip(st.columns(3), ["csv", "parquet", "feather"]):
+                with col:
+                    st.download_button(
+                        f"Download {'CSV' if fmt == 'csv' else fmt.title()}",
+                        lazy_export(plan_key, fmt, task_export_bytes, df, fmt),
+                        file_name=export_filename("Task_Assignments", fmt),
+                        mime=EXPORT_FORMATS[fmt][1]
+                    )
             
-            with col1:
-                st.markdown(get_download_link(df, "Task_Assignments.xlsx", "excel"), unsafe_allow_html=True)
+            # Summary, tables and the charts above in one document
+            if "sprint_data" in results:
+                for col, fmt in zip(st.columns(2), ["markdown", "html"]):
+                    with col:
+                        st.download_button(
+                            f"Download Report ({'Markdown' if fmt == 'markdown' else 'HTML'})",
+                            lazy_export((plan_key, members_shown), fmt, plan_report, results, fmt, report_charts),
+                            file_name="Sprint_Plan_Report" + REPORT_FORMATS[fmt][0],
+                            mime=REPORT_FORMATS[fmt][1]
+                        )
                 
-            with col2:
-                st.markdown(get_download_link(df, "Task_Assignments.csv", "csv"), unsafe_allow_html=True)
+                # Every artifact above plus per-sprint CSVs, charts and metrics in one zip
+                st.download_button(
+                    "Download All (zip)",
+                    lazy_export(
+                        (plan_key, members_shown, None), "zip", plan_bundle_bytes,
+                        plan_key, results, (plan_key, members_shown), report_charts
+                    ),
+                    file_name="Sprint_Plan_Export.zip",
+                    mime="application/zip"
+                )
     
     # 5. AZURE DEVOPS TAB
     with azure_tab:
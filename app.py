@@ -2,8 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import io
-import base64
-import matplotlib.pyplot as plt
+
+from charts import managed_figure
+from exports import lazy_export, task_export_bytes
+from plan_metrics import content_hash
+from reports import REPORT_FORMATS, retro_report
 
 def run_retrospective():
 
@@ -99,13 +102,6 @@ def run_retrospective():
         }
         return pd.DataFrame(data)
     
-    def generate_download_link(df, filename, link_text):
-        """Generate a download link for a DataFrame as CSV"""
-        csv = df.to_csv(index=False)
-        b64 = base64.b64encode(csv.encode()).decode()
-        href = f'data:file/csv;base64,{b64}'
-        return f'<a href="{href}" download="{filename}">{link_text}</a>'
-    
     # Sidebar for file upload and filtering controls
     with st.sidebar:
         st.header("Controls")
@@ -215,45 +211,42 @@ def run_retrospective():
                     without_tasks = len(results_df) - with_tasks
                     
                     # Create pie chart for task association
-                    fig3, ax3 = plt.subplots(figsize=(8, 5))
-                    ax3.pie(
-                        [with_tasks, without_tasks],
-                        labels=["With Task ID", "Without Task ID"],
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        colors=['#4CAF50', '#FF9800']
-                    )
-                    ax3.set_title("Feedback Items With Task Association")
-                    ax3.axis('equal')
-                    st.pyplot(fig3)
+                    with managed_figure(figsize=(8, 5)) as (fig3, ax3):
+                        ax3.pie(
+                            [with_tasks, without_tasks],
+                            labels=["With Task ID", "Without Task ID"],
+                            autopct='%1.1f%%',
+                            startangle=90,
+                            colors=['#4CAF50', '#FF9800']
+                        )
+                        ax3.set_title("Feedback Items With Task Association")
+                        ax3.axis('equal')
+                        st.pyplot(fig3)
                     
                     # Export options
                     st.subheader("Export Results")
-                    export_format = st.radio("Select export format:", ["CSV", "Markdown"])
+                    export_format = st.radio("Select export format:", ["CSV", "Markdown", "HTML"])
                     
+                    # Files are generated only when a download is requested
+                    feedback_key = content_hash(results_df)
                     if export_format == "CSV":
-                        csv = results_df.to_csv(index=False)
                         st.download_button(
                             label="Download CSV",
-                            data=csv,
+                            data=lazy_export(feedback_key, "csv", task_export_bytes, results_df, "csv"),
                             file_name="retrospective_analysis.csv",
                             mime="text/csv"
                         )
-                    else:  # Markdown
-                        # Generate markdown content
-                        markdown_content = "# Retrospective Analysis Results\n\n"
-                        markdown_content += f"Filter settings: Min votes: {min_votes}, Max votes: {max_votes}\n\n"
-                        markdown_content += "## Consolidated Feedback\n\n"
-                        
-                        for _, row in results_df.iterrows():
-                            task_info = f" - Task #{row['Task ID']}" if row['Task ID'] != "None" else ""
-                            markdown_content += f"- {row['Feedback']} ({row['Votes']} votes){task_info}\n"
-                        
+                    else:  # Markdown or HTML report with the charts above
+                        report_format = export_format.lower()
+                        retro_charts = [("Top Feedback Items", fig), ("Vote Distribution", vote_distribution)]
                         st.download_button(
-                            label="Download Markdown",
-                            data=markdown_content,
-                            file_name="retrospective_analysis.md",
-                            mime="text/markdown"
+                            label=f"Download {export_format}",
+                            data=lazy_export(
+                                (feedback_key, min_votes, max_votes), report_format,
+                                retro_report, results_df, min_votes, max_votes, report_format, retro_charts
+                            ),
+                            file_name="retrospective_analysis" + REPORT_FORMATS[report_format][0],
+                            mime=REPORT_FORMATS[report_format][1]
                         )
     
     # Footer with instructions
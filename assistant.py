@@ -0,0 +1,134 @@
+import json
+
+import pandas as pd
+import requests
+
+from ingest import EXPERTISE_COMPONENT_COLUMN, EXPERTISE_MEMBER_COLUMN
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+ASSISTANT_MODEL = "openai/gpt-3.5-turbo"
+
+
+def expertise_map(df):
+    """Member to component expertise mapping embedded in the task export, if present"""
+    if EXPERTISE_MEMBER_COLUMN not in df.columns or EXPERTISE_COMPONENT_COLUMN not in df.columns:
+        return {}
+    expertise = df[[EXPERTISE_MEMBER_COLUMN, EXPERTISE_COMPONENT_COLUMN]].dropna()
+    return dict(zip(expertise[EXPERTISE_MEMBER_COLUMN], expertise[EXPERTISE_COMPONENT_COLUMN]))
+
+
+def annotate_component_mismatches(df, expertise_dict):
+    """
+    Add Component (parsed from titles like "Comp1: ...") and Mismatch columns.
+
+    A task is a mismatch when its assignee has a known expertise that differs from the task's component.
+    """
+    df = df.copy()
+    if "Title" in df.columns:
+        df["Component"] = df["Title"].str.extract(r"(Comp\d+)", expand=False)
+    elif "Component" not in df.columns:
+        df["Component"] = pd.NA
+    if "Assigned To" not in df.columns:
+        df["Assigned To"] = ""
+
+    df["Assigned To"] = df["Assigned To"].fillna("").astype(str).str.strip()
+    member_expertise = df["Assigned To"].map(expertise_dict)
+    df["Mismatch"] = (member_expertise.notna() & df["Component"].notna() & (member_expertise != df["Component"])).astype(bool)
+    return df
+
+
+def fix_component_mismatches(df, mismatches, expertise_dict):
+    """
+    Reassign mismatched tasks to the first member whose expertise is the task's component.
+
+    Returns:
+        (updated DataFrame, number of tasks reassigned)
+    """
+    component_owner = {}
+    for member, component in expertise_dict.items():
+        component_owner.setdefault(component, member)
+
+    new_owner = mismatches["Component"].map(component_owner).dropna()
+    df = df.copy()
+    df.loc[new_owner.index, "Assigned To"] = new_owner
+    return df, len(new_owner)
+
+
+def sprint_assistant_context(df, expertise_dict, mismatches):
+    """System prompt for the sprint planning assistant, without the user's question"""
+    lines = [
+        "You are an expert sprint planning assistant.",
+        "",
+        f"There are {len(df)} tasks. Component expertise is as follows:"
+    ]
+    lines += [f"- {member} specializes in {component}" for member, component in expertise_dict.items()]
+
+    if not mismatches.empty:
+        lines.append("\n⚠️ Detected mismatches:")
+        lines += (
+            "- Task '" + mismatches["Title"].astype(str) + "' assigned to " + mismatches["Assigned To"]
+            + " but it's " + mismatches["Component"].astype(str)
+        ).tolist()
+
+    return "\n".join(lines) + "\n"
+
+
+def retro_assistant_context(feedback_df):
+    """System prompt for the retrospective assistant listing every feedback item"""
+    task_suffix = (" [Task ID: " + feedback_df["Task ID"] + "]").where(feedback_df["Task ID"] != "None", "")
+    items = "- " + feedback_df["Feedback"].astype(str) + " (" + feedback_df["Votes"].astype(str) + " votes)" + task_suffix
+    return "You are a helpful assistant summarizing retrospective feedback:\n" + "".join(item + "\n" for item in items)
+
+
+def stream_chat_completion(api_key, context, messages, on_text):
+    """
+    Stream a chat completion from OpenRouter.
+
+    Args:
+        api_key: OpenRouter API key
+        context: System prompt
+        messages: Chat history; assistant turns are not sent back
+        on_text: Called with the response text so far after every received chunk
+
+    Returns:
+        Full response text, or an error description
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": "https://localhost",
+        "Content-Type": "application/json"
+    }
+
+    body = {
+        "model": ASSISTANT_MODEL,
+        "messages": [{"role": "system", "content": context}] +
+                    [msg for msg in messages if msg["role"] != "assistant"],
+        "temperature": 0.7,
+        "max_tokens": 1500,
+        "stream": True
+    }
+
+    full_response = ""
+    try:
+        with requests.post(OPENROUTER_URL, headers=headers, json=body, stream=True) as response:
+            if response.status_code != 200:
+                return f"Error: {response.status_code} - {response.text}"
+            for chunk in response.iter_lines():
+                if not chunk:
+                    continue
+                chunk_str = chunk.decode("utf-8")
+                if not chunk_str.startswith("data:"):
+                    continue
+                try:
+                    data = json.loads(chunk_str[5:])
+                except json.JSONDecodeError:
+                    continue
+                if data.get("choices"):
+                    delta = data["choices"][0].get("delta", {})
+                    if "content" in delta:
+                        full_response += delta["content"]
+                        on_text(full_response)
+    except Exception as e:
+        full_response = f"An error occurred: {str(e)}"
+
+    return full_response
@@ -0,0 +1,368 @@
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from bounded_cache import BoundedLRUCache
+from plan_metrics import PRIORITY_LEVELS
+
+# Dark theme palette shared by all result charts
+TEXT_COLOR = '#e0e0e0'
+TITLE_COLOR = '#81c784'
+SPINE_COLOR = '#555555'
+GRID_COLOR = '#333333'
+FIGURE_COLOR = '#1e1e1e'
+LEGEND_STYLE = {'facecolor': '#2d2d2d', 'edgecolor': '#555555', 'labelcolor': '#e0e0e0'}
+
+PRIORITY_COLORS = {'high': '#ef5350', 'medium': '#ffb74d', 'low': '#81c784', 'other': '#b0bec5'}
+
+# Rendered charts, shared by every session served by this process
+chart_cache = BoundedLRUCache(max_entries=256, max_bytes=128 * 1024 * 1024)
+
+# pyplot and style contexts are global state; figures are drawn one at a time across threads
+matplotlib_lock = threading.RLock()
+
+# Member charts group everyone past this many members into an "Others" bar
+MEMBER_CHART_LIMIT = 25
+
+# Above this many assigned tasks the timeline shows member x sprint blocks instead of one bar per task
+TIMELINE_DETAIL_LIMIT = 150
+
+
+@contextmanager
+def dark_figure(figsize=(10, 5)):
+    """
+    Create a dark-theme figure and close it when the block exits.
+
+    The dark style applies only inside the block, so it no longer leaks into
+    other charts through the global matplotlib state.
+
+    Yields:
+        (fig, ax) tuple
+    """
+    with matplotlib_lock, plt.style.context('dark_background'):
+        fig, ax = plt.subplots(figsize=figsize)
+        try:
+            yield fig, ax
+        finally:
+            plt.close(fig)
+
+
+@contextmanager
+def managed_figure(figsize=(8, 5)):
+    """Create a default-style figure and close it when the block exits"""
+    with matplotlib_lock:
+        fig, ax = plt.subplots(figsize=figsize)
+        try:
+            yield fig, ax
+        finally:
+            plt.close(fig)
+
+
+def style_dark_axes(ax, title, ylabel=None, xlabel=None, xticklabels=None, legend=True):
+    """Apply the shared dark styling to a chart's axes"""
+    if ylabel:
+        ax.set_ylabel(ylabel, color=TEXT_COLOR)
+    if xlabel:
+        ax.set_xlabel(xlabel, color=TEXT_COLOR)
+    ax.set_title(title, color=TITLE_COLOR)
+
+    if xticklabels is not None:
+        ax.set_xticks(range(len(xticklabels)))
+        ax.set_xticklabels(xticklabels, rotation=45, ha='right', color=TEXT_COLOR)
+
+    ax.tick_params(axis='x', colors=TEXT_COLOR)
+    ax.tick_params(axis='y', colors=TEXT_COLOR)
+    for spine in ax.spines.values():
+        spine.set_color(SPINE_COLOR)
+    ax.grid(color=GRID_COLOR, linestyle='-', linewidth=0.5, alpha=0.7)
+
+    if legend:
+        ax.legend(**LEGEND_STYLE)
+
+    ax.figure.patch.set_facecolor(FIGURE_COLOR)
+    ax.figure.tight_layout()
+
+
+def live_figure_count():
+    """Number of matplotlib figures currently held open by pyplot"""
+    return len(plt.get_fignums())
+
+
+def figure_png(fig, dpi=200, image_format='png'):
+    """Render a figure to PNG bytes the way st.pyplot does, or to another matplotlib format such as 'svg'"""
+    buffer = BytesIO()
+    fig.savefig(buffer, format=image_format, dpi=dpi, bbox_inches='tight', facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+def cached_png(key, render, *args, **kwargs):
+    """
+    PNG bytes of a matplotlib chart, cached by key.
+
+    Args:
+        key: Tuple identifying the chart: its name, the data content hash and chart parameters
+        render: Function returning PNG bytes, called with *args/**kwargs only on a cache miss
+    """
+    return chart_cache.get_or_create(('png',) + tuple(key), lambda: render(*args, **kwargs))
+
+
+def cached_plotly(key, build, *args, **kwargs):
+    """
+    Plotly figure cached as figure JSON by key.
+
+    Args:
+        key: Tuple identifying the chart: its name, the data content hash and chart parameters
+        build: Function returning a plotly figure, called with *args/**kwargs only on a cache miss
+    """
+    figure_json = chart_cache.get_or_create(('plotly',) + tuple(key), lambda: build(*args, **kwargs).to_json())
+    return pio.from_json(figure_json)
+
+
+# Results tab charts
+
+def capacity_utilization_figure(capacity):
+    """
+    Stacked used/remaining hours per member.
+
+    Args:
+        capacity: DataFrame indexed by member with Used and Remaining columns
+    """
+    fig = go.Figure()
+    fig.add_bar(x=capacity.index, y=capacity["Used"].to_numpy(), name="Used", marker_color='#81c784')
+    fig.add_bar(x=capacity.index, y=capacity["Remaining"].to_numpy(), name="Remaining", marker_color='#455a64')
+    fig.update_layout(
+        title="Overall Capacity Utilization by Team Member",
+        barmode='stack',
+        yaxis_title="Hours",
+        hovermode='x unified'
+    )
+    return fig
+
+
+def priority_distribution_figure(priority_counts, title):
+    """
+    Stacked task counts per priority level for each member.
+
+    Args:
+        priority_counts: Member x priority DataFrame, as returned by plan_metrics.cube_priority_counts
+        title: Chart title
+    """
+    fig = go.Figure()
+    for priority in PRIORITY_LEVELS:
+        fig.add_bar(
+            x=priority_counts.index,
+            y=priority_counts[priority].to_numpy(),
+            name=priority.capitalize(),
+            marker_color=PRIORITY_COLORS[priority]
+        )
+    fig.update_layout(title=title, barmode='stack', yaxis_title="Number of Tasks", hovermode='x unified')
+    return fig
+
+
+def sprint_capacity_png(members, standard_capacity, carried_over, sprint_used, sprint_name, image_format='png'):
+    """Standard, carried over and used hours per member for one sprint"""
+    with dark_figure() as (fig, ax):
+        bar_width = 0.35
+        x = np.arange(len(members))
+
+        # Visualize standard capacity, carried over capacity, and used capacity
+        ax.bar(x, standard_capacity, bar_width, label='Standard Capacity', color='#455a64', alpha=0.6)
+        if any(c > 0 for c in carried_over):
+            ax.bar(x, carried_over, bar_width, bottom=standard_capacity, label='Carried Over', color='#5c6bc0')
+        ax.bar(x, sprint_used, bar_width/1.5, label='Used', color='#81c784')
+
+        style_dark_axes(ax, f'{sprint_name} Capacity Utilization', ylabel='Hours', xticklabels=members)
+        return figure_png(fig, image_format=image_format)
+
+
+def task_timeline_figure(timeline, num_sprints):
+    """
+    Interactive timeline with one bar per task, coloured by priority.
+
+    Args:
+        timeline: Output of plan_metrics.timeline_frame
+        num_sprints: Number of planned sprints
+    """
+    fig = go.Figure()
+    for priority in PRIORITY_LEVELS:
+        tasks = timeline[timeline["Bucket"] == priority]
+        if tasks.empty:
+            continue
+        fig.add_bar(
+            y=tasks["Task"],
+            x=tasks["Duration"],
+            base=tasks["Start"],
+            orientation='h',
+            name=priority.capitalize(),
+            marker_color=PRIORITY_COLORS[priority],
+            text=tasks["Member"],
+            textposition='inside',
+            insidetextanchor='middle',
+            customdata=tasks[["Member", "Priority", "Hours"]],
+            hovertemplate="%{y}<br>%{customdata[0]} · Priority %{customdata[1]} · %{customdata[2]:.1f}h<extra></extra>"
+        )
+
+    for sprint in range(1, num_sprints + 2):
+        fig.add_vline(x=sprint, line_dash="dash", opacity=0.3)
+
+    fig.update_layout(
+        title="Task Timeline Across Sprints",
+        barmode='overlay',
+        height=max(400, 22 * len(timeline) + 120),
+        xaxis={
+            "tickvals": [sprint + 0.5 for sprint in range(1, num_sprints + 1)],
+            "ticktext": [f"Sprint {sprint}" for sprint in range(1, num_sprints + 1)],
+            "range": [1, num_sprints + 1]
+        },
+        # Keep tasks grouped by member and sprint, top to bottom
+        yaxis={"categoryorder": "array", "categoryarray": timeline["Task"].tolist()[::-1]}
+    )
+    return fig
+
+
+def timeline_blocks_figure(blocks, num_sprints):
+    """
+    Member x sprint heatmap of assigned hours, used when there are too many tasks to draw one bar each.
+
+    Args:
+        blocks: Output of plan_metrics.timeline_blocks
+        num_sprints: Number of planned sprints
+    """
+    sprints = range(1, num_sprints + 1)
+    hours = blocks.pivot(index="Member", columns="Start", values="Hours").reindex(columns=sprints).fillna(0)
+    counts = blocks.pivot(index="Member", columns="Start", values="Tasks").reindex(columns=sprints).fillna(0)
+
+    fig = go.Figure(go.Heatmap(
+        z=hours.to_numpy(),
+        x=[f"Sprint {sprint}" for sprint in sprints],
+        y=hours.index.tolist(),
+        customdata=counts.to_numpy(),
+        colorscale="Greens",
+        colorbar={"title": "Hours"},
+        texttemplate="%{customdata:.0f} tasks<br>%{z:.0f}h",
+        hovertemplate="%{y} · %{x}<br>%{customdata:.0f} tasks, %{z:.1f} hours<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Assigned Hours per Member and Sprint",
+        height=max(350, 40 * len(hours) + 120),
+        yaxis={"autorange": "reversed"}
+    )
+    return fig
+
+
+def burndown_figure(burndown_df):
+    """Projected daily burndown per sprint with dotted ideal lines"""
+    fig = px.line(
+        burndown_df,
+        x="Day",
+        y="Remaining",
+        color="Sprint",
+        markers=True,
+        title="Projected Daily Burndown per Sprint",
+        labels={"Remaining": "Remaining Hours", "Day": "Working Day"}
+    )
+    for sprint_name, ideal in burndown_df.groupby("Sprint", sort=False):
+        fig.add_scatter(x=ideal["Day"], y=ideal["Ideal"], mode="lines", line={"dash": "dot", "width": 1},
+                        name=f"{sprint_name} ideal", showlegend=False, hoverinfo="skip")
+    return fig
+
+
+def burnup_figure(burnup_df, num_sprints, working_days):
+    """Projected cumulative completed hours against total scope"""
+    fig = px.line(
+        burnup_df,
+        x="Day",
+        y=["Completed", "Scope"],
+        title="Projected Cumulative Burnup Across Sprints",
+        labels={"value": "Hours", "Day": "Working Day", "variable": ""}
+    )
+    for sprint in range(1, num_sprints):
+        fig.add_vline(x=sprint * working_days + 0.5, line_dash="dash", opacity=0.3)
+    return fig
+
+
+# Insights charts
+
+def utilization_trend_figure(sprint_stats_df):
+    """Capacity utilization per sprint"""
+    fig = px.line(
+        sprint_stats_df,
+        x="Sprint",
+        y="Capacity Utilization (%)",
+        markers=True,
+        title="Team Capacity Utilization Trend",
+    )
+    fig.update_layout(yaxis_range=[0, 100])
+    return fig
+
+
+def velocity_figure(team_velocity):
+    """Completed team hours per past sprint followed by the forecast"""
+    return px.line(
+        team_velocity,
+        x="Sprint",
+        y="Hours",
+        color="Type",
+        markers=True,
+        title="Team Velocity and Forecast",
+    )
+
+
+def task_feedback_figure(task_feedback):
+    """Total retrospective votes per planned task"""
+    return px.bar(
+        task_feedback,
+        x="Task ID",
+        y="Votes",
+        title="Retrospective Feedback by Task",
+        labels={"Votes": "Total Votes", "Task ID": "Task ID"}
+    )
+
+
+# Retrospective charts
+
+def feedback_votes_figure(chart_data, min_votes, max_votes):
+    """Horizontal bar chart of the top feedback items"""
+    fig = px.bar(
+        chart_data,
+        x="Votes",
+        y="Feedback",
+        orientation='h',
+        title=f"Top Feedback Items by Vote Count (min: {min_votes}, max: {max_votes})",
+        color="Votes",
+        color_continuous_scale="Viridis"
+    )
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+def vote_distribution_figure(results_df):
+    """Histogram of votes per feedback item"""
+    return px.histogram(
+        results_df,
+        x="Votes",
+        nbins=20,
+        title="Distribution of Votes",
+        labels={"Votes": "Vote Count", "count": "Number of Feedback Items"}
+    )
+
+
+def task_association_png(with_tasks, without_tasks):
+    """Pie chart of feedback items with and without a task"""
+    with managed_figure(figsize=(8, 5)) as (fig, ax):
+        ax.pie(
+            [with_tasks, without_tasks],
+            labels=["With Task ID", "Without Task ID"],
+            autopct='%1.1f%%',
+            startangle=90,
+            colors=['#4CAF50', '#FF9800']
+        )
+        ax.set_title("Feedback Items With Task Association")
+        ax.axis('equal')
+        return figure_png(fig)
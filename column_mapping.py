@@ -0,0 +1,137 @@
+"""
+Header mapping for backlog exports whose columns are named differently from the planner schema.
+
+Headers are matched to the schema by alias and fuzzy string similarity. A confirmed mapping
+is stored per source under its header signature, so the next export with the same headers
+is mapped without any manual work.
+"""
+import hashlib
+import re
+import sqlite3
+from difflib import SequenceMatcher
+
+from plan_store import load_column_mapping
+
+# Planner column -> header spellings seen in Azure DevOps, Jira and spreadsheet exports
+COLUMN_ALIASES = {
+    "ID": ["id", "work item id", "issue id", "issue key", "key", "task id"],
+    "Title": ["title", "summary", "name", "task", "task name"],
+    "Priority": ["priority", "prio", "severity"],
+    "Original Estimates": [
+        "original estimates", "original estimate", "remaining work", "effort", "story points",
+        "estimate", "estimate hours", "hours", "size"
+    ],
+    "State": ["state", "status"],
+    "Assigned To": ["assigned to", "assignee", "owner"],
+    "Sprint": ["sprint", "iteration"],
+    "Iteration Path": ["iteration path"],
+    "Work Item Type": ["work item type", "issue type", "type"],
+    "Area Path": ["area path", "area"],
+    "Tags": ["tags", "labels"]
+}
+
+# Planner columns offered in the manual mapping editor
+MAPPED_TASK_COLUMNS = ["ID", "Title", "Priority", "Original Estimates", "State", "Assigned To"]
+
+# Lowest similarity accepted for a fuzzy header match
+MIN_MATCH_SCORE = 0.8
+
+# Aliases shorter than this ("id", "type", "area", "hours") only match a header exactly
+MIN_FUZZY_ALIAS_LENGTH = 6
+
+
+def normalize_header(name):
+    """Lower-case header with field reference prefixes, punctuation and extra spaces removed"""
+    text = str(name).strip()
+    text = re.sub(r"^(System|Microsoft\.VSTS\.\w+)\.", "", text)
+    text = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", text)  # RemainingWork -> Remaining Work
+    text = re.sub(r"[^0-9a-z]+", " ", text.lower())
+    return text.strip()
+
+
+def header_signature(header):
+    """Stable hash of a file's normalized headers, independent of column order"""
+    names = sorted(normalize_header(name) for name in header)
+    return hashlib.sha256("\x1f".join(names).encode()).hexdigest()
+
+
+def _alias_score(header_name, alias):
+    """
+    Similarity between a normalized header and one alias.
+
+    Short aliases must match exactly. Longer ones are compared fuzzily, but only with a
+    header of as many words, so "Iteration ID" is not taken for "iteration".
+    """
+    if header_name == alias:
+        return 1.0
+    if len(alias) < MIN_FUZZY_ALIAS_LENGTH or len(header_name.split()) != len(alias.split()):
+        return 0.0
+    return SequenceMatcher(None, header_name, alias).ratio()
+
+
+def _score(header_name, target):
+    """Best similarity between a normalized header and the aliases of a planner column"""
+    return max(_alias_score(header_name, alias) for alias in COLUMN_ALIASES[target])
+
+
+def suggest_column_mapping(header, min_score=MIN_MATCH_SCORE):
+    """
+    Fuzzy-match file headers to planner columns.
+
+    Headers already named like a planner column are kept. Every other header is scored
+    against the aliases of the unclaimed columns and the best pairs are taken first, so
+    each planner column is mapped from at most one header.
+
+    Returns:
+        Mapping of file header to planner column, for the headers that need renaming
+    """
+    header = [str(name) for name in header]
+    claimed = {name for name in header if name in COLUMN_ALIASES}
+
+    candidates = []
+    for name in header:
+        if name in claimed:
+            continue
+        normalized = normalize_header(name)
+        for target in COLUMN_ALIASES:
+            if target not in claimed:
+                score = _score(normalized, target)
+                if score >= min_score:
+                    candidates.append((score, name, target))
+
+    mapping = {}
+    for score, name, target in sorted(candidates, key=lambda candidate: -candidate[0]):
+        if name not in mapping and target not in claimed:
+            mapping[name] = target
+            claimed.add(target)
+    return mapping
+
+
+def resolve_column_mapping(header, path=None, use_store=True):
+    """
+    Mapping for a file's headers: the stored mapping of its header signature, or a fuzzy suggestion.
+
+    A store that cannot be read counts as having no mapping for the headers.
+
+    Args:
+        use_store: Look up stored mappings; False only suggests
+
+    Returns:
+        (header signature, mapping of file header to planner column, True when the mapping was stored)
+    """
+    signature = header_signature(header)
+    stored = None
+    if use_store:
+        try:
+            stored = load_column_mapping(signature, path=path)
+        except (sqlite3.Error, OSError):
+            stored = None
+    if stored is not None:
+        names = set(map(str, header))
+        return signature, {name: target for name, target in stored.items() if name in names}, True
+    return signature, suggest_column_mapping(header), False
+
+
+def mapped_header(header, mapping):
+    """Header names after applying a mapping"""
+    return [mapping.get(str(name), str(name)) for name in header]
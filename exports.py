@@ -0,0 +1,252 @@
+import importlib.util
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+from bounded_cache import BoundedLRUCache
+from plan_metrics import (
+    capacity_utilization_pct,
+    member_capacity_frame,
+    plan_metrics_summary,
+    planned_member_capacity,
+    sprint_priority_mix,
+)
+
+# File format -> (extension, MIME type) for task backlog and plan exports
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "feather": (".feather", "application/vnd.apache.arrow.file")
+}
+
+# Rows converted to Python values at a time while streaming a sheet
+EXCEL_CHUNK_ROWS = 10_000
+
+# Generated download artifacts, shared by every session served by this process
+export_cache = BoundedLRUCache(max_entries=32, max_bytes=512 * 1024 * 1024)
+
+# Threads generating the artifacts of one export bundle
+BUNDLE_WORKERS = 4
+
+
+def file_format(filename):
+    """Export format of a file name from its extension; anything unknown is treated as CSV"""
+    extension = os.path.splitext(filename.lower())[1]
+    if extension in (".xlsx", ".xls"):
+        return "excel"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension in (".feather", ".arrow"):
+        return "feather"
+    return "csv"
+
+
+def export_filename(stem, fmt):
+    """File name for an export of the given format"""
+    return stem + EXPORT_FORMATS[fmt][0]
+
+
+def to_parquet_bytes(df):
+    """Zstandard-compressed Parquet, with categorical columns stored as dictionaries"""
+    buffer = BytesIO()
+    df.to_parquet(buffer, index=False, compression="zstd")
+    return buffer.getvalue()
+
+
+def to_feather_bytes(df):
+    """LZ4-compressed Feather (Arrow IPC), the fastest format to read back"""
+    buffer = BytesIO()
+    df.reset_index(drop=True).to_feather(buffer, compression="lz4")
+    return buffer.getvalue()
+
+
+def _sheet_title(name, used):
+    """Unique worksheet title within Excel's 31 character limit and without forbidden characters"""
+    base = re.sub(r"[\[\]:*?/\\]", "-", str(name)).strip()[:31] or "Sheet"
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title.lower())
+    return title
+
+
+def _append_frame(workbook, title, frame, index=False):
+    """Stream a DataFrame into a new write-only sheet, converting one chunk of rows at a time"""
+    sheet = workbook.create_sheet(title)
+    if index:
+        frame = frame.reset_index()
+    sheet.append([str(col) for col in frame.columns])
+    for start in range(0, len(frame), EXCEL_CHUNK_ROWS):
+        chunk = frame.iloc[start:start + EXCEL_CHUNK_ROWS].astype(object)
+        for row in chunk.where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+
+
+def _save_workbook(workbook):
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def to_excel_bytes(df, sheet_name="Tasks"):
+    """Single-sheet Excel workbook, written in openpyxl's write-only mode"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    _append_frame(workbook, sheet_name, df)
+    return _save_workbook(workbook)
+
+
+def plan_workbook_bytes(df, cube, team_members, sprints=None):
+    """
+    Excel workbook of an assigned plan, written in openpyxl's write-only mode.
+
+    Sheets: Capacity (per member), Priority Mix (per sprint), one sheet per sprint
+    and Unassigned for the tasks left out of every sprint.
+
+    Args:
+        df: Assigned tasks with Sprint and Assigned To columns
+        cube: plan_metrics.plan_cube of the plan
+        team_members: Member name to capacity mapping
+        sprints: Sprint names in sheet order; defaults to their order in df
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    used_titles = set()
+
+    capacity = member_capacity_frame(cube, team_members)
+    capacity["Utilization %"] = capacity_utilization_pct(capacity)
+    _append_frame(workbook, _sheet_title("Capacity", used_titles), capacity.rename_axis("Member"), index=True)
+    _append_frame(workbook, _sheet_title("Priority Mix", used_titles), sprint_priority_mix(cube, sprints), index=True)
+
+    sprint = df["Sprint"].astype(object).where(df["Sprint"].notna(), "")
+    positions = sprint.groupby(sprint, sort=False).indices
+    for sprint_name in sprints if sprints is not None else positions:
+        if sprint_name != "" and sprint_name in positions:
+            _append_frame(workbook, _sheet_title(sprint_name, used_titles), df.iloc[positions[sprint_name]])
+
+    _append_frame(workbook, _sheet_title("Unassigned", used_titles), df[sprint == ""])
+    return _save_workbook(workbook)
+
+
+def task_export_bytes(df, fmt):
+    """Serialize a task backlog or assigned plan in one of EXPORT_FORMATS"""
+    if fmt == "parquet":
+        return to_parquet_bytes(df)
+    if fmt == "feather":
+        return to_feather_bytes(df)
+    if fmt == "excel":
+        return to_excel_bytes(df)
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def write_task_file(df, path):
+    """Write a task backlog or plan to disk in the format given by the file extension"""
+    with open(path, "wb") as output_file:
+        output_file.write(task_export_bytes(df, file_format(path)))
+
+
+def cached_export(data_key, fmt, build, *args):
+    """
+    Artifact for a data key and format, built with build(*args) on first request and
+    served from export_cache afterwards.
+    """
+    return export_cache.get_or_create(("export", fmt, data_key), lambda: build(*args))
+
+
+def lazy_export(data_key, fmt, build, *args):
+    """
+    Zero-argument callable for st.download_button(data=...).
+
+    Nothing is serialized while the page renders; the artifact is built by cached_export
+    only when the download is requested.
+    """
+    return lambda: cached_export(data_key, fmt, build, *args)
+
+
+def export_bundle(artifacts, max_workers=BUNDLE_WORKERS):
+    """
+    Zip archive of artifacts generated concurrently in a thread pool.
+
+    Each artifact is compressed into the archive as soon as it is ready.
+
+    Args:
+        artifacts: Mapping of path inside the archive to a zero-argument function returning bytes or str
+    """
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(build): name for name, build in artifacts.items()}
+        for future in as_completed(futures):
+            archive.writestr(futures[future], future.result())
+    return buffer.getvalue()
+
+
+def _plotly_svg(fig):
+    """Static SVG of a plotly figure; needs the optional kaleido package"""
+    return fig.to_image(format="svg")
+
+
+def plan_bundle_artifacts(plan_key, results, report_key=None, charts=(), images=(), retro=None):
+    """
+    Builders for every artifact of a plan, for export_bundle.
+
+    Artifacts that were already downloaded on their own are served from export_cache.
+
+    Args:
+        plan_key: Plan content hash
+        results: Assignment results with df, cube, team_members and sprint_data
+        report_key: Export cache key of the plan report, so the report download is reused
+        charts: (title, plotly figure) pairs; written as interactive HTML, plus SVG when kaleido is installed
+        images: (file name, zero-argument function returning image bytes) pairs, e.g. cached matplotlib charts
+        retro: Optional (feedback DataFrame, min votes, max votes) for the retrospective summary
+    """
+    # Reports are only needed for bundles; keep them off the headless export path
+    from reports import plan_report, retro_report
+
+    df = results["df"]
+    sprints = list(results["sprint_data"]["sprint_assignments"])
+
+    artifacts = {
+        "Task_Assignments.csv": lambda: cached_export(plan_key, "csv", task_export_bytes, df, "csv"),
+        "Task_Assignments.xlsx": lambda: cached_export(
+            plan_key, "excel", plan_workbook_bytes, df, results["cube"], planned_member_capacity(results), sprints
+        ),
+        "Task_Assignments.parquet": lambda: cached_export(plan_key, "parquet", task_export_bytes, df, "parquet"),
+        "plan_metrics.json": lambda: json.dumps(plan_metrics_summary(results), indent=2),
+        "Sprint_Plan_Report.html": lambda: cached_export(
+            report_key or plan_key, "html", plan_report, results, "html", list(charts)
+        )
+    }
+
+    sprint = df["Sprint"].astype(object).where(df["Sprint"].notna(), "")
+    for sprint_name in sprints:
+        sprint_tasks = df[(sprint == sprint_name).to_numpy()]
+        artifacts[f"sprints/{_sheet_title(sprint_name, set())}.csv"] = (
+            lambda tasks=sprint_tasks: task_export_bytes(tasks, "csv")
+        )
+
+    with_svg = importlib.util.find_spec("kaleido") is not None
+    for title, fig in charts:
+        artifacts[f"charts/{title}.html"] = lambda fig=fig: fig.to_html(include_plotlyjs="cdn")
+        if with_svg:
+            artifacts[f"charts/{title}.svg"] = lambda fig=fig: _plotly_svg(fig)
+    for name, build in images:
+        artifacts[f"charts/{name}"] = build
+
+    if retro is not None:
+        feedback_df, min_votes, max_votes = retro
+        artifacts["retrospective_summary.md"] = lambda: retro_report(feedback_df, min_votes, max_votes)
+
+    return artifacts
+
+
+def plan_bundle_bytes(plan_key, results, report_key=None, charts=(), images=(), retro=None):
+    """Zip bundle of every plan artifact; arguments as for plan_bundle_artifacts"""
+    return export_bundle(plan_bundle_artifacts(plan_key, results, report_key, charts, images, retro))
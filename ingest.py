@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import suppress
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+from pyarrow import feather as pa_feather
+from pyarrow import parquet as pa_parquet
+
+from bounded_cache import BoundedLRUCache
+from column_mapping import mapped_header
+from sprint_engine import drop_completed_tasks
+from validation import validate_tasks
+
+REQUIRED_TASK_COLUMNS = ["ID", "Title", "Priority", "Original Estimates"]
+# Columns of the task export holding the member -> component expertise table
+EXPERTISE_MEMBER_COLUMN = "Unnamed: 15"
+EXPERTISE_COMPONENT_COLUMN = "Unnamed: 16"
+# Read when present; every other column of an export is skipped
+OPTIONAL_TASK_COLUMNS = [
+    "State", "Assigned To", "Sprint", "Iteration Path", "Work Item Type", "Area Path", "Tags",
+    EXPERTISE_MEMBER_COLUMN, EXPERTISE_COMPONENT_COLUMN
+]
+CATEGORICAL_TASK_COLUMNS = ["Priority", "State"]
+# Upload formats accepted for task backlogs and assigned plans
+TASK_FILE_TYPES = ["csv", "parquet", "feather"]
+
+# CSV bytes parsed per streamed block; the reader keeps a few dozen blocks in flight
+CHUNK_BLOCK_BYTES = 1024 * 1024
+# Where streamed backlogs spill their active tasks
+SPILL_DIR = os.environ.get("TASK_SPILL_DIR", os.path.join(tempfile.gettempdir(), "agile_suite_spill"))
+# Estimates that pd.to_numeric would accept; anything else becomes missing, as in apply_task_dtypes
+NUMBER_PATTERN = r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$"
+
+# Parsed uploads, shared by every session served by this process
+upload_cache = BoundedLRUCache(max_entries=16, max_bytes=1024 * 1024 * 1024)
+
+
+def upload_key(data, **options):
+    """SHA-256 of the uploaded bytes plus the options they are parsed with"""
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def apply_task_dtypes(df):
+    """Categorical Priority/State and float32 estimates; unparseable estimates become NaN"""
+    df = df.copy()
+    for column in CATEGORICAL_TASK_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    if "Original Estimates" in df.columns:
+        df["Original Estimates"] = pd.to_numeric(df["Original Estimates"], errors="coerce").astype("float32")
+    return df
+
+
+def read_task_header(data, file_format="csv"):
+    """Column names of a task file in one of TASK_FILE_TYPES, without reading its rows; CSV may also be a path"""
+    if file_format == "parquet":
+        return pa_parquet.read_schema(BytesIO(data)).names
+    if file_format == "feather":
+        return pa.ipc.open_file(pa.BufferReader(data)).schema.names
+    return pd.read_csv(BytesIO(data) if isinstance(data, bytes) else data, nrows=0).columns.tolist()
+
+
+def read_task_csv(data, extra_columns=None, column_mapping=None):
+    """
+    Read the task columns of a CSV export with the multithreaded Arrow CSV parser.
+
+    Only the required columns and OPTIONAL_TASK_COLUMNS (plus extra_columns) are read.
+    Column names match pandas, including "Unnamed: n" for blank headers. Files the Arrow
+    parser rejects, such as ragged rows, are read with the pandas C parser instead.
+
+    Args:
+        data: CSV bytes
+        extra_columns: Additional column names to keep
+        column_mapping: File header to planner column renames, applied to the header
+            before parsing so the data is never copied
+    """
+    header = mapped_header(read_task_header(data), column_mapping or {})
+    wanted = set(REQUIRED_TASK_COLUMNS) | set(OPTIONAL_TASK_COLUMNS) | set(extra_columns or [])
+    usecols = [col for col in header if col in wanted]
+
+    try:
+        table = pa_csv.read_csv(
+            BytesIO(data),
+            read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=usecols,
+                column_types={col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORICAL_TASK_COLUMNS if col in usecols},
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+    except pa.ArrowInvalid:
+        df = pd.read_csv(BytesIO(data), header=0, names=header, usecols=usecols)
+
+    return apply_task_dtypes(df)
+
+
+def _active_batch(batch):
+    """Drop done tasks from a streamed record batch and parse its estimates as float32"""
+    if "State" in batch.schema.names:
+        batch = batch.filter(pc.fill_null(pc.not_equal(pc.utf8_lower(batch.column("State")), "done"), True))
+    if "Original Estimates" in batch.schema.names:
+        position = batch.schema.get_field_index("Original Estimates")
+        text = batch.column(position)
+        numbers = pc.if_else(pc.match_substring_regex(text, NUMBER_PATTERN), pc.utf8_trim_whitespace(text), pa.scalar(None, pa.string()))
+        batch = batch.set_column(position, "Original Estimates", pc.cast(numbers, pa.float32()))
+    return batch
+
+
+def stream_active_tasks(source, spill_path, extra_columns=None, column_mapping=None, block_size=CHUNK_BLOCK_BYTES):
+    """
+    Stream a CSV export block by block, keeping the task columns of active tasks only, and spill
+    them to an uncompressed Arrow IPC file. At most one block of the CSV is in memory at a time.
+
+    Text columns are read as strings; ID types are inferred from the first block.
+
+    Args:
+        source: CSV path or bytes
+        spill_path: Arrow file to write; replaced only once streaming has finished
+        extra_columns: Additional column names to keep
+        column_mapping: File header to planner column renames
+
+    Returns:
+        (rows read, rows kept)
+    """
+    header = mapped_header(read_task_header(source), column_mapping or {})
+    wanted = set(REQUIRED_TASK_COLUMNS) | set(OPTIONAL_TASK_COLUMNS) | set(extra_columns or [])
+    usecols = [col for col in header if col in wanted]
+
+    reader = pa_csv.open_csv(
+        BytesIO(source) if isinstance(source, bytes) else source,
+        read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1, block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=usecols,
+            column_types={col: pa.string() for col in usecols if col != "ID"},
+            strings_can_be_null=True
+        )
+    )
+    schema = _active_batch(pa.RecordBatch.from_pylist([], schema=reader.schema)).schema
+
+    rows_read = rows_kept = 0
+    os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+    partial_path = spill_path + ".partial"
+    try:
+        with pa.OSFile(partial_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in reader:
+                active = _active_batch(batch)
+                writer.write_batch(active)
+                rows_read += batch.num_rows
+                rows_kept += active.num_rows
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, spill_path)
+    return rows_read, rows_kept
+
+
+def load_spilled_tasks(spill_path):
+    """
+    Read a file written by stream_active_tasks back as a task DataFrame with the ingest dtypes.
+
+    The file is memory-mapped while it is read, but the DataFrame holds its own copy of the
+    tasks, so the spill can be removed once it is loaded.
+    """
+    table = pa.ipc.open_file(pa.memory_map(spill_path)).read_all()
+    for column in CATEGORICAL_TASK_COLUMNS:
+        if column in table.column_names:
+            position = table.schema.get_field_index(column)
+            table = table.set_column(position, column, pc.dictionary_encode(table.column(position)))
+    return table.to_pandas(split_blocks=True)
+
+
+def read_task_csv_chunked(source, extra_columns=None, column_mapping=None, spill_path=None):
+    """
+    Active tasks of a CSV backlog, without parsing its completed tasks into a DataFrame:
+    streamed with stream_active_tasks and read back with load_spilled_tasks. Used by the
+    sprint_cli --chunked option, where the CSV is read from disk block by block.
+
+    Args:
+        source: CSV path or bytes
+        spill_path: Arrow file to keep; by default a temporary file in SPILL_DIR is used and
+            removed once loaded
+    """
+    keep_spill = spill_path is not None
+    if not keep_spill:
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        handle, spill_path = tempfile.mkstemp(suffix=".arrow", dir=SPILL_DIR)
+        os.close(handle)
+    try:
+        stream_active_tasks(source, spill_path, extra_columns, column_mapping)
+        return load_spilled_tasks(spill_path)
+    finally:
+        if not keep_spill:
+            try:
+                os.remove(spill_path)
+            except OSError:
+                pass  # Still mapped on platforms that lock mapped files
+
+
+def read_task_columnar(data, file_format, extra_columns=None, column_mapping=None):
+    """
+    Read the task columns of a Parquet or Feather file.
+
+    Only the columns read_task_csv would keep are loaded; the others are never decoded.
+
+    Args:
+        data: File bytes
+        file_format: "parquet" or "feather"
+        extra_columns: Additional column names to keep
+        column_mapping: File header to planner column renames, applied to the Arrow schema only
+    """
+    column_mapping = column_mapping or {}
+    wanted = set(REQUIRED_TASK_COLUMNS) | set(OPTIONAL_TASK_COLUMNS) | set(extra_columns or [])
+    header = read_task_header(data, file_format)
+    columns = [name for name, mapped in zip(header, mapped_header(header, column_mapping)) if mapped in wanted]
+    if file_format == "parquet":
+        table = pa_parquet.read_table(BytesIO(data), columns=columns)
+    else:
+        table = pa_feather.read_table(pa.BufferReader(data), columns=columns)
+    table = table.rename_columns(mapped_header(table.column_names, column_mapping))
+    return apply_task_dtypes(table.to_pandas())
+
+
+def read_task_file(data, file_format="csv", extra_columns=None, column_mapping=None):
+    """Read a task backlog or plan in one of TASK_FILE_TYPES, renaming columns with column_mapping"""
+    if file_format in ("parquet", "feather"):
+        return read_task_columnar(data, file_format, extra_columns, column_mapping)
+    return read_task_csv(data, extra_columns, column_mapping)
+
+
+def parse_task_upload(data, **options):
+    """
+    Parse a task file with read_task_file, check the required columns, drop completed tasks
+    and validate the rest with validation.validate_tasks.
+
+    Returns:
+        Dict with the preview rows, missing required columns and, when none are missing,
+        the valid active tasks, their summary, the issue report and the quarantined rows
+    """
+    df = read_task_file(data, **options)
+    missing_columns = [col for col in REQUIRED_TASK_COLUMNS if col not in df.columns]
+
+    parsed = {
+        "preview": df.head(10), "missing_columns": missing_columns, "df": None, "summary": None,
+        "issues": None, "quarantine": None
+    }
+    if not missing_columns:
+        df, parsed["issues"], parsed["quarantine"] = validate_tasks(drop_completed_tasks(df))
+        parsed["df"] = df
+        priority_counts = df["Priority"].value_counts()
+        parsed["summary"] = {
+            "total_tasks": len(df),
+            "priority_counts": priority_counts[priority_counts > 0].to_dict(),
+            "total_estimate": float(df["Original Estimates"].sum()),
+            "columns": len(df.columns),
+            "memory_bytes": int(df.memory_usage(deep=True).sum()),
+            "file_bytes": len(data),
+            "coerced": int((parsed["issues"]["Action"] == "coerced").sum()),
+            "quarantined": len(parsed["quarantine"])
+        }
+    return parsed
+
+
+def load_task_upload(data, key=None, **options):
+    """
+    Parsed task upload, served from the shared cache when the same bytes were parsed
+    with the same options before.
+
+    Args:
+        data: Uploaded file bytes
+        key: Known upload_key for these bytes and options, to skip hashing again
+
+    Returns:
+        (upload key, parsed dict from parse_task_upload). The parsed dict is shared and must not be modified.
+    """
+    key = key or upload_key(data, **options)
+    return key, upload_cache.get_or_create(key, lambda: parse_task_upload(data, **options))
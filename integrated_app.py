@@ -1,15 +1,81 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
-import base64
+import uuid
 from io import BytesIO, StringIO
 from datetime import datetime, timedelta
 import requests
-import json
 import msal
 
+from assistant import (
+    annotate_component_mismatches,
+    expertise_map,
+    fix_component_mismatches,
+    retro_assistant_context,
+    sprint_assistant_context,
+    stream_chat_completion,
+)
+from charts import (
+    MEMBER_CHART_LIMIT,
+    TIMELINE_DETAIL_LIMIT,
+    burndown_figure,
+    burnup_figure,
+    cached_plotly,
+    cached_png,
+    capacity_utilization_figure,
+    feedback_votes_figure,
+    live_figure_count,
+    priority_distribution_figure,
+    sprint_capacity_png,
+    task_association_png,
+    task_feedback_figure,
+    task_timeline_figure,
+    timeline_blocks_figure,
+    utilization_trend_figure,
+    velocity_figure,
+    vote_distribution_figure,
+)
+from exports import (
+    EXPORT_FORMATS,
+    export_filename,
+    file_format,
+    lazy_export,
+    plan_bundle_bytes,
+    plan_workbook_bytes,
+    task_export_bytes,
+)
+from column_mapping import MAPPED_TASK_COLUMNS, mapped_header, resolve_column_mapping
+from ingest import REQUIRED_TASK_COLUMNS, TASK_FILE_TYPES, load_task_upload, read_task_header
+from plan_metrics import (
+    content_hash,
+    cube_priority_counts,
+    cube_sprint_totals,
+    member_capacity_frame,
+    plan_cube,
+    plan_hash,
+    planned_member_capacity,
+    project_burndown,
+    project_burnup,
+    sprint_capacity_breakdown,
+    sprint_standard_capacities,
+    timeline_blocks,
+    timeline_frame,
+    top_n_with_others,
+)
+from plan_store import diff_plans, list_plans, load_plan, save_column_mapping, save_plan
+from reports import REPORT_FORMATS, plan_report, retro_report
+from rerun_profiler import RerunProfiler, new_profile_history, profile_json, profile_summary, set_tracing
+from sprint_engine import REQUIRED_COLUMNS, assign_tasks, plan_inputs_hash
+from task_table import get_task_index, show_task_table
+from velocity import (
+    forecast_velocity,
+    load_velocity_history,
+    normalize_velocity_history,
+    rolling_velocity,
+    velocity_matrix,
+)
+from validation import validate_tasks
+
 # Set page configuration
 st.set_page_config(
     page_title="Agile Team Management Suite",
@@ -72,6 +138,47 @@ if "azure_config" not in st.session_state:
     }
 if "retro_feedback" not in st.session_state:
     st.session_state.retro_feedback = None
+if "velocity_history" not in st.session_state:
+    st.session_state.velocity_history = None
+if "profile_history" not in st.session_state:
+    st.session_state.profile_history = new_profile_history()
+if "profile_session" not in st.session_state:
+    st.session_state.profile_session = uuid.uuid4().hex
+
+with st.sidebar.expander("Diagnostics"):
+    # Figures still open from the previous rerun; anything above zero is a leak
+    st.metric("Live matplotlib figures", live_figure_count())
+
+    profile_reruns = st.checkbox(
+        "Profile reruns",
+        key="profile_reruns",
+        help="Record wall time and memory allocated by each section of the app on every rerun"
+    )
+    profile_history = st.session_state.profile_history
+    set_tracing(st.session_state.profile_session, profile_reruns)
+
+    if profile_reruns and profile_history:
+        # The current run is still in progress, so show the one before it
+        last_run = profile_history[-1]
+        last_sections = pd.DataFrame(last_run["sections"])
+        st.caption(f"Run {last_run['run']} at {last_run['started_at']}: {last_sections['wall_ms'].sum():.0f} ms in profiled sections")
+        st.dataframe(last_sections.sort_values("wall_ms", ascending=False), hide_index=True, use_container_width=True)
+
+        st.caption(f"Across the last {len(profile_history)} runs; memory is process-wide and includes other sessions")
+        st.dataframe(profile_summary(profile_history), use_container_width=True)
+
+        st.download_button(
+            "Export Profile (JSON)",
+            profile_json(profile_history),
+            file_name="rerun_profile.json",
+            mime="application/json"
+        )
+        if st.button("Clear Profile"):
+            profile_history.clear()
+    elif profile_reruns:
+        st.caption("Interact with the app to record the first profiled rerun.")
+
+profiler = RerunProfiler(st.session_state.profile_history, enabled=profile_reruns)
 
 # Azure DevOps Integration Functions
 def get_azure_access_token(client_id, client_secret, tenant_id):
@@ -144,6 +251,55 @@ def get_azure_devops_tasks(org_url, project, team, access_token):
     
     return pd.DataFrame(tasks)
 
+def get_azure_devops_velocity_history(org_url, project, team, access_token, max_iterations=6):
+    """Fetch completed work per member for the team's most recent past iterations"""
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json"
+    }
+
+    iterations_url = f"{org_url}/{project}/{team}/_apis/work/teamsettings/iterations?$timeframe=past&api-version=7.0"
+    iterations_response = requests.get(iterations_url, headers=headers)
+    iterations = iterations_response.json().get("value", [])[-max_iterations:]
+
+    if not iterations:
+        return None
+
+    wiql_url = f"{org_url}/{project}/_apis/wit/wiql?api-version=7.0"
+    rows = []
+
+    for iteration in iterations:
+        wiql_query = {
+            "query": f"SELECT [System.Id] FROM WorkItems WHERE [System.IterationPath] = '{iteration['path']}' AND [System.WorkItemType] IN ('Task', 'User Story', 'Bug') AND [System.State] IN ('Done', 'Closed')"
+        }
+        wiql_response = requests.post(wiql_url, headers=headers, json=wiql_query)
+        work_item_ids = [str(item["id"]) for item in wiql_response.json().get("workItems", [])]
+
+        batch_size = 200  # Azure DevOps has a limit on batch size
+        for i in range(0, len(work_item_ids), batch_size):
+            batch_ids = work_item_ids[i:i + batch_size]
+            fields = "System.AssignedTo,Microsoft.VSTS.Scheduling.CompletedWork,Microsoft.VSTS.Scheduling.OriginalEstimate"
+            details_url = f"{org_url}/{project}/_apis/wit/workitems?ids={','.join(batch_ids)}&fields={fields}&api-version=7.0"
+            details_response = requests.get(details_url, headers=headers)
+
+            for item in details_response.json().get("value", []):
+                item_fields = item.get("fields", {})
+                assigned_to = item_fields.get("System.AssignedTo", "")
+                completed = item_fields.get("Microsoft.VSTS.Scheduling.CompletedWork")
+                if completed is None:
+                    completed = item_fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0)
+                rows.append({
+                    "Sprint": iteration["name"],
+                    "Member": assigned_to.get("displayName", "") if isinstance(assigned_to, dict) else assigned_to,
+                    "Completed": completed,
+                    "Finish Date": iteration.get("attributes", {}).get("finishDate")
+                })
+
+    if not rows:
+        return None
+
+    return normalize_velocity_history(pd.DataFrame(rows))
+
 def update_azure_devops_tasks(org_url, project, access_token, updates):
     """Update tasks in Azure DevOps in batch"""
     headers = {
@@ -175,24 +331,95 @@ def update_azure_devops_tasks(org_url, project, access_token, updates):
     return results
 
 # Helper functions for Sprint Planning
-def to_excel(df):
-    """Convert DataFrame to Excel bytes"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Tasks')
-    return output.getvalue()
-
-def get_download_link(df, filename, format_type):
-    """Generate a download link for dataframe"""
-    if format_type == 'excel':
-        data = to_excel(df)
-        b64 = base64.b64encode(data).decode()
-        href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="{filename}" class="download-link">Download Excel File</a>'
-    elif format_type == 'csv':
-        csv = df.to_csv(index=False)
-        b64 = base64.b64encode(csv.encode()).decode()
-        href = f'<a href="data:text/csv;base64,{b64}" download="{filename}" class="download-link">Download CSV File</a>'
-    return href
+def task_download_buttons(df, data_key, stem, key, formats):
+    """
+    Download buttons side by side, one per export format.
+
+    Files are generated only when a button is clicked and cached by data_key and format.
+    """
+    for col, fmt in zip(st.columns(len(formats)), formats):
+        with col:
+            st.download_button(
+                f"Download {'CSV' if fmt == 'csv' else fmt.title()}",
+                lazy_export(data_key, fmt, task_export_bytes, df, fmt),
+                file_name=export_filename(stem, fmt),
+                mime=EXPORT_FORMATS[fmt][1],
+                key=f"{key}_{fmt}"
+            )
+
+def column_mapping_editor(header, mapping, key):
+    """
+    One select box per MAPPED_TASK_COLUMNS column, choosing the file header it is read from.
+
+    Returns:
+        Mapping of file header to planner column from the current selections
+    """
+    not_in_file = "(not in file)"
+    options = [not_in_file] + [str(name) for name in header]
+    sources = {target: name for name, target in mapping.items()}
+
+    edited = {}
+    for col, target in zip(st.columns(len(MAPPED_TASK_COLUMNS)), MAPPED_TASK_COLUMNS):
+        with col:
+            default = sources.get(target, target if target in options else not_in_file)
+            source = st.selectbox(target, options, index=options.index(default), key=f"{key}_{target}")
+            if source == not_in_file or source == target:
+                continue
+            if source in edited:
+                st.error(f"{source} is already mapped to {edited[source]}")
+                continue
+            edited[source] = target
+
+    # Columns without a select box keep their matched source
+    edited.update({name: target for name, target in mapping.items() if target not in MAPPED_TASK_COLUMNS and name not in edited})
+    return edited
+
+def sprint_capacity_images(plan_key, results):
+    """
+    (file name, builder) pairs for every sprint's capacity chart as PNG and SVG.
+
+    The PNGs share chart_cache entries with the charts drawn on the Results tab.
+    """
+    sprint_data = results["sprint_data"]
+    sprint_names = list(sprint_data["sprint_assignments"])
+    standard_capacities = sprint_standard_capacities(results)
+    images = []
+    for i, sprint_name in enumerate(sprint_names):
+        breakdown_args = (
+            results["team_members"], sprint_data["sprint_capacities"], sprint_data["num_sprints"],
+            sprint_name, sprint_names[i - 1] if i > 0 else None
+        )
+        for image_format in ["png", "svg"]:
+            key = ("sprint_capacity", plan_key, sprint_name) + (() if image_format == "png" else ("svg",))
+            images.append((
+                f"{sprint_name} Capacity.{image_format}",
+                lambda key=key, args=breakdown_args, image_format=image_format: cached_png(
+                    key, sprint_capacity_png,
+                    *sprint_capacity_breakdown(*args, standard_capacities=standard_capacities), args[3],
+                    image_format=image_format
+                )
+            ))
+    return images
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_stored_plan_tasks(plan_id):
+    """Tasks of a stored plan version; versions never change once saved, so they are cached by plan_id"""
+    return load_plan(plan_id)["df"]
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_velocity_history(data, file_name):
+    """Velocity history upload parsed once per file content; Streamlit hashes the bytes for the cache key"""
+    history_file = BytesIO(data)
+    history_file.name = file_name
+    return load_velocity_history(history_file)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_plan_projections(plan_key, _df, _team_members, num_sprints, working_days):
+    """Burndown and burnup projections for a plan, cached by its content hash"""
+    return (
+        project_burndown(_df, _team_members, num_sprints, working_days),
+        project_burnup(_df, _team_members, num_sprints, working_days)
+    )
 
 # Retrospective Analysis Functions
 def compare_retrospectives(file_objects, min_votes, max_votes):
@@ -284,19 +511,146 @@ def create_dataframe_from_results(feedback_results):
     }
     return pd.DataFrame(data)
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_sprint_assistant_context(tasks_key, _df_tasks):
+    """Tasks with component mismatches flagged plus the assistant's system prompt, cached by task content hash"""
+    expertise_dict = expertise_map(_df_tasks)
+    df = annotate_component_mismatches(_df_tasks, expertise_dict)
+    mismatches = df[df["Mismatch"]]
+    return df, expertise_dict, mismatches, sprint_assistant_context(df, expertise_dict, mismatches)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_retro_assistant_context(feedback_key, _feedback_df):
+    """Retrospective assistant system prompt, cached by feedback content hash"""
+    return retro_assistant_context(_feedback_df)
+
+@st.fragment
+def sprint_assistant_chat():
+    """Sprint planning chat. Runs as a fragment, so a chat turn reruns only this function."""
+    if "ai_messages" not in st.session_state:
+        st.session_state.ai_messages = [
+            {"role": "assistant", "content": "Hello! I'm your sprint planning assistant. How can I help you with your task assignments today?"}
+        ]
+
+    for message in st.session_state.ai_messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    api_key = st.text_input("OpenRouter API Key", type="password", key="ai_api_key")
+
+    if st.session_state.df_tasks is None:
+        st.info("Please upload task data in the Upload Tasks tab first.")
+        return
+
+    df, expertise_dict, mismatches, context = get_sprint_assistant_context(
+        content_hash(st.session_state.df_tasks), st.session_state.df_tasks
+    )
+
+    # 📬 User input
+    prompt = st.chat_input("Ask about your sprint plan or say 'fix component mismatches'...")
+    if not prompt:
+        return
+
+    st.session_state.ai_messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    # If user wants to fix mismatches
+    if "fix" in prompt.lower() and "mismatch" in prompt.lower():
+        with st.chat_message("assistant"):
+            st.success("Fixing tasks by component expertise...")
+            df, reassigned = fix_component_mismatches(df, mismatches, expertise_dict)
+
+            st.success(f"Reassigned {reassigned} mismatched tasks.")
+            st.dataframe(df[["ID", "Title", "Component", "Assigned To"]], use_container_width=True)
+
+            st.session_state.df_tasks = df  # Save back corrected
+
+            st.session_state.ai_messages.append({
+                "role": "assistant",
+                "content": f"I found and reassigned {reassigned} tasks to match component expertise."
+            })
+    else:
+        # 🔁 Stream response from OpenRouter
+        with st.chat_message("assistant"):
+            message_placeholder = st.empty()
+            full_response = stream_chat_completion(
+                api_key,
+                context + f"\nUser prompt: {prompt}",
+                st.session_state.ai_messages,
+                lambda text: message_placeholder.markdown(text + "▌")
+            )
+            message_placeholder.markdown(full_response)
+            st.session_state.ai_messages.append({"role": "assistant", "content": full_response})
+
+@st.fragment
+def retro_assistant_chat():
+    """Retrospective chat. Runs as a fragment, so a chat turn reruns only this function."""
+    if "retro_ai_messages" not in st.session_state:
+        st.session_state.retro_ai_messages = [
+            {"role": "assistant", "content": "Hi! I'm your retrospective assistant. How can I help?"}
+        ]
+
+    for msg in st.session_state.retro_ai_messages:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
+    api_key = st.text_input("🔑 OpenRouter API Key", type="password", key="retro_ai_api_key")
+
+    if st.session_state.get("retro_feedback") is None:
+        st.info("Analyze retrospectives first in the previous tab.")
+        return
+
+    feedback_df = create_dataframe_from_results(st.session_state.retro_feedback)
+    context = get_retro_assistant_context(content_hash(feedback_df), feedback_df)
+
+    prompt = st.chat_input("Ask me anything about this retrospective...")
+    if not prompt:
+        return
+
+    st.session_state.retro_ai_messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    with st.chat_message("assistant"):
+        msg_placeholder = st.empty()
+        full_response = stream_chat_completion(
+            api_key,
+            context,
+            st.session_state.retro_ai_messages,
+            lambda text: msg_placeholder.markdown(text + "▌")
+        )
+        msg_placeholder.markdown(full_response)
+        st.session_state.retro_ai_messages.append({"role": "assistant", "content": full_response})
+
 # Main App
 st.title("Agile Team Management Suite")
 st.markdown("An integrated platform for sprint planning, retrospective analysis, and Azure DevOps integration.")
 
-# Create main tabs
-main_tabs = st.tabs([
-    "📝 Sprint Planning", 
-    "📊 Retrospective Analysis",
-    "🔄 Insights Integration"
-])
+# Section navigation: only the active section runs on each rerun
+APP_SECTIONS = ["📝 Sprint Planning", "📊 Retrospective Analysis", "🔄 Insights Integration"]
+active_section = st.radio("Section", APP_SECTIONS, horizontal=True, key="active_section", label_visibility="collapsed")
+
+# Streamlit drops the state of widgets that are not drawn in a run; keep the settings of the
+# sections that are not active so they are unchanged when the user comes back
+PERSISTED_WIDGET_KEYS = [
+    "sprint_duration", "num_sprints", "days_per_week", "hours_per_day", "results_sprint", "timeline_view",
+    "ai_api_key", "retro_ai_api_key", "retro_min_votes", "retro_max_votes", "velocity_window", "velocity_forecast_sprints",
+    "capacity_source"
+]
+# Seeded here once: widgets whose key is set through session state must not also get a value= default
+PERSISTED_WIDGET_DEFAULTS = {
+    "sprint_duration": 2, "num_sprints": 3, "days_per_week": 5, "hours_per_day": 8,
+    "retro_min_votes": 1, "retro_max_votes": 50, "velocity_window": 3, "velocity_forecast_sprints": 3
+}
+for widget_key in PERSISTED_WIDGET_KEYS:
+    if widget_key in st.session_state:
+        st.session_state[widget_key] = st.session_state[widget_key]
+    elif widget_key in PERSISTED_WIDGET_DEFAULTS:
+        st.session_state[widget_key] = PERSISTED_WIDGET_DEFAULTS[widget_key]
 
 # 1. SPRINT PLANNING
-with main_tabs[0]:
+if active_section == APP_SECTIONS[0]:
     st.header("Sprint Task Planner")
     st.markdown("""
     This tool helps you plan and distribute tasks across multiple sprints, ensuring:
@@ -316,44 +670,75 @@ with main_tabs[0]:
     ])
     
     # 1.1 UPLOAD TASKS TAB
-    with upload_tab:
+    with upload_tab, profiler.section("Upload"):
         st.subheader("Upload Task Data")
         
         # File upload
-        uploaded_file = st.file_uploader("Upload your CSV file with tasks", type=["csv"], key="sprint_file_uploader")
+        uploaded_file = st.file_uploader(
+            "Upload your task file (CSV, Parquet or Feather)",
+            type=TASK_FILE_TYPES,
+            key="sprint_file_uploader"
+        )
         
         if uploaded_file is not None:
             try:
-                # Load data
-                df = pd.read_csv(uploaded_file)
+                upload_format = file_format(uploaded_file.name)
+                
+                # Column mapping: saved for this header signature, or matched from the header names
+                known_mapping = st.session_state.get("column_mapping")
+                if known_mapping is None or known_mapping[0] != uploaded_file.file_id:
+                    header = read_task_header(uploaded_file.getvalue(), upload_format)
+                    known_mapping = (uploaded_file.file_id, header, *resolve_column_mapping(header))
+                    st.session_state.column_mapping = known_mapping
+                _, header, signature, column_mapping, mapping_saved = known_mapping
+                
+                unmapped = [col for col in REQUIRED_TASK_COLUMNS if col not in mapped_header(header, column_mapping)]
+                with st.expander("Column Mapping", expanded=bool(unmapped)):
+                    st.caption(
+                        "Using the mapping saved for files with these columns" if mapping_saved
+                        else "Matched from the column names; the mapping is saved once the file loads"
+                    )
+                    column_mapping = column_mapping_editor(header, column_mapping, key=f"column_mapping_{signature[:12]}")
+                
+                # Parsed uploads are cached by content hash; the same selected file is only hashed once
+                upload_id = (uploaded_file.file_id, tuple(sorted(column_mapping.items())))
+                known_upload = st.session_state.get("task_upload")
+                new_upload = known_upload is None or known_upload[0] != upload_id
+                upload_key, parsed = load_task_upload(
+                    uploaded_file.getvalue(),
+                    key=None if new_upload else known_upload[1],
+                    file_format=upload_format,
+                    column_mapping=column_mapping
+                )
+                
+                # Store the active tasks once per upload, so later edits to the task list are kept
+                if new_upload:
+                    st.session_state.task_upload = (upload_id, upload_key)
+                    if parsed["df"] is not None:
+                        st.session_state.df_tasks = parsed["df"]
+                        # Remember the mapping, so the next export from this source loads without changes
+                        if column_mapping and not (mapping_saved and column_mapping == known_mapping[3]):
+                            save_column_mapping(signature, column_mapping, source=uploaded_file.name)
+                            st.session_state.column_mapping = (uploaded_file.file_id, header, signature, column_mapping, True)
                 
                 # Preview data
                 st.subheader("Data Preview")
-                st.dataframe(df.head(10), use_container_width=True)
+                st.dataframe(parsed["preview"], use_container_width=True)
                 
                 # Check if required columns are present
-                required_columns = ["ID", "Title", "Priority", "Original Estimates"]
-                missing_columns = [col for col in required_columns if col not in df.columns]
+                missing_columns = parsed["missing_columns"]
                 
                 if missing_columns:
                     st.error(f"Missing required columns: {', '.join(missing_columns)}")
                 else:
-                    # Process the data
-                    # Filter out completed tasks
-                    if "State" in df.columns:
-                        df = df[df["State"].str.lower() != "done"]
-                    
-                    # Store the filtered data
-                    st.session_state.df_tasks = df
-                    
                     # Show some statistics
-                    total_tasks = len(df)
+                    total_tasks = parsed["summary"]["total_tasks"]
                     
                     # Count priority levels
-                    priority_counts = df["Priority"].value_counts().to_dict()
+                    priority_counts = parsed["summary"]["priority_counts"]
                     
                     # Calculate total estimate
-                    total_estimate = df["Original Estimates"].sum()
+                    total_estimate = parsed["summary"]["total_estimate"]
                     
                     # Display stats in columns
                     col1, col2, col3 = st.columns(3)
@@ -382,6 +767,36 @@ with main_tabs[0]:
                             {priority_html}
                         </div>
                         """, unsafe_allow_html=True)
+                    
+                    # Memory held by the parsed tasks
+                    summary = parsed["summary"]
+                    st.caption(
+                        f"Loaded {summary['columns']} task columns: {summary['memory_bytes'] / 1024 ** 2:.1f} MB in memory "
+                        f"from a {summary['file_bytes'] / 1024 ** 2:.1f} MB file (categorical Priority/State, float32 estimates)"
+                    )
+                    
+                    # Values fixed on load and rows left out of planning
+                    if summary["coerced"] or summary["quarantined"]:
+                        st.warning(
+                            f"{summary['coerced']} values were normalized and {summary['quarantined']} tasks "
+                            f"were quarantined (missing or duplicate ID, or no positive estimate)"
+                        )
+                        with st.expander("Validation Report"):
+                            st.dataframe(parsed["issues"], use_container_width=True, hide_index=True)
+                            if summary["quarantined"]:
+                                st.markdown("**Quarantined Tasks**")
+                                st.dataframe(parsed["quarantine"], use_container_width=True)
+                                st.download_button(
+                                    label="Download Quarantined Tasks (CSV)",
+                                    data=lazy_export(("quarantine", upload_key), "csv", task_export_bytes, parsed["quarantine"], "csv"),
+                                    file_name="Quarantined_Tasks.csv",
+                                    mime=EXPORT_FORMATS["csv"][1],
+                                    key="quarantine_export"
+                                )
+                    
+                    # Columnar copies of the active backlog for the data lake
+                    st.markdown("**Export Backlog**")
+                    task_download_buttons(parsed["df"], upload_key, "Task_Backlog", "backlog_export", ["parquet", "feather"])
                  
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
@@ -402,7 +817,7 @@ with main_tabs[0]:
                 """)
     
     # 1.2 TEAM CONFIGURATION TAB
-    with team_tab:
+    with team_tab, profiler.section("Team"):
         st.header("Configure Team Members")
         
         st.markdown("""
@@ -478,7 +893,7 @@ with main_tabs[0]:
     
     # 1.3 SPRINT & TASK ASSIGNMENT TAB
     # 3. TASK ASSIGNMENT TAB
-    with assignment_tab:
+    with assignment_tab, profiler.section("Assignment"):
         st.header("Sprint & Task Assignment")
         
         if st.session_state.df_tasks is None:
@@ -503,8 +918,8 @@ with main_tabs[0]:
                 "Sprint Duration (weeks)",
                 min_value=1,
                 max_value=4,
-                value=2,
-                help="Duration of each sprint in weeks"
+                help="Duration of each sprint in weeks",
+                key="sprint_duration"
             )
             
             # Number of sprints
@@ -512,8 +927,8 @@ with main_tabs[0]:
                 "Number of Sprints",
                 min_value=1,
                 max_value=12,
-                value=3,
-                help="Number of sprints to plan for"
+                help="Number of sprints to plan for",
+                key="num_sprints"
             )
             
             # Working days per week
@@ -521,8 +936,8 @@ with main_tabs[0]:
                 "Working Days per Week",
                 min_value=1,
                 max_value=7,
-                value=5,
-                help="Number of working days per week"
+                help="Number of working days per week",
+                key="days_per_week"
             )
             
             # Hours per day
@@ -530,8 +945,8 @@ with main_tabs[0]:
                 "Working Hours per Day",
                 min_value=1,
                 max_value=24,
-                value=8,
-                help="Number of working hours per day"
+                help="Number of working hours per day",
+                key="hours_per_day"
             )
             
             # Calculate total hours per sprint
@@ -540,7 +955,33 @@ with main_tabs[0]:
             
             # Let user know how many hours each sprint represents
             st.info(f"Each sprint represents {st.session_state.capacity_per_sprint} working hours per team member (assuming full capacity).")
-            
+
+            # Per-sprint capacity can come from the velocity forecast instead of working hours
+            sprint_capacity_plan = None
+            if st.session_state.velocity_history is not None:
+                capacity_source = st.radio(
+                    "Per-sprint capacity source",
+                    options=["Working hours", "Velocity forecast"],
+                    horizontal=True,
+                    key="capacity_source",
+                    help="Velocity forecast uses the trend of completed work imported in the Insights tab for members with history"
+                )
+
+                if capacity_source == "Velocity forecast":
+                    forecast = forecast_velocity(velocity_matrix(st.session_state.velocity_history), num_sprints)
+                    sprint_capacity_plan = forecast[forecast.index.isin(list(st.session_state.team_members))]
+
+                    if sprint_capacity_plan.empty:
+                        st.warning("None of the configured team members appear in the velocity history. Working hours will be used.")
+                        sprint_capacity_plan = None
+                    else:
+                        forecast_mean = round(float(sprint_capacity_plan.to_numpy().mean()), 1)
+                        st.dataframe(sprint_capacity_plan.round(1), use_container_width=True)
+                        st.caption(
+                            f"Forecast hours per member per sprint (mean {forecast_mean} hours, against "
+                            f"{st.session_state.capacity_per_sprint} configured). Members without history keep their configured capacity."
+                        )
+
             # Assignment Options
             st.subheader("Assignment Options")
             
@@ -566,61 +1007,29 @@ with main_tabs[0]:
             # Assignment button
             if st.button("Run Assignment", type="primary", use_container_width=True):
                 # Get the data
-                df = st.session_state.df_tasks.copy()
+                df = st.session_state.df_tasks
                 team_members = st.session_state.team_members
+                inputs_hash = plan_inputs_hash(
+                    st.session_state.df_tasks,
+                    team_members,
+                    num_sprints,
+                    sprint_duration,
+                    days_per_week,
+                    hours_per_day,
+                    sprint_capacity_plan
+                )
                 
                 # Check for required columns
-                required_columns = ["Priority", "Original Estimates"]
+                required_columns = REQUIRED_COLUMNS
                 if not all(col in df.columns for col in required_columns):
                     st.error(f"CSV must contain these columns: {', '.join(required_columns)}")
                 else:
                     with st.spinner("Assigning tasks across sprints..."):
-                        # Prepare data
-                        assigned_hours = {member: 0 for member in team_members}
-                        assigned_priorities = {member: {"high": 0, "medium": 0, "low": 0, "other": 0} for member in team_members}
-                        
-                        # Add columns if missing or reset them
-                        if "Assigned To" not in df.columns:
-                            df["Assigned To"] = ""
-                        else:
-                            df["Assigned To"] = ""  # Reset assignments
-                            
-                        if "Iteration Path" not in df.columns:
-                            df["Iteration Path"] = ""
-                        else:
-                            df["Iteration Path"] = ""  # Reset iteration paths
-                        
-                        if "Sprint" not in df.columns:
-                            df["Sprint"] = ""
-                        else:
-                            df["Sprint"] = ""  # Reset sprint assignments
-                        
-                        # Define priority order and sort tasks
-                        priority_order = {"high": 1, "medium": 2, "low": 3}
-                        df["PriorityOrder"] = df["Priority"].str.lower().map(priority_order).fillna(4)
-                        df = df.sort_values("PriorityOrder")  # Sort by priority
-                        
-                        # Calculate priorities distribution targets per member
-                        priorities_list = ["high", "medium", "low", "other"]
-                        priority_counts = {}
-                        for priority in priorities_list:
-                            if priority == "other":
-                                count = len(df[~df["Priority"].str.lower().isin(["high", "medium", "low"])])
-                            else:
-                                count = len(df[df["Priority"].str.lower() == priority])
-                            priority_counts[priority] = count
-                        
-                        # Calculate target distribution per member
-                        member_count = len(team_members)
-                        target_distribution = {
-                            priority: max(1, round(count / member_count)) 
-                            for priority, count in priority_counts.items() if count > 0
-                        }
-                        
                         # Create a more detailed info message about sprint planning
                         st.info(f"""
                         Planning {num_sprints} sprints with capacity of {st.session_state.capacity_per_sprint} hours per person per sprint.
                         Total capacity across all sprints: {num_sprints * st.session_state.capacity_per_sprint} hours per person.
+                        {"Members with velocity history are planned with their forecast capacity instead." if sprint_capacity_plan is not None else ""}
                         
                         The algorithm will distribute tasks to ensure:
                         1. Team members get a fair mix of high, medium, and low priority tasks
@@ -628,215 +1037,29 @@ with main_tabs[0]:
                         3. High priority tasks are assigned first
                         """)
                         
-                        # Initialize sprint-specific tracking data
-                        sprint_assignments = {}
-                        sprint_capacities = {}
-                        members_sprint_capacity = {}
-                        
-                        # Set up tracking for each sprint
-                        for sprint in range(1, num_sprints + 1):
-                            sprint_name = f"Sprint {sprint}"
-                            sprint_assignments[sprint_name] = []
-                            sprint_capacities[sprint_name] = {member: 0 for member in team_members}
-                        
-                        # Initialize remaining capacity for each member based on their capacity percentage
-                        # This tracks how much capacity is carried forward between sprints
-                        remaining_capacity = {member: 0 for member in team_members}
-                        
-                        # Process each sprint
-                        for sprint_num in range(1, num_sprints + 1):
-                            sprint_name = f"Sprint {sprint_num}"
-                            
-                            # Calculate each member's capacity for this sprint
-                            # Base capacity + any remaining capacity from previous sprint
-                            for member, full_capacity in team_members.items():
-                                # Calculate what percentage of full time this person is
-                                capacity_percentage = full_capacity / (num_sprints * st.session_state.capacity_per_sprint)
-                                # Capacity for this sprint is the percentage of the sprint's total hours + remaining from previous
-                                members_sprint_capacity[member] = (capacity_percentage * st.session_state.capacity_per_sprint) + remaining_capacity[member]
-                            
-                            # For logging/debugging: show the capacity for each member in each sprint
-                            capacity_summary = ", ".join([f"{m}: {c:.1f}h" for m, c in members_sprint_capacity.items()])
-                            st.text(f"{sprint_name} - Available capacity: {capacity_summary}")
-                            
-                            # Create a copy of tasks that haven't been assigned yet
-                            unassigned_tasks = df[df["Assigned To"] == ""].copy()
-                            
-                            # Skip if no tasks left to assign
-                            if len(unassigned_tasks) == 0:
-                                continue
-                            
-                            # Create priority task groups for this sprint
-                            task_groups = {}
-                            for priority in priorities_list:
-                                if priority == "other":
-                                    task_groups[priority] = unassigned_tasks[~unassigned_tasks["Priority"].str.lower().isin(["high", "medium", "low"])].copy()
-                                else:
-                                    task_groups[priority] = unassigned_tasks[unassigned_tasks["Priority"].str.lower() == priority].copy()
-                                
-                                # Sort by estimate within priority group (smaller tasks first for better distribution)
-                                if len(task_groups[priority]) > 0:
-                                    task_groups[priority] = task_groups[priority].sort_values("Original Estimates")
-                            
-                            # Track assigned priorities for this sprint
-                            sprint_assigned_priorities = {member: {"high": 0, "medium": 0, "low": 0, "other": 0} for member in team_members}
-                            
-                            # First pass: ensure everyone gets a mix of priorities
-                            available_priorities = [p for p in priorities_list if len(task_groups[p]) > 0]
-                            current_priority_index = 0
-                            cycle_count = 0
-                            
-                            while available_priorities and cycle_count < 100:  # Safety limit
-                                cycle_count += 1
-                                current_priority = available_priorities[current_priority_index]
-                                
-                                if len(task_groups[current_priority]) == 0:
-                                    # No more tasks of this priority
-                                    available_priorities.pop(current_priority_index)
-                                    if not available_priorities:
-                                        break
-                                    current_priority_index = current_priority_index % len(available_priorities)
-                                    continue
-                                
-                                # Sort members by who has the least of this priority in this sprint and most remaining capacity
-                                members_sorted = sorted(
-                                    team_members.keys(),
-                                    key=lambda m: (
-                                        sprint_assigned_priorities[m][current_priority],
-                                        assigned_priorities[m][current_priority],  # Consider overall assignments too
-                                        -members_sprint_capacity[m]  # Negated so higher capacity is first
-                                    )
-                                )
-                                
-                                # Try to assign to first member with capacity
-                                task_assigned = False
-                                for member in members_sorted:
-                                    # If no capacity left in this sprint for this member, skip
-                                    if members_sprint_capacity[member] <= 0:
-                                        continue
-                                        
-                                    # Try to find a task that fits the member's remaining sprint capacity
-                                    for idx in task_groups[current_priority].index:
-                                        task = task_groups[current_priority].loc[idx]
-                                        estimate = task["Original Estimates"]
-                                        
-                                        if pd.isna(estimate) or estimate <= 0:
-                                            continue
-                                            
-                                        if estimate <= members_sprint_capacity[member]:
-                                            task_id = task["ID"]
-                                            
-                                            # Assign in the original dataframe
-                                            df.loc[df["ID"] == task_id, "Assigned To"] = member
-                                            df.loc[df["ID"] == task_id, "Sprint"] = sprint_name
-                                            df.loc[df["ID"] == task_id, "Iteration Path"] = f"/{sprint_name}/{current_priority}"
-                                            
-                                            # Update member statistics (both sprint-specific and overall)
-                                            members_sprint_capacity[member] -= estimate
-                                            sprint_capacities[sprint_name][member] += estimate
-                                            assigned_hours[member] += estimate
-                                            
-                                            # Update priority counts
-                                            sprint_assigned_priorities[member][current_priority] += 1
-                                            assigned_priorities[member][current_priority] += 1
-                                            
-                                            # Add to sprint assignments
-                                            sprint_assignments[sprint_name].append(task_id)
-                                            
-                                            # Remove task from the group
-                                            task_groups[current_priority] = task_groups[current_priority].drop(idx)
-                                            
-                                            task_assigned = True
-                                            break
-                                    
-                                    if task_assigned:
-                                        break
-                                
-                                # If no task assigned this round, move to next priority
-                                current_priority_index = (current_priority_index + 1) % len(available_priorities)
-                                
-                                # If we've gone through all priorities and can't assign any more, break
-                                if not task_assigned and current_priority_index == 0:
-                                    break
-                            
-                            # Second pass - assign remaining tasks with balanced approach
-                            for priority_level in priorities_list:
-                                remaining_tasks = task_groups[priority_level]
-                                
-                                if len(remaining_tasks) == 0:
-                                    continue
-                                    
-                                for idx in remaining_tasks.index:
-                                    task = remaining_tasks.loc[idx]
-                                    task_id = task["ID"]
-                                    estimate = task["Original Estimates"]
-                                    
-                                    if pd.isna(estimate) or estimate <= 0:
-                                        continue
-                                    
-                                    # Sort members by who has the least of this priority and most remaining capacity
-                                    shuffled_members = sorted(
-                                        team_members.keys(),
-                                        key=lambda m: (
-                                            sprint_assigned_priorities[m][priority_level],
-                                            -members_sprint_capacity[m]  # Negated so higher capacity is first
-                                        )
-                                    )
-                                    
-                                    # Try to assign to the best-fit member with capacity
-                                    for member in shuffled_members:
-                                        if members_sprint_capacity[member] <= 0:
-                                            continue
-                                            
-                                        if estimate <= members_sprint_capacity[member]:
-                                            # Assign in the original dataframe
-                                            df.loc[df["ID"] == task_id, "Assigned To"] = member
-                                            df.loc[df["ID"] == task_id, "Sprint"] = sprint_name
-                                            df.loc[df["ID"] == task_id, "Iteration Path"] = f"/{sprint_name}/{priority_level}"
-                                            
-                                            # Update member statistics
-                                            members_sprint_capacity[member] -= estimate
-                                            sprint_capacities[sprint_name][member] += estimate
-                                            assigned_hours[member] += estimate
-                                            
-                                            # Update priority counts
-                                            sprint_assigned_priorities[member][priority_level] += 1
-                                            assigned_priorities[member][priority_level] += 1
-                                            
-                                            # Add to sprint assignments
-                                            sprint_assignments[sprint_name].append(task_id)
-                                            break
-                            
-                            # At the end of the sprint, update the remaining capacity that gets carried forward
-                            for member in team_members:
-                                remaining_capacity[member] = members_sprint_capacity[member]
-                                
-                            # Log how much capacity is being carried forward
-                            remaining_summary = ", ".join([f"{m}: {c:.1f}h" for m, c in remaining_capacity.items()])
-                            st.text(f"{sprint_name} - Remaining capacity carried forward: {remaining_summary}")
-                        
-                        # Clean up
-                        if "PriorityOrder" in df.columns:
-                            df = df.drop(columns=["PriorityOrder"])
-                        
                         # Store results with sprint data
-                        st.session_state.results = {
-                            "df": df,
-                            "assigned_hours": assigned_hours,
-                            "assigned_priorities": assigned_priorities,
-                            "team_members": team_members,
-                            "sprint_data": {
-                                "sprint_assignments": sprint_assignments,
-                                "sprint_capacities": sprint_capacities,
-                                "num_sprints": num_sprints
-                            }
-                        }
+                        st.session_state.results = assign_tasks(
+                            df,
+                            team_members,
+                            num_sprints,
+                            st.session_state.capacity_per_sprint,
+                            working_days=sprint_duration * days_per_week,
+                            sprint_capacity_plan=sprint_capacity_plan,
+                            log=st.text
+                        )
+                        st.session_state.results["inputs_hash"] = inputs_hash
                         
+                        # Keep a versioned snapshot of every plan
+                        try:
+                            save_plan(st.session_state.results, inputs_hash)
+                        except Exception as e:
+                            st.warning(f"Plan could not be saved to the plan store: {str(e)}")
+
                         # Switch to results tab
                         st.success("Tasks assigned successfully across sprints! See the Results tab for sprint-by-sprint details.")
     
 # 4. RESULTS TAB
-    with results_tab:
+    with results_tab, profiler.section("Results"):
         st.header("Assignment Results")
         
         if st.session_state.results is None:
@@ -845,14 +1068,23 @@ with main_tabs[0]:
             results = st.session_state.results
             df = results["df"]
             assigned_hours = results["assigned_hours"]
-            assigned_priorities = results["assigned_priorities"]
             team_members = results["team_members"]
+            plan_key = results.get("plan_hash") or plan_hash(df, team_members)
+            
+            # Sprint x member x priority aggregates; results from older sessions are built here once
+            if "cube" not in results:
+                results["cube"] = plan_cube(df)
+            cube = results["cube"]
+            
+            # Hours each member was planned with, which follow the velocity forecast when one was used
+            planned_capacity = planned_member_capacity(results)
+            standard_capacities = sprint_standard_capacities(results)
             
             # Assignment summary
             st.subheader("Summary")
             
             total_assigned = sum(assigned_hours.values())
-            total_capacity = sum(team_members.values())
+            total_capacity = sum(planned_capacity.values())
             percent_utilized = (total_assigned / total_capacity * 100) if total_capacity > 0 else 0
             
             col1, col2, col3 = st.columns(3)
@@ -866,124 +1098,84 @@ with main_tabs[0]:
             with col3:
                 st.metric("Capacity Utilized", f"{percent_utilized:.1f}%")
                 
-            # Detailed results
+            # Detailed results, filtered and paged on the server
             st.subheader("Assigned Tasks")
-            st.dataframe(
-                df,
-                column_config={
-                    "Priority": st.column_config.Column(
-                        "Priority",
-                        help="Task priority level",
-                        width="medium",
-                    ),
-                    "Original Estimates": st.column_config.NumberColumn(
-                        "Hours",
-                        help="Estimated work hours",
-                        format="%.1f",
-                    ),
-                    "Assigned To": st.column_config.Column(
-                        "Assigned To",
-                        help="Team member assigned to the task",
-                        width="medium",
-                    ),
-                    "Sprint": st.column_config.Column(
-                        "Sprint",
-                        help="Sprint assignment",
-                        width="medium",
-                    ),
-                },
-                use_container_width=True
-            )
+            task_index = get_task_index(plan_key, df)
+            task_column_config = {
+                "Priority": st.column_config.Column(
+                    "Priority",
+                    help="Task priority level",
+                    width="medium",
+                ),
+                "Original Estimates": st.column_config.NumberColumn(
+                    "Hours",
+                    help="Estimated work hours",
+                    format="%.1f",
+                ),
+                "Assigned To": st.column_config.Column(
+                    "Assigned To",
+                    help="Team member assigned to the task",
+                    width="medium",
+                ),
+                "Sprint": st.column_config.Column(
+                    "Sprint",
+                    help="Sprint assignment",
+                    width="medium",
+                ),
+            }
+            show_task_table(task_index, "results_tasks", task_column_config)
             
             # Visualizations
             st.subheader("Capacity Utilization")
             
             # Prepare data for visualization
             members = list(team_members.keys())
-            capacities = [team_members[m] for m in members]
-            used_capacities = [assigned_hours[m] for m in members]
-            remaining_capacities = [capacities[i] - used_capacities[i] for i in range(len(members))]
+            members_shown = MEMBER_CHART_LIMIT
+            if len(members) > MEMBER_CHART_LIMIT:
+                members_shown = st.slider("Members shown individually", 5, len(members), MEMBER_CHART_LIMIT, key="members_shown")
+                st.caption("Member charts group everyone else into one \"Others\" bar.")
             
-            # Create capacity chart with dark theme
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 5))
-            bar_width = 0.35
-            x = np.arange(len(members))
+            capacity = member_capacity_frame(cube, planned_capacity)
             
-            # Use more vibrant colors for dark theme
-            ax.bar(x, used_capacities, bar_width, label='Used', color='#81c784')
-            ax.bar(x, remaining_capacities, bar_width, bottom=used_capacities, label='Remaining', color='#455a64')
-            
-            ax.set_ylabel('Hours', color='#e0e0e0')
-            ax.set_title('Overall Capacity Utilization by Team Member', color='#81c784')
-            ax.set_xticks(x)
-            ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-            ax.tick_params(axis='y', colors='#e0e0e0')
-            ax.spines['bottom'].set_color('#555555')
-            ax.spines['top'].set_color('#555555')
-            ax.spines['left'].set_color('#555555')
-            ax.spines['right'].set_color('#555555')
-            ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-            ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
+            # Create interactive capacity chart, largest capacities first when grouped
+            fig = cached_plotly(
+                ("capacity", plan_key, members_shown),
+                capacity_utilization_figure,
+                top_n_with_others(capacity[["Used", "Remaining"]], members_shown, capacity["Capacity"])
+            )
+            st.plotly_chart(fig, use_container_width=True)
             
-            fig.patch.set_facecolor('#1e1e1e')
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Charts drawn on this tab are reused by the plan report
+            report_charts = [("Capacity Utilization", fig)]
             
             # Priority distribution
             st.subheader("Priority Distribution")
             
             # Prepare data for priority chart
-            priorities = ["high", "medium", "low", "other"]
-            priority_data = {member: [assigned_priorities[member].get(p, 0) for p in priorities] for member in members}
-            
-            # Create stacked bar chart with dark theme
-            # We're already using dark_background style from the previous chart
-            fig, ax = plt.subplots(figsize=(10, 5))
-            bottom = np.zeros(len(members))
-            
-            # Enhanced colors for better visibility on dark background
-            colors = {'high': '#ef5350', 'medium': '#ffb74d', 'low': '#81c784', 'other': '#b0bec5'}
-            
-            for i, priority in enumerate(priorities):
-                priority_counts = [priority_data[member][i] for member in members]
-                ax.bar(members, priority_counts, bottom=bottom, label=priority.capitalize(), color=colors[priority])
-                bottom += priority_counts
-            
-            ax.set_ylabel('Number of Tasks', color='#e0e0e0')
-            ax.set_title('Overall Priority Distribution by Team Member', color='#81c784')
-            ax.set_xticks(range(len(members)))
-            ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-            ax.tick_params(axis='y', colors='#e0e0e0')
-            ax.spines['bottom'].set_color('#555555')
-            ax.spines['top'].set_color('#555555')
-            ax.spines['left'].set_color('#555555')
-            ax.spines['right'].set_color('#555555')
-            ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-            ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
+            priority_counts = cube_priority_counts(cube, members)
             
-            fig.patch.set_facecolor('#1e1e1e')
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Create stacked bar chart, members with the most tasks first when grouped
+            fig = cached_plotly(
+                ("priority", plan_key, members_shown),
+                priority_distribution_figure,
+                top_n_with_others(priority_counts, members_shown, priority_counts.sum(axis=1)),
+                'Overall Priority Distribution by Team Member'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            report_charts.append(("Priority Distribution", fig))
             
             # Add detailed priority distribution as tables
             st.subheader("Detailed Priority Mix by Team Member")
             st.write("This table shows exactly how many tasks of each priority level were assigned to each team member:")
             
             # Create a dataframe showing the priority distribution
-            priority_df = pd.DataFrame(assigned_priorities).T
+            priority_df = priority_counts.rename(columns=str.capitalize)
             priority_df.index.name = "Team Member"
-            priority_df.columns = [col.capitalize() for col in priority_df.columns]
             
             # Add percentage columns to show proportion of each priority
-            for member in priority_df.index:
-                total = priority_df.loc[member].sum()
-                if total > 0:
-                    for col in priority_df.columns:
-                        priority_df.loc[member, f"{col} %"] = round(priority_df.loc[member, col] / total * 100, 1)
-                else:
-                    for col in priority_df.columns:
-                        priority_df.loc[member, f"{col} %"] = 0.0
+            member_totals = priority_df.sum(axis=1)
+            priority_shares = priority_df.div(member_totals.where(member_totals > 0), axis=0).mul(100).round(1).fillna(0.0)
+            priority_df = pd.concat([priority_df, priority_shares.add_suffix(" %")], axis=1)
             
             # Display the dataframe
             st.dataframe(priority_df, use_container_width=True)
@@ -1030,27 +1222,29 @@ with main_tabs[0]:
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Create sprint tabs for detailed view
-                sprint_tabs = st.tabs([f"Sprint {i}" for i in range(1, num_sprints + 1)])
+                # Per-sprint totals from the plan cube
+                sprint_names = [f"Sprint {i}" for i in range(1, num_sprints + 1)]
+                sprint_totals = cube_sprint_totals(cube, sprint_names)
+                
+                # Only the selected sprint is computed and drawn, so reruns do not grow with the sprint count
+                sprint_name = st.radio("Sprint", sprint_names, horizontal=True, key="results_sprint")
+                i = sprint_names.index(sprint_name)
                 
-                for i, sprint_tab in enumerate(sprint_tabs):
-                    sprint_name = f"Sprint {i+1}"
+                with st.container(border=True):
+                    st.subheader(f"{sprint_name} Assignments")
                     
-                    with sprint_tab:
-                        st.subheader(f"{sprint_name} Assignments")
-                        
-                        # Sprint Statistics
-                        sprint_tasks = df[df["Sprint"] == sprint_name]
-                        
-                        if len(sprint_tasks) == 0:
-                            st.info(f"No tasks assigned to {sprint_name}.")
-                            continue
+                    # Sprint Statistics
+                    sprint_task_count = int(sprint_totals.at[sprint_name, "Tasks"])
+                    
+                    if sprint_task_count == 0:
+                        st.info(f"No tasks assigned to {sprint_name}.")
+                    else:
                         
                         # Display key metrics for this sprint
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            st.metric("Tasks", len(sprint_tasks))
+                            st.metric("Tasks", sprint_task_count)
                         
                         with col2:
                             sprint_hours = sum(sprint_capacities[sprint_name].values())
@@ -1058,212 +1252,194 @@ with main_tabs[0]:
                         
                         with col3:
                             # Calculate how much capacity was utilized in this sprint
-                            total_sprint_capacity = sum([team_members[m] / num_sprints for m in team_members])
+                            total_sprint_capacity = sum(standard_capacities[sprint_name].values())
                             sprint_percent = (sprint_hours / total_sprint_capacity * 100) if total_sprint_capacity > 0 else 0
                             st.metric("Sprint Capacity Used", f"{sprint_percent:.1f}%")
                         
                         # Tasks assigned to this sprint
                         st.subheader("Tasks")
-                        st.dataframe(
-                            sprint_tasks,
-                            column_config={
-                                "Priority": st.column_config.Column(
-                                    "Priority",
-                                    help="Task priority level",
-                                    width="medium"
-                                ),
-                                "Original Estimates": st.column_config.NumberColumn(
-                                    "Hours",
-                                    help="Estimated work hours",
-                                    format="%.1f"
-                                ),
-                                "Assigned To": st.column_config.Column(
-                                    "Assigned To",
-                                    help="Team member assigned to the task",
-                                    width="medium"
-                                )
-                            },
-                            use_container_width=True
-                        )
+                        show_task_table(task_index, "sprint_tasks", task_column_config, sprint=sprint_name)
                         
                         # Create visualization of capacity used in this sprint
                         st.subheader("Sprint Capacity")
                         
-                        # Prepare data
-                        members = list(team_members.keys())
-                        sprint_used = [sprint_capacities[sprint_name].get(m, 0) for m in members]
-                        
-                        # Calculate carried over capacity from previous sprint
-                        carried_over = []
-                        if i > 0:
-                            prev_sprint = f"Sprint {i}"
-                            for m in members:
-                                member_capacity = team_members[m] / num_sprints  # Base capacity per sprint
-                                used_in_prev = sprint_capacities[prev_sprint].get(m, 0)
-                                carried = max(0, member_capacity - used_in_prev)
-                                carried_over.append(carried)
-                        else:
-                            carried_over = [0] * len(members)
+                        # Standard, carried over (unused in the previous sprint) and used hours per member
+                        members, standard_capacity, carried_over, sprint_used = sprint_capacity_breakdown(
+                            team_members, sprint_capacities, num_sprints, sprint_name, sprint_names[i - 1] if i > 0 else None,
+                            standard_capacities=standard_capacities
+                        )
                         
                         # Create sprint capacity chart
-                        plt.style.use('dark_background')
-                        fig, ax = plt.subplots(figsize=(10, 5))
-                        bar_width = 0.35
-                        x = np.arange(len(members))
-                        
-                        # Member's standard capacity for this sprint
-                        standard_capacity = [team_members[m] / num_sprints for m in members]
-                        
-                        # Visualize standard capacity, carried over capacity, and used capacity
-                        ax.bar(x, standard_capacity, bar_width, label='Standard Capacity', color='#455a64', alpha=0.6)
-                        if any(c > 0 for c in carried_over):
-                            ax.bar(x, carried_over, bar_width, bottom=standard_capacity, label='Carried Over', color='#5c6bc0')
-                        ax.bar(x, sprint_used, bar_width/1.5, label='Used', color='#81c784')
-                        
-                        # Styling
-                        ax.set_ylabel('Hours', color='#e0e0e0')
-                        ax.set_title(f'{sprint_name} Capacity Utilization', color='#81c784')
-                        ax.set_xticks(x)
-                        ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-                        ax.tick_params(axis='y', colors='#e0e0e0')
-                        ax.spines['bottom'].set_color('#555555')
-                        ax.spines['top'].set_color('#555555')
-                        ax.spines['left'].set_color('#555555')
-                        ax.spines['right'].set_color('#555555')
-                        ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                        ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
-                        
-                        fig.patch.set_facecolor('#1e1e1e')
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        st.image(cached_png(
+                            ("sprint_capacity", plan_key, sprint_name),
+                            sprint_capacity_png, members, standard_capacity, carried_over, sprint_used, sprint_name
+                        ))
                         
                         # Create priority breakdown for this sprint
                         st.subheader("Sprint Priority Distribution")
                         
-                        # Get priority distribution for this sprint
-                        sprint_priority_counts = {}
-                        for member in members:
-                            sprint_priority_counts[member] = {"high": 0, "medium": 0, "low": 0, "other": 0}
-                        
-                        for _, task in sprint_tasks.iterrows():
-                            member = task["Assigned To"]
-                            priority = task["Priority"].lower()
-                            if priority not in ["high", "medium", "low"]:
-                                priority = "other"
-                            sprint_priority_counts[member][priority] += 1
-                        
                         # Create stacked bar chart for sprint priority distribution
-                        priority_data = {m: [sprint_priority_counts[m].get(p, 0) for p in priorities] for m in members}
-                        
-                        fig, ax = plt.subplots(figsize=(10, 5))
-                        bottom = np.zeros(len(members))
-                        
-                        for i, priority in enumerate(priorities):
-                            priority_counts = [priority_data[member][i] for member in members]
-                            ax.bar(members, priority_counts, bottom=bottom, label=priority.capitalize(), color=colors[priority])
-                            bottom += priority_counts
-                        
-                        ax.set_ylabel('Number of Tasks', color='#e0e0e0')
-                        ax.set_title(f'{sprint_name} Priority Distribution', color='#81c784')
-                        ax.set_xticks(range(len(members)))
-                        ax.set_xticklabels(members, rotation=45, ha='right', color='#e0e0e0')
-                        ax.tick_params(axis='y', colors='#e0e0e0')
-                        ax.spines['bottom'].set_color('#555555')
-                        ax.spines['top'].set_color('#555555')
-                        ax.spines['left'].set_color('#555555')
-                        ax.spines['right'].set_color('#555555')
-                        ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                        ax.legend(facecolor='#2d2d2d', edgecolor='#555555', labelcolor='#e0e0e0')
-                        
-                        fig.patch.set_facecolor('#1e1e1e')
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        sprint_priority_counts = cube_priority_counts(cube, members, sprint_name)
+                        fig = cached_plotly(
+                            ("sprint_priority", plan_key, sprint_name, members_shown),
+                            priority_distribution_figure,
+                            top_n_with_others(sprint_priority_counts, members_shown, sprint_priority_counts.sum(axis=1)),
+                            f'{sprint_name} Priority Distribution'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
                 
+                # Burndown and burnup projections from the plan
+                st.header("Burndown & Burnup Projection")
+
+                working_days = sprint_data.get("working_days", 10)
+                burndown_df, burnup_df = get_plan_projections(plan_key, df, planned_capacity, num_sprints, working_days)
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    fig = cached_plotly(("burndown", plan_key, working_days), burndown_figure, burndown_df)
+                    st.plotly_chart(fig, use_container_width=True)
+                    report_charts.append(("Burndown Projection", fig))
+
+                with col2:
+                    fig = cached_plotly(("burnup", plan_key, working_days), burnup_figure, burnup_df, num_sprints, working_days)
+                    st.plotly_chart(fig, use_container_width=True)
+                    report_charts.append(("Burnup Projection", fig))
+
                 # Create a Gantt chart visualization of tasks across sprints
                 st.header("Sprint Timeline")
                 
-                # Prepare data for Gantt chart
-                gantt_data = []
-                for _, task in df.iterrows():
-                    if task["Assigned To"] and task["Sprint"]:
-                        sprint_num = int(task["Sprint"].split(" ")[1])
-                        gantt_data.append({
-                            "Task": f"{task['ID']}: {task['Title']}",
-                            "Start": sprint_num,
-                            "Duration": 1,  # Each task takes 1 sprint
-                            "Member": task["Assigned To"],
-                            "Priority": task["Priority"]
-                        })
-                
-                if gantt_data:
-                    # Convert to DataFrame for easier plotting
-                    gantt_df = pd.DataFrame(gantt_data)
-                    
-                    # Sort by Member and Sprint
-                    gantt_df = gantt_df.sort_values(["Member", "Start"])
-                    
-                    # Create figure and axes - adjust height based on task count
-                    max_height = max(8, min(20, len(gantt_df) * 0.3))  # Limit max height 
-                    fig, ax = plt.subplots(figsize=(12, max_height))
-                    
-                    # Plot each task as a horizontal bar
-                    y_pos = np.arange(len(gantt_df))
-                    
-                    # Use colors based on priority
-                    task_colors = [colors.get(task["Priority"].lower(), colors.get("other")) for _, task in gantt_df.iterrows()]
-                    
-                    # Plot bars
-                    ax.barh(y_pos, gantt_df["Duration"], left=gantt_df["Start"], color=task_colors, alpha=0.9)
-                    
-                    # Add vertical lines for sprint boundaries
-                    for sprint in range(1, num_sprints + 1):
-                        ax.axvline(sprint, color='white', linestyle='--', alpha=0.3)
-                    
-                    # Set y-axis labels to task names
-                    ax.set_yticks(y_pos)
-                    ax.set_yticklabels(gantt_df["Task"], fontsize=8, color='#e0e0e0')
-                    
-                    # Set x-axis labels to sprint numbers
-                    ax.set_xticks(range(1, num_sprints + 2))
-                    ax.set_xticklabels([f"Sprint {i}" for i in range(1, num_sprints + 2)], color='#e0e0e0')
-                    
-                    # Add member name annotations
-                    for i, (_, task) in enumerate(gantt_df.iterrows()):
-                        ax.text(task["Start"] + 0.5, i, task["Member"], 
-                               ha='center', va='center', color='#1e1e1e', fontweight='bold')
-                    
-                    # Add labels
-                    ax.set_xlabel('Sprints', color='#e0e0e0')
-                    ax.set_title('Task Timeline Across Sprints', color='#81c784')
-                    
-                    # Style the chart
-                    ax.tick_params(axis='x', colors='#e0e0e0')
-                    ax.spines['bottom'].set_color('#555555')
-                    ax.spines['top'].set_color('#555555')
-                    ax.spines['left'].set_color('#555555')
-                    ax.spines['right'].set_color('#555555')
-                    ax.grid(color='#333333', linestyle='-', linewidth=0.5, alpha=0.7)
-                    
-                    fig.patch.set_facecolor('#1e1e1e')
-                    plt.tight_layout()
-                    st.pyplot(fig)
+                timeline = timeline_frame(df)
+
+                if not timeline.empty:
+                    blocks = timeline_blocks(timeline)
+
+                    if len(timeline) > TIMELINE_DETAIL_LIMIT:
+                        st.caption(f"{len(timeline)} assigned tasks: showing hours per member and sprint. "
+                                   "Use the drill-down below to list the tasks in a block.")
+                        timeline_view = "Member × Sprint"
+                    else:
+                        timeline_view = st.radio("Timeline view", ["Tasks", "Member × Sprint"], horizontal=True, key="timeline_view")
+
+                    if timeline_view == "Tasks":
+                        fig = cached_plotly(("timeline", plan_key, num_sprints), task_timeline_figure, timeline, num_sprints)
+                    else:
+                        fig = cached_plotly(("timeline_blocks", plan_key, num_sprints), timeline_blocks_figure, blocks, num_sprints)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    with st.expander("Drill down into tasks"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            drill_member = st.selectbox("Team member", ["All"] + blocks["Member"].unique().tolist(), key="timeline_member")
+                        with col2:
+                            drill_sprint = st.selectbox("Sprint", ["All"] + [f"Sprint {i}" for i in blocks["Start"].unique()], key="timeline_sprint")
+
+                        mask = pd.Series(True, index=timeline.index)
+                        if drill_member != "All":
+                            mask &= timeline["Member"] == drill_member
+                        if drill_sprint != "All":
+                            mask &= timeline["Start"] == int(drill_sprint.split(" ")[1])
+
+                        drill_tasks = timeline.loc[mask, ["ID", "Task", "Member", "Start", "Priority", "Hours"]]
+                        st.write(f"{len(drill_tasks)} tasks, {drill_tasks['Hours'].sum():.1f} hours")
+                        st.dataframe(drill_tasks.rename(columns={"Start": "Sprint"}), hide_index=True, use_container_width=True)
                 else:
                     st.info("No tasks have been assigned to sprints yet.")
             
             # Download options
             st.subheader("Export Results")
             
-            col1, col2 = st.columns(2)
+            st.download_button(
+                "Download Excel Workbook",
+                lazy_export(
+                    plan_key, "excel", plan_workbook_bytes,
+                    df, cube, planned_capacity, list(results["sprint_data"]["sprint_assignments"])
+                ),
+                file_name="Task_Assignments.xlsx",
+                mime=EXPORT_FORMATS["excel"][1],
+                help="Capacity and priority mix summaries plus one sheet per sprint",
+                key="plan_export_excel"
+            )
+            task_download_buttons(df, plan_key, "Task_Assignments", "plan_export", ["csv", "parquet", "feather"])
+            
+            # Summary, tables and the charts above in one document
+            for col, fmt in zip(st.columns(2), ["markdown", "html"]):
+                with col:
+                    st.download_button(
+                        f"Download Report ({'Markdown' if fmt == 'markdown' else 'HTML'})",
+                        lazy_export((plan_key, members_shown), fmt, plan_report, results, fmt, report_charts),
+                        file_name="Sprint_Plan_Report" + REPORT_FORMATS[fmt][0],
+                        mime=REPORT_FORMATS[fmt][1],
+                        key=f"plan_report_{fmt}"
+                    )
             
+            # Every artifact above plus per-sprint CSVs, charts, metrics and the retro summary in one zip
+            retro = None
+            retro_key = None
+            if st.session_state.retro_feedback is not None:
+                retro_df = create_dataframe_from_results(st.session_state.retro_feedback)
+                retro = (retro_df, st.session_state.get("retro_min_votes", 1), st.session_state.get("retro_max_votes", 50))
+                retro_key = (content_hash(retro_df),) + retro[1:]
+            st.download_button(
+                "Download All (zip)",
+                lazy_export(
+                    (plan_key, members_shown, retro_key), "zip", plan_bundle_bytes,
+                    plan_key, results, (plan_key, members_shown), report_charts,
+                    sprint_capacity_images(plan_key, results), retro
+                ),
+                file_name="Sprint_Plan_Export.zip",
+                mime="application/zip",
+                help="Assignments (CSV, Excel, Parquet), per-sprint CSVs, charts, metrics JSON, plan report and retrospective summary",
+                key="plan_export_bundle"
+            )
+
+        # Saved plan versions
+        st.subheader("Plan History")
+
+        try:
+            saved_plans = list_plans()
+        except Exception as e:
+            saved_plans = None
+            st.warning(f"Plan store unavailable: {str(e)}")
+
+        if saved_plans is not None and not saved_plans.empty:
+            plan_labels = {
+                row.plan_id: f"#{row.plan_id} · {row.created_at} · {row.task_count} tasks" + (f" · {row.name}" if row.name else "")
+                for row in saved_plans.itertuples()
+            }
+
+            col1, col2 = st.columns(2)
+
             with col1:
-                st.markdown(get_download_link(df, "Task_Assignments.xlsx", "excel"), unsafe_allow_html=True)
-                
+                plan_to_load = st.selectbox("Saved plan", options=list(plan_labels), format_func=plan_labels.get, key="plan_history_load")
+                if st.button("Load Plan"):
+                    st.session_state.results = load_plan(plan_to_load)
+                    st.rerun()
+
             with col2:
-                st.markdown(get_download_link(df, "Task_Assignments.csv", "csv"), unsafe_allow_html=True)
+                compare_options = list(plan_labels)
+                compare_from = st.selectbox("Compare from", options=compare_options, index=min(1, len(compare_options) - 1),
+                                            format_func=plan_labels.get, key="plan_history_from")
+                compare_to = st.selectbox("Compare to", options=compare_options, index=0,
+                                          format_func=plan_labels.get, key="plan_history_to")
+
+                if st.button("Compare", disabled=compare_from == compare_to):
+                    st.session_state.plan_comparison = (compare_from, compare_to)
+
+            # Only diff plans once asked to, and only while the same pair is selected
+            if st.session_state.get("plan_comparison") == (compare_from, compare_to):
+                changes = diff_plans(get_stored_plan_tasks(compare_from), get_stored_plan_tasks(compare_to))
+                if changes.empty:
+                    st.info("No task moved between these plan versions.")
+                else:
+                    st.write(f"{len(changes)} tasks changed: " + ", ".join(f"{k}: {v}" for k, v in changes["Change"].value_counts().items()))
+                    st.dataframe(changes, use_container_width=True)
+        else:
+            st.info("No saved plans yet. Every assignment run is saved here automatically.")
 
     
     # 1.5 AZURE DEVOPS TAB
-    with azure_tab:
+    with azure_tab, profiler.section("Azure DevOps"):
         st.subheader("Azure DevOps Integration")
         
         st.markdown("""
@@ -1386,8 +1562,12 @@ with main_tabs[0]:
                             )
                             
                             if tasks_df is not None and not tasks_df.empty:
+                                # Azure DevOps priorities are numbers (1 = most urgent)
+                                tasks_df, _, quarantine = validate_tasks(tasks_df)
                                 st.session_state.df_tasks = tasks_df
                                 st.success(f"Successfully imported {len(tasks_df)} tasks from Azure DevOps")
+                                if len(quarantine):
+                                    st.warning(f"{len(quarantine)} tasks were left out: {', '.join(quarantine['Issue'].unique())}")
                                 st.rerun()
                             else:
                                 st.warning("No tasks found in the current sprint.")
@@ -1423,201 +1603,66 @@ with main_tabs[0]:
     # 6. AI SUGGESTIONS TAB
     ai_tab = st.tabs(["6. AI Suggestions"])[0]
 
-    with ai_tab:
+    with ai_tab, profiler.section("AI Suggestions"):
         st.header("AI Suggestions and Insights")
         st.markdown("Powered by OpenRouter + OpenAI")
 
-        if "ai_messages" not in st.session_state:
-            st.session_state.ai_messages = [
-                {"role": "assistant", "content": "Hello! I'm your sprint planning assistant. How can I help you with your task assignments today?"}
-            ]
-
-        for message in st.session_state.ai_messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-
-        api_key = st.text_input("OpenRouter API Key", type="password", key="ai_api_key")
-
-        if st.session_state.df_tasks is None:
-            st.info("Please upload task data in the Upload Tasks tab first.")
-            st.stop()
-
-        df = st.session_state.df_tasks.copy()
-
-        # 🔍 Extract component expertise from the task file
-        expertise_col_member = "Unnamed: 15"
-        expertise_col_comp = "Unnamed: 16"
-        component_col = None
-
-        if expertise_col_member in df.columns and expertise_col_comp in df.columns:
-            expertise_map = df[[expertise_col_member, expertise_col_comp]].dropna()
-            expertise_map.columns = ["Member", "Expertise"]
-            expertise_dict = expertise_map.set_index("Member")["Expertise"].to_dict()
-        else:
-            expertise_dict = {}
-
-        # 📦 Extract component name from Title (e.g., "Comp1: something")
-        if "Title" in df.columns:
-            df["Component"] = df["Title"].str.extract(r"(Comp\d+)", expand=False)
-
-        # 🧠 Analyze mismatches
-        df["Assigned To"] = df["Assigned To"].fillna("").str.strip()
-        df["Mismatch"] = df.apply(
-            lambda row: (
-                row["Assigned To"] in expertise_dict and
-                pd.notna(row["Component"]) and
-                expertise_dict[row["Assigned To"]] != row["Component"]
-            ),
-            axis=1
-        )
-        mismatches = df[df["Mismatch"]]
-
-        # 📬 User input
-        prompt = st.chat_input("Ask about your sprint plan or say 'fix component mismatches'...")
-
-        if prompt:
-            st.session_state.ai_messages.append({"role": "user", "content": prompt})
-            with st.chat_message("user"):
-                st.markdown(prompt)
-
-            # If user wants to fix mismatches
-            if "fix" in prompt.lower() and "mismatch" in prompt.lower():
-                with st.chat_message("assistant"):
-                    st.success("Fixing tasks by component expertise...")
-                    reassigned = 0
-                    for idx, row in mismatches.iterrows():
-                        correct_member = next((m for m, c in expertise_dict.items() if c == row["Component"]), None)
-                        if correct_member:
-                            df.at[idx, "Assigned To"] = correct_member
-                            reassigned += 1
-
-                    st.success(f"Reassigned {reassigned} mismatched tasks.")
-                    st.dataframe(df[["ID", "Title", "Component", "Assigned To"]], use_container_width=True)
-
-                    st.session_state.df_tasks = df  # Save back corrected
-
-                    st.session_state.ai_messages.append({
-                        "role": "assistant",
-                        "content": f"I found and reassigned {reassigned} tasks to match component expertise."
-                    })
-
-            else:
-                # 🧠 AI Context
-                context = f"""You are an expert sprint planning assistant.
-
-    There are {len(df)} tasks. Component expertise is as follows:\n"""
-                for m, c in expertise_dict.items():
-                    context += f"- {m} specializes in {c}\n"
-
-                if not mismatches.empty:
-                    context += "\n⚠️ Detected mismatches:\n"
-                    for _, row in mismatches.iterrows():
-                        context += f"- Task '{row['Title']}' assigned to {row['Assigned To']} but it's {row['Component']}\n"
-
-                context += f"\nUser prompt: {prompt}"
-
-                # 🔁 Stream response from OpenRouter
-                with st.chat_message("assistant"):
-                    message_placeholder = st.empty()
-                    full_response = ""
-
-                    headers = {
-                        "Authorization": f"Bearer {api_key}",
-                        "HTTP-Referer": "https://localhost",
-                        "Content-Type": "application/json"
-                    }
-
-                    body = {
-                        "model": "openai/gpt-3.5-turbo",
-                        "messages": [{"role": "system", "content": context}] +
-                                    [msg for msg in st.session_state.ai_messages if msg["role"] != "assistant"],
-                        "temperature": 0.7,
-                        "max_tokens": 1500,
-                        "stream": True
-                    }
-
-                    try:
-                        with requests.post(
-                            "https://openrouter.ai/api/v1/chat/completions",
-                            headers=headers,
-                            json=body,
-                            stream=True
-                        ) as response:
-                            if response.status_code == 200:
-                                for chunk in response.iter_lines():
-                                    if chunk:
-                                        chunk_str = chunk.decode('utf-8')
-                                        if chunk_str.startswith("data:"):
-                                            try:
-                                                data = json.loads(chunk_str[5:])
-                                                if "choices" in data and data["choices"]:
-                                                    delta = data["choices"][0].get("delta", {})
-                                                    if "content" in delta:
-                                                        full_response += delta["content"]
-                                                        message_placeholder.markdown(full_response + "▌")
-                                            except json.JSONDecodeError:
-                                                continue
-                            else:
-                                full_response = f"Error: {response.status_code} - {response.text}"
-                    except Exception as e:
-                        full_response = f"An error occurred: {str(e)}"
-
-                    message_placeholder.markdown(full_response)
-                    st.session_state.ai_messages.append({"role": "assistant", "content": full_response})
+        sprint_assistant_chat()
 
 # 2. RETROSPECTIVE ANALYSIS
-with main_tabs[1]:
-    sub_tabs = st.tabs(["📊 Analyze & Visualize", "🤖 AI Retrospective Assistant"])
+elif active_section == APP_SECTIONS[1]:
+    with profiler.section("Retrospective"):
+        sub_tabs = st.tabs(["📊 Analyze & Visualize", "🤖 AI Retrospective Assistant"])
 
-    # ─────────────── TAB 1: ANALYSIS ───────────────
-    with sub_tabs[0]:
-        st.header("📊 Team Retrospective Analysis Tool")
-        st.markdown("Upload multiple retrospective CSV files to analyze and compare feedback across retrospectives.")
+        # ─────────────── TAB 1: ANALYSIS ───────────────
+        with sub_tabs[0]:
+            st.header("📊 Team Retrospective Analysis Tool")
+            st.markdown("Upload multiple retrospective CSV files to analyze and compare feedback across retrospectives.")
 
-        # --- Upload + Controls ---
-        col1, col2 = st.columns([1, 2])
+            # --- Upload + Controls ---
+            col1, col2 = st.columns([1, 2])
     
-        with col1:
-            st.subheader("Controls")
+            with col1:
+                st.subheader("Controls")
             
-            uploaded_files = st.file_uploader(
-                "Upload Retrospective CSV Files",
-                type=["csv"],
-                accept_multiple_files=True,
-                help="Upload one or more CSV files containing retrospective data",
-                key="retro_file_uploader"
-            )
+                uploaded_files = st.file_uploader(
+                    "Upload Retrospective CSV Files",
+                    type=["csv"],
+                    accept_multiple_files=True,
+                    help="Upload one or more CSV files containing retrospective data",
+                    key="retro_file_uploader"
+                )
             
-            st.subheader("Filter Settings")
-            min_votes = st.slider("Minimum Votes", 0, 100, 1, key="retro_min_votes")
-            max_votes = st.slider("Maximum Votes", min_votes, 100, 50, key="retro_max_votes")
+                st.subheader("Filter Settings")
+                min_votes = st.slider("Minimum Votes", 0, 100, key="retro_min_votes")
+                max_votes = st.slider("Maximum Votes", min_votes, 100, key="retro_max_votes")
             
-            if uploaded_files:
-                st.info(f"Selected {len(uploaded_files)} file(s)")
+                if uploaded_files:
+                    st.info(f"Selected {len(uploaded_files)} file(s)")
                 
-                # Process the uploaded files when the analyze button is clicked
-                analyze_button = st.button("Analyze Retrospectives", type="primary", key="analyze_retro_button")
+                    # Process the uploaded files when the analyze button is clicked
+                    analyze_button = st.button("Analyze Retrospectives", type="primary", key="analyze_retro_button")
                 
-                if analyze_button:
-                    with st.spinner("Processing retrospective data..."):
-                        feedback_results, processing_logs = compare_retrospectives(
-                            uploaded_files, min_votes, max_votes
-                        )
+                    if analyze_button:
+                        with st.spinner("Processing retrospective data..."):
+                            feedback_results, processing_logs = compare_retrospectives(
+                                uploaded_files, min_votes, max_votes
+                            )
                         
-                        # Store results in session state
-                        st.session_state.retro_feedback = feedback_results
-                        st.session_state.retro_logs = processing_logs
+                            # Store results in session state
+                            st.session_state.retro_feedback = feedback_results
+                            st.session_state.retro_logs = processing_logs
                         
-                        # Show success message
-                        st.success("Retrospective analysis complete!")
-            else:
-                st.warning("Please upload at least one CSV file")
+                            # Show success message
+                            st.success("Retrospective analysis complete!")
+                else:
+                    st.warning("Please upload at least one CSV file")
         
-        with col2:
-            # Show example of expected format if no files uploaded
-            if not uploaded_files:
-                st.subheader("Expected CSV Format")
-                st.markdown("""
+            with col2:
+                # Show example of expected format if no files uploaded
+                if not uploaded_files:
+                    st.subheader("Expected CSV Format")
+                    st.markdown("""
                 Your CSV files should include columns for feedback description and votes, with format like:
                 ```
                 Type,Description,Votes
@@ -1632,318 +1677,280 @@ with main_tabs[1]:
                 ```
                 """)
                 
-            # Show results if available
-            elif st.session_state.retro_feedback is not None:
-                # Show processing results
-                with st.expander("Processing Logs", expanded=False):
-                    for log in st.session_state.retro_logs:
-                        st.write(log)
+                # Show results if available
+                elif st.session_state.retro_feedback is not None:
+                    # Show processing results
+                    with st.expander("Processing Logs", expanded=False):
+                        for log in st.session_state.retro_logs:
+                            st.write(log)
                 
-                # Convert to DataFrame for easier handling
-                results_df = create_dataframe_from_results(st.session_state.retro_feedback)
+                    # Convert to DataFrame for easier handling
+                    results_df = create_dataframe_from_results(st.session_state.retro_feedback)
+                    feedback_key = content_hash(results_df)
                 
-                if len(results_df) == 0 or (len(results_df) == 1 and "No valid feedback found" in results_df["Feedback"].iloc[0]):
-                    st.error("No feedback items found within the selected vote range. Try adjusting your filters.")
-                else:
-                    # Display the results
-                    st.subheader(f"Consolidated Feedback ({len(results_df)} items)")
-                    st.dataframe(
-                        results_df,
-                        column_config={
-                            "Feedback": st.column_config.TextColumn("Feedback"),
-                            "Task ID": st.column_config.TextColumn("Task ID"),
-                            "Votes": st.column_config.NumberColumn("Votes")
-                        },
-                        use_container_width=True
-                    )
+                    if len(results_df) == 0 or (len(results_df) == 1 and "No valid feedback found" in results_df["Feedback"].iloc[0]):
+                        st.error("No feedback items found within the selected vote range. Try adjusting your filters.")
+                    else:
+                        # Display the results
+                        st.subheader(f"Consolidated Feedback ({len(results_df)} items)")
+                        st.dataframe(
+                            results_df,
+                            column_config={
+                                "Feedback": st.column_config.TextColumn("Feedback"),
+                                "Task ID": st.column_config.TextColumn("Task ID"),
+                                "Votes": st.column_config.NumberColumn("Votes")
+                            },
+                            use_container_width=True
+                        )
                     
-                    # Visualization section
-                    st.subheader("Feedback Visualization")
+                        # Visualization section
+                        st.subheader("Feedback Visualization")
                     
-                    # Only show top 15 items in chart to avoid overcrowding
-                    chart_data = results_df.head(15) if len(results_df) > 15 else results_df
+                        # Only show top 15 items in chart to avoid overcrowding
+                        chart_data = results_df.head(15) if len(results_df) > 15 else results_df
                     
-                    # Create a horizontal bar chart with Plotly
-                    fig = px.bar(
-                        chart_data,
-                        x="Votes",
-                        y="Feedback",
-                        orientation='h',
-                        title=f"Top Feedback Items by Vote Count (min: {min_votes}, max: {max_votes})",
-                        color="Votes",
-                        color_continuous_scale="Viridis"
-                    )
-                    fig.update_layout(yaxis={'categoryorder':'total ascending'})
-                    st.plotly_chart(fig, use_container_width=True)
+                        # Create a horizontal bar chart with Plotly
+                        fig = cached_plotly(
+                            ("feedback_votes", feedback_key, min_votes, max_votes),
+                            feedback_votes_figure, chart_data, min_votes, max_votes
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
                     
-                    # Distribution of votes
-                    st.subheader("Vote Distribution")
-                    vote_distribution = px.histogram(
-                        results_df, 
-                        x="Votes",
-                        nbins=20,
-                        title="Distribution of Votes",
-                        labels={"Votes": "Vote Count", "count": "Number of Feedback Items"}
-                    )
-                    st.plotly_chart(vote_distribution, use_container_width=True)
+                        # Distribution of votes
+                        st.subheader("Vote Distribution")
+                        vote_distribution = cached_plotly(("vote_distribution", feedback_key), vote_distribution_figure, results_df)
+                        st.plotly_chart(vote_distribution, use_container_width=True)
                     
-                    # Count items with and without associated tasks
-                    with_tasks = results_df["Task ID"].apply(lambda x: x != "None").sum()
-                    without_tasks = len(results_df) - with_tasks
+                        # Count items with and without associated tasks
+                        with_tasks = results_df["Task ID"].apply(lambda x: x != "None").sum()
+                        without_tasks = len(results_df) - with_tasks
                     
-                    # Create pie chart for task association
-                    fig3, ax3 = plt.subplots(figsize=(8, 5))
-                    ax3.pie(
-                        [with_tasks, without_tasks],
-                        labels=["With Task ID", "Without Task ID"],
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        colors=['#4CAF50', '#FF9800']
-                    )
-                    ax3.set_title("Feedback Items With Task Association")
-                    ax3.axis('equal')
-                    st.pyplot(fig3)
+                        # Create pie chart for task association
+                        task_association = cached_png(("task_association", feedback_key), task_association_png, with_tasks, without_tasks)
+                        st.image(task_association)
                     
-                    # Export options
-                    st.subheader("Export Results")
-                    export_format = st.radio("Select export format:", ["CSV", "Markdown"], key="retro_export_format")
+                        # Export options
+                        st.subheader("Export Results")
+                        export_format = st.radio("Select export format:", ["CSV", "Markdown", "HTML"], key="retro_export_format")
                     
-                    if export_format == "CSV":
-                        csv = results_df.to_csv(index=False)
-                        st.download_button(
-                            label="Download CSV",
-                            data=csv,
-                            file_name="retrospective_analysis.csv",
-                            mime="text/csv"
-                        )
-                    else:  # Markdown
-                        # Generate markdown content
-                        markdown_content = "# Retrospective Analysis Results\n\n"
-                        markdown_content += f"Filter settings: Min votes: {min_votes}, Max votes: {max_votes}\n\n"
-                        markdown_content += "## Consolidated Feedback\n\n"
-                        
-                        for _, row in results_df.iterrows():
-                            task_info = f" - Task #{row['Task ID']}" if row['Task ID'] != "None" else ""
-                            markdown_content += f"- {row['Feedback']} ({row['Votes']} votes){task_info}\n"
-                        
-                        st.download_button(
-                            label="Download Markdown",
-                            data=markdown_content,
-                            file_name="retrospective_analysis.md",
-                            mime="text/markdown"
-                        )
-
-    # ─────────────── TAB 2: AI ASSISTANT ───────────────
-    with sub_tabs[1]:
-        st.header("🤖 AI Retrospective Assistant")
-        st.markdown("Ask questions about feedback, trends, and improvements.")
-
-        if "ai_messages" not in st.session_state:
-            st.session_state.ai_messages = [
-                {"role": "assistant", "content": "Hi! I'm your retrospective assistant. How can I help?"}
-            ]
+                        # Files are generated only when a download is requested
+                        if export_format == "CSV":
+                            st.download_button(
+                                label="Download CSV",
+                                data=lazy_export(feedback_key, "csv", task_export_bytes, results_df, "csv"),
+                                file_name="retrospective_analysis.csv",
+                                mime="text/csv"
+                            )
+                        else:  # Markdown or HTML report with the charts above
+                            report_format = export_format.lower()
+                            retro_charts = [
+                                ("Top Feedback Items", fig),
+                                ("Vote Distribution", vote_distribution),
+                                ("Task Association", task_association)
+                            ]
+                            st.download_button(
+                                label=f"Download {export_format}",
+                                data=lazy_export(
+                                    (feedback_key, min_votes, max_votes), report_format,
+                                    retro_report, results_df, min_votes, max_votes, report_format, retro_charts
+                                ),
+                                file_name="retrospective_analysis" + REPORT_FORMATS[report_format][0],
+                                mime=REPORT_FORMATS[report_format][1]
+                            )
 
-        for msg in st.session_state.ai_messages:
-            with st.chat_message(msg["role"]):
-                st.markdown(msg["content"])
-
-        api_key = st.text_input("🔑 OpenRouter API Key", type="password", key="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")
-
-        if "retro_feedback" not in st.session_state or st.session_state.retro_feedback is None:
-            st.info("Analyze retrospectives first in the previous tab.")
-            st.stop()
-
-        df = create_dataframe_from_results(st.session_state.retro_feedback)
-
-        # Build context from feedback
-        context = "You are a helpful assistant summarizing retrospective feedback:\n"
-        for _, row in df.iterrows():
-            context += f"- {row['Feedback']} ({row['Votes']} votes){' [Task ID: ' + row['Task ID'] + ']' if row['Task ID'] != 'None' else ''}\n"
-
-        prompt = st.chat_input("Ask me anything about this retrospective...")
-
-        if prompt:
-            st.session_state.ai_messages.append({"role": "user", "content": prompt})
-            with st.chat_message("user"):
-                st.markdown(prompt)
-
-            with st.chat_message("assistant"):
-                msg_placeholder = st.empty()
-                full_response = ""
-
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://localhost",
-                    "Content-Type": "application/json"
-                }
-
-                body = {
-                    "model": "openai/gpt-3.5-turbo",
-                    "messages": [{"role": "system", "content": context}] +
-                                [m for m in st.session_state.ai_messages if m["role"] != "assistant"],
-                    "temperature": 0.7,
-                    "max_tokens": 1500,
-                    "stream": True
-                }
-
-                try:
-                    with requests.post("https://openrouter.ai/api/v1/chat/completions",
-                                       headers=headers, json=body, stream=True) as response:
-                        if response.status_code == 200:
-                            for chunk in response.iter_lines():
-                                if chunk:
-                                    chunk_str = chunk.decode("utf-8")
-                                    if chunk_str.startswith("data:"):
-                                        data = json.loads(chunk_str[5:])
-                                        delta = data["choices"][0].get("delta", {})
-                                        if "content" in delta:
-                                            full_response += delta["content"]
-                                            msg_placeholder.markdown(full_response + "▌")
-                        else:
-                            full_response = f"Error: {response.status_code} - {response.text}"
-                except Exception as e:
-                    full_response = f"Error: {e}"
+        # ─────────────── TAB 2: AI ASSISTANT ───────────────
+        with sub_tabs[1]:
+            st.header("🤖 AI Retrospective Assistant")
+            st.markdown("Ask questions about feedback, trends, and improvements.")
 
-                msg_placeholder.markdown(full_response)
-                st.session_state.ai_messages.append({"role": "assistant", "content": full_response})
+            retro_assistant_chat()
 
 # 3. INSIGHTS INTEGRATION
-with main_tabs[2]:
-    st.header("Insights Integration")
-    st.markdown("Combine data from sprint planning and retrospectives to gain holistic insights.")
+elif active_section == APP_SECTIONS[2]:
+    with profiler.section("Insights"):
+        st.header("Insights Integration")
+        st.markdown("Combine data from sprint planning and retrospectives to gain holistic insights.")
     
-    # Check if data from both tools is available
-    has_sprint_data = st.session_state.df_tasks is not None
-    has_retro_data = st.session_state.retro_feedback is not None
+        # Check if data from both tools is available
+        has_sprint_data = st.session_state.df_tasks is not None
+        has_retro_data = st.session_state.retro_feedback is not None
     
-    if not has_sprint_data and not has_retro_data:
-        st.warning("No data available. Please use both the Sprint Planning and Retrospective Analysis tools first.")
-    else:
-        # Create tabs for different insights
-        overview_tab, task_analysis_tab, improvement_tab = st.tabs([
-            "Team Overview", 
-            "Task Analysis",
-            "Improvement Suggestions"
-        ])
+        if not has_sprint_data and not has_retro_data:
+            st.warning("No data available. Please use both the Sprint Planning and Retrospective Analysis tools first.")
+        else:
+            # Create tabs for different insights
+            overview_tab, task_analysis_tab, improvement_tab = st.tabs([
+                "Team Overview", 
+                "Task Analysis",
+                "Improvement Suggestions"
+            ])
         
-        # Team Overview tab
-        with overview_tab:
-            st.subheader("Team Performance Overview")
+            # Team Overview tab
+            with overview_tab:
+                st.subheader("Team Performance Overview")
             
-            if has_sprint_data and "results" in st.session_state and st.session_state.results is not None:
-                # Sprint statistics
-                sprint_stats = {
-                    "Sprint": [],
-                    "Tasks Assigned": [],
-                    "Capacity Utilization (%)": []
-                }
-                
-                results = st.session_state.results
-                for sprint, tasks in results["sprint_data"]["sprint_assignments"].items():
-                    df = results["df"]
-                    sprint_tasks = df[df["ID"].isin(tasks)]
-                    total_hours = sprint_tasks["Original Estimates"].sum()
+                if has_sprint_data and "results" in st.session_state and st.session_state.results is not None:
+                    # Sprint statistics, read from the plan's sprint x member x priority cube
+                    results = st.session_state.results
+                    if "cube" not in results:
+                        results["cube"] = plan_cube(results["df"])
+                    sprint_totals = cube_sprint_totals(results["cube"], results["sprint_data"]["sprint_assignments"].keys())
                     available = st.session_state.capacity_per_sprint * len(st.session_state.team_members)
-                    utilized = total_hours / available * 100
-                    
-                    sprint_stats["Sprint"].append(sprint)
-                    sprint_stats["Tasks Assigned"].append(len(tasks))
-                    sprint_stats["Capacity Utilization (%)"].append(utilized)
                 
-                sprint_stats_df = pd.DataFrame(sprint_stats)
+                    sprint_stats_df = pd.DataFrame({
+                        "Sprint": sprint_totals.index,
+                        "Tasks Assigned": sprint_totals["Tasks"].astype(int).to_numpy(),
+                        "Capacity Utilization (%)": (sprint_totals["Hours"] / available * 100).to_numpy()
+                    })
                 
-                # Display stats
-                st.dataframe(sprint_stats_df, use_container_width=True)
+                    # Display stats
+                    st.dataframe(sprint_stats_df, use_container_width=True)
                 
-                # Create visualization
-                fig = px.line(
-                    sprint_stats_df,
-                    x="Sprint",
-                    y="Capacity Utilization (%)",
-                    markers=True,
-                    title="Team Capacity Utilization Trend",
-                )
-                fig.update_layout(yaxis_range=[0, 100])
+                    # Create visualization
+                    fig = cached_plotly(("utilization_trend", content_hash(sprint_stats_df)), utilization_trend_figure, sprint_stats_df)
                 
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("Sprint planning data not available. Please complete sprint planning first.")
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("Sprint planning data not available. Please complete sprint planning first.")
+
+                # Velocity history from past iterations
+                st.subheader("Velocity History & Forecast")
+
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    history_file = st.file_uploader(
+                        "Upload completed work per member per sprint (CSV or Excel)",
+                        type=["csv", "xlsx"],
+                        help="Columns: Sprint, Member (or Assigned To), Completed (or Completed Work). An optional Finish Date orders the sprints.",
+                        key="velocity_history_uploader"
+                    )
+                    # Parsed once per selected file, so an Azure DevOps import is not replaced on every rerun
+                    if history_file is not None and st.session_state.get("velocity_upload", (None,))[0] != history_file.file_id:
+                        history_error = None
+                        try:
+                            st.session_state.velocity_history = get_velocity_history(history_file.getvalue(), history_file.name)
+                        except ValueError as e:
+                            history_error = str(e)
+                        st.session_state.velocity_upload = (history_file.file_id, history_error)
+                    if history_file is not None and st.session_state.velocity_upload[1]:
+                        st.error(st.session_state.velocity_upload[1])
+
+                with col2:
+                    if st.session_state.azure_config["connected"]:
+                        if st.button("Import Past Iterations from Azure DevOps"):
+                            with st.spinner("Fetching iteration history..."):
+                                try:
+                                    config = st.session_state.azure_config
+                                    history = get_azure_devops_velocity_history(
+                                        config["org_url"],
+                                        config["project"],
+                                        config["team"],
+                                        config["access_token"]
+                                    )
+                                    if history is not None:
+                                        st.session_state.velocity_history = history
+                                        st.success(f"Imported {history['Sprint'].nunique()} past iterations")
+                                    else:
+                                        st.warning("No completed work found in past iterations.")
+                                except Exception as e:
+                                    st.error(f"Error fetching iteration history: {str(e)}")
+                    else:
+                        st.info("Connect to Azure DevOps to import past iterations directly.")
+
+                if st.session_state.velocity_history is not None:
+                    matrix = velocity_matrix(st.session_state.velocity_history)
+
+                    velocity_window = st.slider("Rolling window (sprints)", 1, 6, key="velocity_window")
+                    forecast_sprints = st.number_input("Sprints to forecast", min_value=1, max_value=12, key="velocity_forecast_sprints")
+
+                    rolling = rolling_velocity(matrix, velocity_window)
+                    forecast = forecast_velocity(matrix, forecast_sprints)
+
+                    st.markdown("**Rolling velocity (hours per sprint)**")
+                    st.dataframe(rolling.round(1), use_container_width=True)
+
+                    # Team totals: history followed by the forecast
+                    team_velocity = pd.DataFrame({
+                        "Sprint": [str(c) for c in matrix.columns] + [f"Forecast {c}" for c in forecast.columns],
+                        "Hours": np.concatenate([matrix.sum(axis=0).to_numpy(), forecast.sum(axis=0).to_numpy()]),
+                        "Type": ["Completed"] * matrix.shape[1] + ["Forecast"] * forecast.shape[1]
+                    })
+
+                    fig = cached_plotly(("velocity", content_hash(team_velocity)), velocity_figure, team_velocity)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    st.caption("Select 'Velocity forecast' as the capacity source in the Sprint & Task Assignment tab to plan with these numbers.")
         
-        # Task Analysis tab
-        with task_analysis_tab:
-            st.subheader("Task & Feedback Analysis")
+            # Task Analysis tab
+            with task_analysis_tab:
+                st.subheader("Task & Feedback Analysis")
             
-            if has_sprint_data and has_retro_data:
-                # Create a cross-reference of tasks and retrospective feedback
-                if "results" in st.session_state and st.session_state.results is not None:
-                    # Get all task IDs from sprint planning
-                    all_task_ids = set()
-                    for sprint, tasks in st.session_state.results["sprint_data"]["sprint_assignments"].items():
-                        for task in tasks:
-                            all_task_ids.add(str(task))  # task is already a task ID
+                if has_sprint_data and has_retro_data:
+                    # Create a cross-reference of tasks and retrospective feedback
+                    if "results" in st.session_state and st.session_state.results is not None:
+                        # Get all task IDs from sprint planning
+                        all_task_ids = set()
+                        for sprint, tasks in st.session_state.results["sprint_data"]["sprint_assignments"].items():
+                            for task in tasks:
+                                all_task_ids.add(str(task))  # task is already a task ID
                     
-                    # Get all task IDs from retrospectives
-                    retro_feedback_df = create_dataframe_from_results(st.session_state.retro_feedback)
-                    retro_tasks = set(retro_feedback_df[retro_feedback_df["Task ID"] != "None"]["Task ID"])
+                        # Get all task IDs from retrospectives
+                        retro_feedback_df = create_dataframe_from_results(st.session_state.retro_feedback)
+                        retro_tasks = set(retro_feedback_df[retro_feedback_df["Task ID"] != "None"]["Task ID"])
                     
-                    # Find overlapping tasks
-                    overlapping_tasks = all_task_ids.intersection(retro_tasks)
+                        # Find overlapping tasks
+                        overlapping_tasks = all_task_ids.intersection(retro_tasks)
                     
-                    # Display stats
-                    col1, col2, col3 = st.columns(3)
+                        # Display stats
+                        col1, col2, col3 = st.columns(3)
                     
-                    with col1:
-                        st.metric("Sprint Planning Tasks", len(all_task_ids))
+                        with col1:
+                            st.metric("Sprint Planning Tasks", len(all_task_ids))
                     
-                    with col2:
-                        st.metric("Retrospective Tasks", len(retro_tasks))
+                        with col2:
+                            st.metric("Retrospective Tasks", len(retro_tasks))
                     
-                    with col3:
-                        st.metric("Cross-Referenced Tasks", len(overlapping_tasks))
+                        with col3:
+                            st.metric("Cross-Referenced Tasks", len(overlapping_tasks))
                     
-                    # Show tasks with feedback
-                    if overlapping_tasks:
-                        st.subheader("Tasks with Retrospective Feedback")
+                        # Show tasks with feedback
+                        if overlapping_tasks:
+                            st.subheader("Tasks with Retrospective Feedback")
                         
-                        # Filter retrospective dataframe to only include tasks from sprint planning
-                        filtered_retro = retro_feedback_df[retro_feedback_df["Task ID"].isin(overlapping_tasks)]
+                            # Filter retrospective dataframe to only include tasks from sprint planning
+                            filtered_retro = retro_feedback_df[retro_feedback_df["Task ID"].isin(overlapping_tasks)]
                         
-                        # Display the filtered dataframe
-                        st.dataframe(filtered_retro, use_container_width=True)
+                            # Display the filtered dataframe
+                            st.dataframe(filtered_retro, use_container_width=True)
                         
-                        # Create visualization of feedback by task
-                        task_feedback = filtered_retro.groupby("Task ID")["Votes"].sum().reset_index()
-                        task_feedback = task_feedback.sort_values(by="Votes", ascending=False)
+                            # Create visualization of feedback by task
+                            task_feedback = filtered_retro.groupby("Task ID")["Votes"].sum().reset_index()
+                            task_feedback = task_feedback.sort_values(by="Votes", ascending=False)
                         
-                        fig = px.bar(
-                            task_feedback,
-                            x="Task ID",
-                            y="Votes",
-                            title="Retrospective Feedback by Task",
-                            labels={"Votes": "Total Votes", "Task ID": "Task ID"}
-                        )
+                            fig = cached_plotly(("task_feedback", content_hash(task_feedback)), task_feedback_figure, task_feedback)
                         
-                        st.plotly_chart(fig, use_container_width=True)
+                            st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            st.info("No tasks with cross-referenced feedback found.")
                     else:
-                        st.info("No tasks with cross-referenced feedback found.")
+                        st.info("Sprint planning results not available. Please complete sprint planning first.")
                 else:
-                    st.info("Sprint planning results not available. Please complete sprint planning first.")
-            else:
-                st.info("Both sprint planning and retrospective data are required for this analysis.")
+                    st.info("Both sprint planning and retrospective data are required for this analysis.")
         
-        # Improvement Suggestions tab
-        with improvement_tab:
-            st.subheader("Improvement Suggestions")
+            # Improvement Suggestions tab
+            with improvement_tab:
+                st.subheader("Improvement Suggestions")
             
-            if has_retro_data:
-                # Get top voted retrospective items
-                retro_feedback_df = create_dataframe_from_results(st.session_state.retro_feedback)
-                top_feedback = retro_feedback_df.head(5)
+                if has_retro_data:
+                    # Get top voted retrospective items
+                    retro_feedback_df = create_dataframe_from_results(st.session_state.retro_feedback)
+                    top_feedback = retro_feedback_df.head(5)
                 
-                st.write("Based on retrospective feedback, consider these improvement areas:")
+                    st.write("Based on retrospective feedback, consider these improvement areas:")
                 
-                for i, (_, row) in enumerate(top_feedback.iterrows(), 1):
-                    st.markdown(f"""
+                    for i, (_, row) in enumerate(top_feedback.iterrows(), 1):
+                        st.markdown(f"""
                     <div style='background-color: #2e7d32; padding: 15px; border-radius: 8px; margin-bottom: 10px; color: white;'>
                         <h4>{i}. {row['Feedback']} ({row['Votes']} votes)</h4>
                         <p>Consider creating a task to address this feedback.</p>
@@ -1952,49 +1959,49 @@ with main_tabs[2]:
                     </div>
                     """, unsafe_allow_html=True)
                 
-                # Allow creation of new tasks from feedback
-                st.subheader("Convert Feedback to Tasks")
+                    # Allow creation of new tasks from feedback
+                    st.subheader("Convert Feedback to Tasks")
                 
-                # Select feedback item to convert
-                feedback_to_convert = st.selectbox(
-                    "Select feedback item to convert to task",
-                    options=retro_feedback_df["Feedback"].tolist()
-                )
+                    # Select feedback item to convert
+                    feedback_to_convert = st.selectbox(
+                        "Select feedback item to convert to task",
+                        options=retro_feedback_df["Feedback"].tolist()
+                    )
                 
-                if feedback_to_convert:
-                    with st.form("create_task_form"):
-                        st.write(f"Creating task from: {feedback_to_convert}")
+                    if feedback_to_convert:
+                        with st.form("create_task_form"):
+                            st.write(f"Creating task from: {feedback_to_convert}")
                         
-                        task_title = st.text_input(
-                            "Task Title",
-                            value=f"Address: {feedback_to_convert[:50]}..." if len(feedback_to_convert) > 50 else f"Address: {feedback_to_convert}"
-                        )
+                            task_title = st.text_input(
+                                "Task Title",
+                                value=f"Address: {feedback_to_convert[:50]}..." if len(feedback_to_convert) > 50 else f"Address: {feedback_to_convert}"
+                            )
                         
-                        col1, col2 = st.columns(2)
+                            col1, col2 = st.columns(2)
                         
-                        with col1:
-                            task_priority = st.selectbox(
-                                "Priority",
-                                options=["1", "2", "3", "4"]
-                            )
+                            with col1:
+                                task_priority = st.selectbox(
+                                    "Priority",
+                                    options=["1", "2", "3", "4"]
+                                )
                         
-                        with col2:
-                            task_estimate = st.number_input(
-                                "Estimated Hours",
-                                min_value=1,
-                                value=8
-                            )
+                            with col2:
+                                task_estimate = st.number_input(
+                                    "Estimated Hours",
+                                    min_value=1,
+                                    value=8
+                                )
                         
-                        create_task = st.form_submit_button("Create Task")
+                            create_task = st.form_submit_button("Create Task")
                         
-                        if create_task:
-                            # Simulate task creation
-                            st.success(f"Task created: {task_title}")
+                            if create_task:
+                                # Simulate task creation
+                                st.success(f"Task created: {task_title}")
                             
-                            # In a real app, you would add this to the task list or send it to Azure
-                            # For now, just acknowledge it was created
-            else:
-                st.info("Retrospective data is required for improvement suggestions.")
+                                # In a real app, you would add this to the task list or send it to Azure
+                                # For now, just acknowledge it was created
+                else:
+                    st.info("Retrospective data is required for improvement suggestions.")
 
 # Footer
 st.markdown("---")
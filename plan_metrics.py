@@ -0,0 +1,324 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+PRIORITY_LEVELS = ["high", "medium", "low", "other"]
+
+
+def content_hash(df, **params):
+    """
+    Content hash of a DataFrame plus any parameters that shape what is derived from it.
+
+    Returns:
+        Short hex digest, stable across processes
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def plan_hash(df, team_members, **config):
+    """
+    Content hash identifying a sprint plan.
+
+    Args:
+        df: Assigned task DataFrame
+        team_members: Mapping of member name to capacity
+        **config: Any sprint configuration values that shape the plan
+
+    Returns:
+        Short hex digest, stable across processes
+    """
+    return content_hash(df, team_members=team_members, **config)
+
+
+def plan_metrics_summary(results):
+    """Summarize a plan as JSON-serializable metrics"""
+    df = results["df"]
+    team_members = planned_member_capacity(results)
+    sprint_data = results["sprint_data"]
+
+    total_assigned = float(sum(results["assigned_hours"].values()))
+    total_capacity = float(sum(team_members.values()))
+
+    return {
+        "plan_hash": results.get("plan_hash"),
+        "inputs_hash": results.get("inputs_hash"),
+        "tasks": len(df),
+        "tasks_assigned": int((df["Assigned To"] != "").sum()),
+        "hours_assigned": total_assigned,
+        "capacity": total_capacity,
+        "capacity_utilized_pct": round(total_assigned / total_capacity * 100, 1) if total_capacity > 0 else 0.0,
+        "members": {
+            member: {
+                "capacity": float(capacity),
+                "hours_assigned": float(results["assigned_hours"][member]),
+                "priorities": results["assigned_priorities"][member]
+            }
+            for member, capacity in team_members.items()
+        },
+        "sprints": {
+            sprint_name: {
+                "tasks": len(sprint_data["sprint_assignments"][sprint_name]),
+                "hours": float(sum(capacities.values()))
+            }
+            for sprint_name, capacities in sprint_data["sprint_capacities"].items()
+        }
+    }
+
+
+def priority_bucket(priority):
+    """Vectorized mapping of raw priorities to high / medium / low / other"""
+    lowered = priority.astype(str).str.lower()
+    return lowered.where(lowered.isin(PRIORITY_LEVELS[:-1]), "other")
+
+
+def plan_cube(df):
+    """
+    Task counts and hours of a plan per sprint, member and priority level, from a single groupby.
+
+    Returns:
+        DataFrame indexed by (Sprint, Member, Priority) with Tasks and Hours columns
+    """
+    assigned = df[(df["Assigned To"].fillna("") != "") & (df["Sprint"].fillna("") != "")]
+    keyed = pd.DataFrame({
+        "Sprint": assigned["Sprint"],
+        "Member": assigned["Assigned To"],
+        "Priority": priority_bucket(assigned["Priority"]),
+        "Hours": pd.to_numeric(assigned["Original Estimates"], errors="coerce").fillna(0.0)
+    })
+    return keyed.groupby(["Sprint", "Member", "Priority"], sort=False).agg(
+        Tasks=("Hours", "size"),
+        Hours=("Hours", "sum")
+    )
+
+
+def cube_priority_counts(cube, members, sprint=None):
+    """Member x priority task counts from a plan cube, for the whole plan or one sprint"""
+    if sprint is not None:
+        cube = cube[cube.index.get_level_values("Sprint") == sprint]
+    counts = cube["Tasks"].groupby(level=["Member", "Priority"]).sum().unstack(fill_value=0)
+    return counts.reindex(index=list(members), columns=PRIORITY_LEVELS, fill_value=0).fillna(0).astype(int)
+
+
+def cube_sprint_totals(cube, sprints):
+    """Task count and hours per sprint from a plan cube, in the given sprint order"""
+    return cube.groupby(level="Sprint").sum().reindex(list(sprints), fill_value=0)
+
+
+def timeline_frame(df):
+    """
+    One row per assigned task with its sprint number, for timeline views.
+
+    Tasks in sprints whose name does not end in a number cannot be placed and are left out.
+
+    Returns:
+        DataFrame with ID, Task, Member, Start, Duration, Priority, Bucket and Hours,
+        sorted by member and sprint
+    """
+    assigned = df[(df["Assigned To"].fillna("") != "") & (df["Sprint"].fillna("") != "")]
+    start = pd.to_numeric(assigned["Sprint"].astype(str).str.extract(r"(\d+)$", expand=False), errors="coerce")
+    assigned, start = assigned[start.notna()], start.dropna().astype(int)
+
+    timeline = pd.DataFrame({
+        "ID": assigned["ID"],
+        "Task": assigned["ID"].astype(str) + ": " + assigned["Title"].astype(str),
+        "Member": assigned["Assigned To"],
+        "Start": start,
+        "Duration": 1,  # Each task takes 1 sprint
+        "Priority": assigned["Priority"],
+        "Bucket": priority_bucket(assigned["Priority"]),
+        "Hours": pd.to_numeric(assigned["Original Estimates"], errors="coerce").fillna(0.0)
+    })
+    return timeline.sort_values(["Member", "Start"], kind="stable").reset_index(drop=True)
+
+
+def timeline_blocks(timeline):
+    """Aggregate a timeline into member x sprint blocks with task counts and hour totals"""
+    return (
+        timeline.groupby(["Member", "Start"], sort=True)
+        .agg(Tasks=("ID", "size"), Hours=("Hours", "sum"))
+        .reset_index()
+    )
+
+
+def sprint_standard_capacities(results):
+    """
+    Hours each member was planned with per sprint, before carried-over capacity.
+
+    Plans saved before these were recorded get an even share of each member's capacity.
+
+    Returns:
+        Sprint name to member to hours
+    """
+    sprint_data = results["sprint_data"]
+    if sprint_data.get("standard_capacities"):
+        return sprint_data["standard_capacities"]
+    num_sprints = sprint_data["num_sprints"]
+    return {
+        sprint_name: {member: capacity / num_sprints for member, capacity in results["team_members"].items()}
+        for sprint_name in sprint_data["sprint_capacities"]
+    }
+
+
+def planned_member_capacity(results):
+    """Total hours per member across the plan's sprints, which differ from team_members with a velocity forecast"""
+    capacity = {member: 0.0 for member in results["team_members"]}
+    for capacities in sprint_standard_capacities(results).values():
+        for member, hours in capacities.items():
+            capacity[member] = capacity.get(member, 0.0) + hours
+    return capacity
+
+
+def member_capacity_frame(cube, team_members):
+    """Capacity, used and remaining hours per member, with used hours taken from a plan cube"""
+    capacity = pd.Series(team_members, dtype=float)
+    used = cube["Hours"].groupby(level="Member").sum().reindex(capacity.index, fill_value=0.0)
+    return pd.DataFrame({"Capacity": capacity, "Used": used, "Remaining": capacity - used})
+
+
+def sprint_capacity_breakdown(team_members, sprint_capacities, num_sprints, sprint_name, previous_sprint=None,
+                              standard_capacities=None):
+    """
+    Standard, carried over and used hours per member for one sprint, as drawn by charts.sprint_capacity_png.
+
+    Args:
+        sprint_capacities: Sprint name to member hours used, from the plan's sprint_data
+        previous_sprint: Name of the sprint before, whose unused capacity carries over; None for the first sprint
+        standard_capacities: Sprint name to member hours planned, from sprint_standard_capacities();
+            defaults to an even share of team_members
+
+    Returns:
+        (members, standard_capacity, carried_over, sprint_used) lists
+    """
+    members = list(team_members.keys())
+
+    def standard(sprint):
+        if standard_capacities is None:
+            return [team_members[m] / num_sprints for m in members]
+        return [standard_capacities[sprint].get(m, 0) for m in members]
+
+    standard_capacity = standard(sprint_name)
+    sprint_used = [sprint_capacities[sprint_name].get(m, 0) for m in members]
+    if previous_sprint is None:
+        carried_over = [0] * len(members)
+    else:
+        carried_over = [
+            max(0, capacity - sprint_capacities[previous_sprint].get(m, 0))
+            for m, capacity in zip(members, standard(previous_sprint))
+        ]
+    return members, standard_capacity, carried_over, sprint_used
+
+
+def capacity_utilization_pct(capacity):
+    """Used share of each member's capacity in percent; NaN for members without capacity"""
+    return (capacity["Used"] / capacity["Capacity"].where(capacity["Capacity"] > 0) * 100).round(1)
+
+
+def sprint_priority_mix(cube, sprints=None):
+    """Task counts per priority level and total hours for each sprint, from a plan cube"""
+    mix = cube["Tasks"].groupby(level=["Sprint", "Priority"], sort=False).sum().unstack(fill_value=0)
+    mix = mix.reindex(columns=PRIORITY_LEVELS, fill_value=0).astype(int)
+    mix["Hours"] = cube["Hours"].groupby(level="Sprint", sort=False).sum()
+    if sprints is not None:
+        mix = mix.reindex(list(sprints), fill_value=0)
+    return mix
+
+
+def top_n_with_others(frame, n, rank_by):
+    """
+    Keep the n rows ranking highest by rank_by and sum the rest into one "Others" row.
+
+    Args:
+        frame: Numeric DataFrame indexed by member
+        n: Rows kept as they are
+        rank_by: Series aligned with frame used for ranking
+    """
+    if len(frame) <= n:
+        return frame
+    keep = rank_by.nlargest(n).index
+    rest = frame.drop(index=keep)
+    others = rest.sum().to_frame(f"Others ({len(rest)})").T
+    return pd.concat([frame.loc[keep], others])
+
+
+def _completion_days(assigned, team_members, num_sprints, working_days):
+    """Working day (1-based) on which each assigned task is projected to finish"""
+    members = assigned["Assigned To"].to_numpy()
+    hours = assigned["Original Estimates"].to_numpy(dtype=float)
+
+    # Work done so far by the same member in the same sprint, in plan order
+    done = assigned.groupby(["Sprint", "Assigned To"], sort=False)["Original Estimates"].cumsum().to_numpy(dtype=float)
+    sprint_load = assigned.groupby(["Sprint", "Assigned To"], sort=False)["Original Estimates"].transform("sum").to_numpy(dtype=float)
+
+    # Members burn their share of capacity evenly, fast enough to finish their sprint load
+    base = np.array([team_members.get(m, 0) for m in members], dtype=float) / num_sprints
+    daily_rate = np.maximum(base, sprint_load) / working_days
+    daily_rate[daily_rate <= 0] = 1.0
+
+    days = np.ceil(np.round(done / daily_rate, 9)).astype(int)
+    return np.clip(days, 1, working_days), hours
+
+
+def _burned_hours(df, team_members, num_sprints, working_days):
+    """Cumulative hours completed per sprint (rows) by the end of each day (columns, day 0 first)"""
+    assigned = df[(df["Sprint"] != "") & (df["Assigned To"] != "")]
+    sprint_names = [f"Sprint {i}" for i in range(1, num_sprints + 1)]
+
+    sprint_index = pd.Categorical(assigned["Sprint"], categories=sprint_names).codes
+    days, hours = _completion_days(assigned, team_members, num_sprints, working_days)
+
+    completed = np.zeros((num_sprints, working_days + 1))
+    valid = sprint_index >= 0
+    np.add.at(completed, (sprint_index[valid], days[valid]), hours[valid])
+    return sprint_names, completed.cumsum(axis=1)
+
+
+def project_burndown(df, team_members, num_sprints, working_days):
+    """
+    Project the daily remaining hours of every sprint.
+
+    Args:
+        df: Assigned task DataFrame with Sprint, Assigned To and Original Estimates
+        team_members: Mapping of member name to total capacity
+        num_sprints: Number of planned sprints
+        working_days: Working days per sprint
+
+    Returns:
+        DataFrame with Sprint, Day, Remaining and Ideal columns
+    """
+    sprint_names, burned = _burned_hours(df, team_members, num_sprints, working_days)
+    totals = burned[:, -1:]
+    day_axis = np.arange(working_days + 1)
+
+    return pd.DataFrame({
+        "Sprint": np.repeat(sprint_names, working_days + 1),
+        "Day": np.tile(day_axis, num_sprints),
+        "Remaining": (totals - burned).ravel(),
+        "Ideal": (totals * (1 - day_axis / working_days)).ravel()
+    })
+
+
+def project_burnup(df, team_members, num_sprints, working_days):
+    """
+    Project cumulative completed hours across all sprints against total scope.
+
+    Returns:
+        DataFrame with Day, Sprint, Completed and Scope columns, one row per working day
+    """
+    sprint_names, burned = _burned_hours(df, team_members, num_sprints, working_days)
+
+    # Each sprint starts from everything completed in the sprints before it
+    offsets = np.concatenate([[0.0], burned[:-1, -1].cumsum()])
+    completed = burned[:, 1:] + offsets[:, None]
+
+    return pd.DataFrame({
+        "Day": np.arange(1, completed.size + 1),
+        "Sprint": np.repeat(sprint_names, working_days),
+        "Completed": completed.ravel(),
+        "Scope": float(pd.to_numeric(df["Original Estimates"], errors="coerce").fillna(0).sum())
+    })
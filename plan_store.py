@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from plan_metrics import plan_cube
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "PLAN_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".agile_suite", "plans.sqlite3")
+)
+
+
+@contextmanager
+def _connect(path=None):
+    """Open the plan store, creating it on first use, and commit on success"""
+    path = path or DEFAULT_STORE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS plans (
+                plan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                created_at TEXT NOT NULL,
+                inputs_hash TEXT NOT NULL,
+                plan_hash TEXT NOT NULL UNIQUE,
+                task_count INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                tasks BLOB NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS plans_inputs_hash ON plans (inputs_hash)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS column_mappings (
+                signature TEXT PRIMARY KEY,
+                source TEXT,
+                updated_at TEXT NOT NULL,
+                mapping TEXT NOT NULL
+            )
+        """)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def save_plan(results, inputs_hash, name=None, path=None):
+    """
+    Save a plan snapshot. Saving an identical plan again returns the existing version.
+
+    Args:
+        results: Results dict as produced by the assignment step
+        inputs_hash: Hash of the backlog, team and configuration the plan was built from
+        name: Optional label for the snapshot
+        path: Store location, defaults to PLAN_STORE_PATH
+
+    Returns:
+        plan_id of the stored snapshot
+    """
+    buffer = BytesIO()
+    results["df"].to_parquet(buffer, index=False)
+
+    sprint_data = results["sprint_data"]
+    summary = {
+        "assigned_hours": results["assigned_hours"],
+        "assigned_priorities": results["assigned_priorities"],
+        "team_members": results["team_members"],
+        "sprint_capacities": sprint_data["sprint_capacities"],
+        "standard_capacities": sprint_data.get("standard_capacities"),
+        "num_sprints": sprint_data["num_sprints"],
+        "working_days": sprint_data.get("working_days")
+    }
+
+    with _connect(path) as conn:
+        row = conn.execute("SELECT plan_id FROM plans WHERE plan_hash = ?", (results["plan_hash"],)).fetchone()
+        if row is not None:
+            return row[0]
+
+        cursor = conn.execute(
+            "INSERT INTO plans (name, created_at, inputs_hash, plan_hash, task_count, summary, tasks) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                datetime.now().isoformat(timespec="seconds"),
+                inputs_hash,
+                results["plan_hash"],
+                len(results["df"]),
+                json.dumps(summary, default=float),
+                buffer.getvalue()
+            )
+        )
+        return cursor.lastrowid
+
+
+def list_plans(path=None):
+    """List stored plan versions, newest first, without loading their tasks"""
+    with _connect(path) as conn:
+        return pd.read_sql_query(
+            "SELECT plan_id, name, created_at, inputs_hash, plan_hash, task_count FROM plans ORDER BY plan_id DESC",
+            conn
+        )
+
+
+def load_plan(plan_id, path=None):
+    """Load a stored plan back into the results dict used by the app"""
+    with _connect(path) as conn:
+        row = conn.execute(
+            "SELECT plan_hash, inputs_hash, summary, tasks FROM plans WHERE plan_id = ?", (plan_id,)
+        ).fetchone()
+
+    if row is None:
+        raise KeyError(f"No stored plan with id {plan_id}")
+
+    stored_hash, inputs_hash, summary, tasks = row
+    summary = json.loads(summary)
+    df = pd.read_parquet(BytesIO(tasks))
+
+    sprint_assignments = {f"Sprint {i}": [] for i in range(1, summary["num_sprints"] + 1)}
+    assigned = df[df["Sprint"] != ""]
+    sprint_assignments.update(assigned.groupby("Sprint", sort=False)["ID"].agg(list).to_dict())
+
+    return {
+        "df": df,
+        "assigned_hours": summary["assigned_hours"],
+        "assigned_priorities": summary["assigned_priorities"],
+        "team_members": summary["team_members"],
+        "plan_hash": stored_hash,
+        "inputs_hash": inputs_hash,
+        "cube": plan_cube(df),
+        "sprint_data": {
+            "sprint_assignments": sprint_assignments,
+            "sprint_capacities": summary["sprint_capacities"],
+            "standard_capacities": summary.get("standard_capacities"),
+            "num_sprints": summary["num_sprints"],
+            "working_days": summary["working_days"] or 10
+        }
+    }
+
+
+def delete_plan(plan_id, path=None):
+    """Remove a stored plan version"""
+    with _connect(path) as conn:
+        conn.execute("DELETE FROM plans WHERE plan_id = ?", (plan_id,))
+
+
+def save_column_mapping(signature, mapping, source=None, path=None):
+    """
+    Remember the column mapping of a backlog source, replacing any earlier mapping for it.
+
+    Args:
+        signature: column_mapping.header_signature of the source's headers
+        mapping: File header to planner column mapping
+        source: Optional label, e.g. the uploaded file name
+    """
+    with _connect(path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO column_mappings (signature, source, updated_at, mapping) VALUES (?, ?, ?, ?)",
+            (signature, source, datetime.now().isoformat(timespec="seconds"), json.dumps(mapping))
+        )
+
+
+def load_column_mapping(signature, path=None):
+    """
+    Stored column mapping for a header signature, or None.
+
+    A read-only lookup: the store is opened read-only and never created, so a missing
+    store simply has no mappings.
+    """
+    path = path or DEFAULT_STORE_PATH
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT mapping FROM column_mappings WHERE signature = ?", (signature,)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # Store written before column mappings were added
+    finally:
+        conn.close()
+    return None if row is None else json.loads(row[0])
+
+
+def diff_plans(old_df, new_df):
+    """
+    Compare two plans task by task.
+
+    Args:
+        old_df: Assigned task DataFrame of the earlier plan
+        new_df: Assigned task DataFrame of the later plan
+
+    Returns:
+        DataFrame of changed tasks with old/new member and sprint and a Change label
+    """
+    columns = ["ID", "Title", "Assigned To", "Sprint"]
+    old = old_df[[c for c in columns if c in old_df.columns]]
+    new = new_df[[c for c in columns if c in new_df.columns]]
+
+    merged = old.merge(new, on="ID", how="outer", suffixes=(" (old)", " (new)"), indicator=True)
+
+    old_member = merged["Assigned To (old)"].fillna("")
+    new_member = merged["Assigned To (new)"].fillna("")
+    old_sprint = merged["Sprint (old)"].fillna("")
+    new_sprint = merged["Sprint (new)"].fillna("")
+
+    member_moved = old_member.ne(new_member).to_numpy()
+    sprint_moved = old_sprint.ne(new_sprint).to_numpy()
+    side = merged["_merge"].to_numpy()
+
+    change = np.select(
+        [side == "left_only", side == "right_only", member_moved & sprint_moved, member_moved, sprint_moved],
+        ["Removed", "Added", "Moved member and sprint", "Moved member", "Moved sprint"],
+        default=""
+    )
+
+    if "Title (old)" in merged.columns:
+        merged["Title"] = merged["Title (new)"].fillna(merged["Title (old)"])
+
+    merged["Change"] = change
+    changed = merged[change != ""]
+    ordered = ["ID", "Title", "Change", "Assigned To (old)", "Assigned To (new)", "Sprint (old)", "Sprint (new)"]
+    return changed[[c for c in ordered if c in changed.columns]].reset_index(drop=True)
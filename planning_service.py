@@ -0,0 +1,270 @@
+"""
+Local HTTP service around the sprint planning engine.
+
+    python planning_service.py --port 8765 --workers 2 --max-jobs 4
+
+POST /plan    Plan a backlog. Send JSON:
+                  {"tasks": [{"ID": 1, "Title": "...", "Priority": "High", "Original Estimates": 5}, ...],
+                   "team_members": {"Ann": 120, "Bob": 100},
+                   "num_sprints": 3, "sprint_duration": 2, "days_per_week": 5, "hours_per_day": 8}
+              or an Arrow IPC stream of the tasks (Content-Type: application/vnd.apache.arrow.stream)
+              with the remaining settings as JSON in the schema metadata key "planning".
+              Responds with JSON, or an Arrow stream of the assignments when the Accept header asks for it.
+GET  /health  Worker, job and cache status.
+"""
+import argparse
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from bounded_cache import BoundedLRUCache
+from plan_metrics import plan_metrics_summary
+from sprint_engine import assign_tasks, drop_completed_tasks, plan_inputs_hash
+from validation import validate_tasks
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+ASSIGNMENT_COLUMNS = ["ID", "Assigned To", "Sprint", "Iteration Path"]
+
+DEFAULT_SETTINGS = {
+    "num_sprints": 3,
+    "sprint_duration": 2,
+    "days_per_week": 5,
+    "hours_per_day": 8
+}
+
+
+def _warm_worker():
+    """Worker initializer: plan a one-task backlog so imports and first-call setup are done before any request"""
+    tasks = pd.DataFrame({"ID": [1], "Title": ["warm-up"], "Priority": ["High"], "Original Estimates": [1.0]})
+    assign_tasks(tasks, {"warm-up": 8}, 1, 8)
+
+
+def _noop():
+    return None
+
+
+def run_plan_job(tasks, team_members, settings):
+    """Plan one backlog in a worker process and return assignments plus metrics"""
+    results = assign_tasks(
+        tasks,
+        team_members,
+        settings["num_sprints"],
+        settings["sprint_duration"] * settings["days_per_week"] * settings["hours_per_day"],
+        working_days=settings["sprint_duration"] * settings["days_per_week"]
+    )
+    assignments = results["df"][[c for c in ASSIGNMENT_COLUMNS if c in results["df"].columns]].reset_index(drop=True)
+    return {"assignments": assignments, "metrics": plan_metrics_summary(results)}
+
+
+class PlanningService:
+    """
+    Warm process pool with a bound on concurrent jobs and an in-memory plan cache.
+
+    Args:
+        workers: Number of worker processes kept alive
+        max_jobs: Jobs allowed to run or wait for a worker at the same time
+        queue_timeout: Seconds a request waits for a job slot before getting 503
+        cache_entries: Number of plans kept in memory, keyed by inputs hash
+    """
+
+    def __init__(self, workers=2, max_jobs=4, queue_timeout=30, cache_entries=64):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.queue_timeout = queue_timeout
+        self.cache = BoundedLRUCache(max_entries=cache_entries)
+        self._slots = threading.BoundedSemaphore(max_jobs)
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        # Start every worker now so the first requests do not pay for process start-up
+        for future in [self._executor.submit(_noop) for _ in range(workers)]:
+            future.result()
+
+    def plan(self, tasks, team_members, settings):
+        """
+        Plan a backlog, serving identical requests from the cache.
+
+        Returns:
+            (result dict, cached flag), or (None, False) when no job slot frees up in time
+
+        Raises:
+            ValueError: When a sprint, duration, days or hours setting is not positive
+        """
+        settings = {**DEFAULT_SETTINGS, **{k: int(v) for k, v in settings.items() if k in DEFAULT_SETTINGS}}
+        invalid = [k for k, v in settings.items() if v <= 0]
+        if invalid:
+            raise ValueError(f"Settings must be positive: {', '.join(invalid)}")
+        tasks, _, _ = validate_tasks(drop_completed_tasks(tasks))
+        key = plan_inputs_hash(
+            tasks,
+            team_members,
+            settings["num_sprints"],
+            settings["sprint_duration"],
+            settings["days_per_week"],
+            settings["hours_per_day"]
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            return None, False
+        try:
+            with self._active_lock:
+                self._active += 1
+            result = self._executor.submit(run_plan_job, tasks, team_members, settings).result()
+        finally:
+            with self._active_lock:
+                self._active -= 1
+            self._slots.release()
+
+        result["metrics"]["inputs_hash"] = key
+        return self.cache.put(key, result), False
+
+    def health(self):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+            "active_jobs": self._active,
+            "cache": self.cache.stats()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+def parse_plan_request(body, content_type):
+    """Decode a /plan request body into (tasks DataFrame, team members, settings)"""
+    if content_type.startswith(ARROW_MIME):
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(body).read_all()
+        metadata = table.schema.metadata or {}
+        payload = json.loads(metadata.get(b"planning", b"{}"))
+        if not isinstance(payload, dict):
+            raise ValueError("Arrow metadata key \"planning\" must be a JSON object")
+        tasks = table.to_pandas()
+    else:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        tasks = pd.DataFrame(payload.get("tasks", []))
+
+    if not isinstance(payload.get("team_members", {}), dict):
+        raise ValueError("team_members must be an object of member name to capacity")
+    team_members = {str(name): float(capacity) for name, capacity in payload.get("team_members", {}).items()}
+    if tasks.empty:
+        raise ValueError("Request contains no tasks")
+    if not team_members:
+        raise ValueError("Request contains no team_members")
+
+    missing_columns = [col for col in ["ID", "Priority", "Original Estimates"] if col not in tasks.columns]
+    if missing_columns:
+        raise ValueError(f"Tasks are missing columns: {', '.join(missing_columns)}")
+
+    return tasks, team_members, payload
+
+
+def make_handler(service):
+    """Build a request handler class bound to a PlanningService"""
+
+    class PlanningRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status, payload):
+            self._send(status, json.dumps(payload).encode("utf-8"))
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, service.health())
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/plan":
+                self._send_json(404, {"error": "Not found"})
+                return
+
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                tasks, team_members, settings = parse_plan_request(body, self.headers.get("Content-Type", ""))
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                result, cached = service.plan(tasks, team_members, settings)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": f"Planning failed: {str(e)}"})
+                return
+
+            if result is None:
+                self._send_json(503, {"error": "All planning slots are busy, retry later"})
+                return
+
+            metrics = {**result["metrics"], "cached": cached}
+            if ARROW_MIME in self.headers.get("Accept", ""):
+                import pyarrow as pa
+
+                table = pa.Table.from_pandas(result["assignments"], preserve_index=False)
+                table = table.replace_schema_metadata({b"metrics": json.dumps(metrics).encode("utf-8")})
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                self._send(200, sink.getvalue().to_pybytes(), ARROW_MIME)
+            else:
+                self._send_json(200, {
+                    "metrics": metrics,
+                    "assignments": json.loads(result["assignments"].to_json(orient="records"))
+                })
+
+        def log_message(self, format, *args):
+            pass
+
+    return PlanningRequestHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the sprint planning engine over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (local only by default)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Warm worker processes")
+    parser.add_argument("--max-jobs", type=int, default=4, help="Concurrent planning jobs before requests wait")
+    parser.add_argument("--queue-timeout", type=float, default=30, help="Seconds to wait for a job slot")
+    parser.add_argument("--cache-entries", type=int, default=64, help="Plans kept in the in-memory cache")
+    args = parser.parse_args(argv)
+
+    service = PlanningService(args.workers, args.max_jobs, args.queue_timeout, args.cache_entries)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Planning service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
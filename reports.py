@@ -0,0 +1,256 @@
+"""
+Markdown and HTML reports for sprint plans and retrospectives.
+
+Reports are generated as a stream of text chunks in a single pass: tables are
+formatted a column at a time with vectorized string operations and every chunk
+is joined once at the end.
+"""
+import base64
+import html
+import importlib.util
+
+import pandas as pd
+
+from plan_metrics import (
+    capacity_utilization_pct,
+    member_capacity_frame,
+    plan_metrics_summary,
+    planned_member_capacity,
+    sprint_priority_mix,
+)
+
+# Report format -> (extension, MIME type)
+REPORT_FORMATS = {
+    "markdown": (".md", "text/markdown"),
+    "html": (".html", "text/html")
+}
+
+PLAN_REPORT_COLUMNS = ["ID", "Title", "Priority", "Original Estimates", "Assigned To"]
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5em; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+th {{ background: #f0f0f0; }}
+</style>
+</head>
+<body>
+"""
+
+
+def _cells(frame):
+    """Table cells as strings, with missing values blank and floats rounded"""
+    cells = {}
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_float_dtype(values):
+            text = values.round(2).astype(str).str.replace(r"\.0$", "", regex=True)
+        else:
+            text = values.astype(str)
+        cells[str(column)] = text.where(values.notna(), "")
+    return pd.DataFrame(cells, index=frame.index)
+
+
+def _join_columns(cells, start, sep, end):
+    """One string per row, built column by column over the whole table"""
+    columns = list(cells.columns)
+    rows = start + cells[columns[0]]
+    for column in columns[1:]:
+        rows = rows + sep + cells[column]
+    return rows + end
+
+
+def _escape_html(text):
+    """Vectorized html.escape for a Series of strings"""
+    return (
+        text.str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+    )
+
+
+def markdown_table(frame):
+    """Markdown table of a DataFrame; the index is written as the first column when it is named"""
+    if frame.index.name is not None:
+        frame = frame.reset_index()
+    if frame.empty:
+        return "_None_\n\n"
+    cells = _cells(frame).apply(lambda col: col.str.replace("|", "\\|", regex=False).str.replace("\n", " ", regex=False))
+    header = "| " + " | ".join(cells.columns) + " |\n|" + "---|" * len(cells.columns) + "\n"
+    return header + "".join(_join_columns(cells, "| ", " | ", " |\n")) + "\n"
+
+
+def html_table(frame):
+    """HTML table of a DataFrame; the index is written as the first column when it is named"""
+    if frame.index.name is not None:
+        frame = frame.reset_index()
+    if frame.empty:
+        return "<p><em>None</em></p>\n"
+    cells = _cells(frame).apply(_escape_html)
+    header = "<table>\n<tr>" + "".join(f"<th>{html.escape(col)}</th>" for col in cells.columns) + "</tr>\n"
+    return header + "".join(_join_columns(cells, "<tr><td>", "</td><td>", "</td></tr>\n")) + "</table>\n"
+
+
+def _png_uri(png):
+    return "data:image/png;base64," + base64.b64encode(png).decode()
+
+
+class _ReportWriter:
+    """Emits headings, paragraphs, tables and charts in one of REPORT_FORMATS"""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        self.plotly_loaded = False
+
+    def heading(self, text, level=2):
+        if self.fmt == "html":
+            return f"<h{level}>{html.escape(text)}</h{level}>\n"
+        return "#" * level + f" {text}\n\n"
+
+    def paragraph(self, text):
+        if self.fmt == "html":
+            return f"<p>{html.escape(text)}</p>\n"
+        return text + "\n\n"
+
+    def bullets(self, items):
+        """Bulleted list of a list or Series of strings"""
+        items = pd.Series(items, dtype=object).astype(str)
+        if self.fmt == "html":
+            return "<ul>\n" + "".join("<li>" + _escape_html(items) + "</li>\n") + "</ul>\n"
+        return "".join("- " + items + "\n") + "\n"
+
+    def table(self, frame):
+        return html_table(frame) if self.fmt == "html" else markdown_table(frame)
+
+    def chart(self, title, chart):
+        """
+        A plotly figure or PNG bytes. Plotly figures are interactive in HTML; in Markdown
+        they are embedded as PNG when kaleido is installed, otherwise noted by title.
+        """
+        if hasattr(chart, "to_html"):
+            if self.fmt != "html":
+                if importlib.util.find_spec("kaleido") is None:
+                    return f"_{title}: interactive chart, see the HTML report_\n\n"
+                chart = chart.to_image(format="png")
+                return f"![{title}]({_png_uri(chart)})\n\n"
+            include_plotlyjs = "cdn" if not self.plotly_loaded else False
+            self.plotly_loaded = True
+            return chart.to_html(full_html=False, include_plotlyjs=include_plotlyjs) + "\n"
+        if self.fmt == "html":
+            return f'<img src="{_png_uri(chart)}" alt="{html.escape(title)}">\n'
+        return f"![{title}]({_png_uri(chart)})\n\n"
+
+    def start(self, title):
+        return HTML_HEAD.format(title=html.escape(title)) if self.fmt == "html" else ""
+
+    def end(self):
+        return "</body>\n</html>\n" if self.fmt == "html" else ""
+
+
+def _chart_section(writer, charts):
+    """Charts heading and every chart that renders in the writer's format; nothing when none does"""
+    rendered = [chunk for chunk in (writer.chart(title, chart) for title, chart in charts) if chunk]
+    if rendered:
+        yield writer.heading("Charts")
+        yield from rendered
+
+
+def iter_plan_report(results, fmt="markdown", charts=(), sprints=None):
+    """
+    Stream a sprint plan report: summary, capacity and priority mix tables, charts
+    and the tasks of every sprint.
+
+    Args:
+        results: Assignment results with df, cube, team_members, assigned_hours and sprint_data
+        fmt: "markdown" or "html"
+        charts: (title, plotly figure or PNG bytes) pairs, e.g. from charts.cached_plotly
+        sprints: Sprint names in report order; defaults to the plan's sprints
+    """
+    writer = _ReportWriter(fmt)
+    df = results["df"]
+    cube = results["cube"]
+    sprints = list(sprints if sprints is not None else results["sprint_data"]["sprint_assignments"])
+    metrics = plan_metrics_summary(results)
+
+    yield writer.start("Sprint Plan Report")
+    yield writer.heading("Sprint Plan Report", 1)
+    yield writer.bullets([
+        f"Plan: {metrics['plan_hash'] or 'not saved'}",
+        f"Tasks assigned: {metrics['tasks_assigned']} of {metrics['tasks']}",
+        f"Hours assigned: {metrics['hours_assigned']:.1f} of {metrics['capacity']:.1f} "
+        f"({metrics['capacity_utilized_pct']}% of capacity)",
+        f"Sprints: {len(sprints)}, team members: {len(results['team_members'])}"
+    ])
+
+    capacity = member_capacity_frame(cube, planned_member_capacity(results))
+    capacity["Utilization %"] = capacity_utilization_pct(capacity)
+    yield writer.heading("Capacity by Member")
+    yield writer.table(capacity.rename_axis("Member"))
+
+    yield writer.heading("Priority Mix by Sprint")
+    yield writer.table(sprint_priority_mix(cube, sprints).rename_axis("Sprint"))
+
+    yield from _chart_section(writer, charts)
+
+    columns = [col for col in PLAN_REPORT_COLUMNS if col in df.columns]
+    sprint = df["Sprint"].astype(object).where(df["Sprint"].notna(), "")
+    positions = sprint.groupby(sprint, sort=False).indices
+    for sprint_name in sprints:
+        yield writer.heading(str(sprint_name))
+        yield writer.table(df.iloc[positions.get(sprint_name, [])][columns])
+
+    yield writer.heading("Unassigned")
+    yield writer.table(df.loc[(sprint == "").to_numpy(), columns])
+    yield writer.end()
+
+
+def iter_retro_report(results_df, min_votes, max_votes, fmt="markdown", charts=()):
+    """
+    Stream a retrospective report: filter settings, summary, charts and every
+    consolidated feedback item.
+
+    Args:
+        results_df: Feedback, Task ID ("None" when absent) and Votes per item
+        fmt: "markdown" or "html"
+        charts: (title, plotly figure or PNG bytes) pairs
+    """
+    writer = _ReportWriter(fmt)
+    has_task = results_df["Task ID"] != "None"
+
+    yield writer.start("Retrospective Analysis Results")
+    yield writer.heading("Retrospective Analysis Results", 1)
+    yield writer.paragraph(f"Filter settings: Min votes: {min_votes}, Max votes: {max_votes}")
+    yield writer.heading("Summary")
+    yield writer.bullets([
+        f"Feedback items: {len(results_df)}",
+        f"Total votes: {int(results_df['Votes'].sum())}",
+        f"Items linked to a task: {int(has_task.sum())}"
+    ])
+
+    yield from _chart_section(writer, charts)
+
+    yield writer.heading("Consolidated Feedback")
+    task_info = (" - Task #" + results_df["Task ID"].astype(str)).where(has_task, "")
+    yield writer.bullets(results_df["Feedback"].astype(str) + " (" + results_df["Votes"].astype(str) + " votes)" + task_info)
+    yield writer.end()
+
+
+def render_report(chunks):
+    """Join a streamed report into UTF-8 bytes"""
+    return "".join(chunks).encode("utf-8")
+
+
+def plan_report(results, fmt="markdown", charts=(), sprints=None):
+    """Sprint plan report as bytes, for st.download_button"""
+    return render_report(iter_plan_report(results, fmt, charts, sprints))
+
+
+def retro_report(results_df, min_votes, max_votes, fmt="markdown", charts=()):
+    """Retrospective report as bytes, for st.download_button"""
+    return render_report(iter_retro_report(results_df, min_votes, max_votes, fmt, charts))
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Reruns kept per session
+PROFILE_HISTORY = 50
+
+# Seconds a profiling session stays registered without a rerun, so closed tabs stop counting
+TRACING_SESSION_TTL = 15 * 60
+
+# Session key -> time of its last profiled rerun; tracemalloc runs while any session is registered
+_tracing_sessions = {}
+_tracing_lock = threading.Lock()
+
+
+def new_profile_history(max_runs=PROFILE_HISTORY):
+    """Ring buffer of per-rerun profiles, kept in session state"""
+    return deque(maxlen=max_runs)
+
+
+class RerunProfiler:
+    """
+    Times the major sections of one script run and records them in a profile history.
+
+    The run's record is appended to the history when its first section starts and each
+    section is added as it finishes, so runs cut short by st.stop() are still recorded.
+
+    Args:
+        history: Ring buffer from new_profile_history()
+        enabled: When False every section is a no-op
+    """
+
+    def __init__(self, history, enabled=True):
+        self.history = history
+        self.enabled = enabled
+        self.record = None
+
+    def _start_record(self):
+        self.record = {
+            "run": self.history[-1]["run"] + 1 if self.history else 1,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "sections": []
+        }
+        self.history.append(self.record)
+
+    @contextmanager
+    def section(self, name):
+        """
+        Record wall time and memory allocated while the block runs.
+
+        Memory is measured process-wide, so it includes allocations by other sessions
+        running at the same time. It is left empty when tracemalloc is not running;
+        set_tracing() starts it.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self.record is None:
+            self._start_record()
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            allocated_kb = peak_kb = None
+            if tracing and tracemalloc.is_tracing():
+                memory_after, memory_peak = tracemalloc.get_traced_memory()
+                allocated_kb = round((memory_after - memory_before) / 1024, 1)
+                peak_kb = round((memory_peak - memory_before) / 1024, 1)
+            self.record["sections"].append({
+                "section": name,
+                "wall_ms": round(wall_ms, 2),
+                "allocated_kb": allocated_kb,
+                "peak_kb": peak_kb
+            })
+
+
+def set_tracing(session_key, enabled):
+    """
+    Record whether a session profiles its reruns.
+
+    tracemalloc is process-wide, so it starts with the first profiling session and stops
+    only once no session is profiling any more; other sessions never switch it off.
+    Sessions without a rerun for TRACING_SESSION_TTL seconds, such as closed tabs, are
+    dropped on the next call from any session.
+
+    Args:
+        session_key: Stable key of the browser session
+        enabled: Whether the session's profiling checkbox is on
+    """
+    now = time.monotonic()
+    with _tracing_lock:
+        for key, last_seen in list(_tracing_sessions.items()):
+            if now - last_seen > TRACING_SESSION_TTL:
+                del _tracing_sessions[key]
+        if enabled:
+            _tracing_sessions[session_key] = now
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        else:
+            _tracing_sessions.pop(session_key, None)
+            if not _tracing_sessions and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def profile_frame(history):
+    """One row per recorded section across all runs in the history"""
+    rows = [{"run": record["run"], **section} for record in history for section in record["sections"]]
+    return pd.DataFrame(rows, columns=["run", "section", "wall_ms", "allocated_kb", "peak_kb"])
+
+
+def profile_summary(history):
+    """Per-section mean and max wall time and mean allocations across the history, slowest first"""
+    frame = profile_frame(history)
+    summary = frame.groupby("section").agg(
+        runs=("run", "nunique"),
+        mean_ms=("wall_ms", "mean"),
+        max_ms=("wall_ms", "max"),
+        mean_allocated_kb=("allocated_kb", "mean"),
+        max_peak_kb=("peak_kb", "max")
+    )
+    return summary.round(2).sort_values("mean_ms", ascending=False)
+
+
+def profile_json(history):
+    """Profile history as JSON for export"""
+    return json.dumps(list(history), indent=2)
@@ -0,0 +1,184 @@
+"""
+Headless sprint planning for scheduled jobs.
+
+Runs the same assignment engine as the "Run Assignment" button without
+Streamlit or any charting library:
+
+    python sprint_cli.py tasks.csv team.csv --sprints 3 -o assigned.csv --metrics metrics.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+from column_mapping import mapped_header, resolve_column_mapping
+from exports import file_format, write_task_file
+from ingest import apply_task_dtypes, read_task_csv_chunked, read_task_file, read_task_header
+from plan_metrics import plan_metrics_summary
+from plan_store import save_plan
+from sprint_engine import assign_tasks, drop_completed_tasks, plan_inputs_hash
+from validation import validate_tasks
+
+
+def read_table(path, **kwargs):
+    """Read a CSV, Excel, Parquet or Feather file based on its extension; kwargs go to the CSV and Excel readers"""
+    fmt = file_format(path)
+    if fmt == "excel":
+        return pd.read_excel(path, **kwargs)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path, **kwargs)
+
+
+def positive_int(value):
+    """argparse type for settings that must be at least 1"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def load_tasks(path, chunked=False, spill_path=None, mapping_store=False):
+    """
+    Load the backlog with the app's ingest dtypes, drop completed tasks and validate the rest,
+    as the Upload Tasks tab does. Columns are renamed with the mapping matched from the header
+    names or, with mapping_store, the mapping saved in the plan store for the file's headers.
+
+    With chunked, a CSV backlog is streamed from disk and only its active tasks are kept,
+    spilled to spill_path (or a temporary file) and read back from there.
+
+    Returns:
+        (valid tasks, issue report, quarantined rows) from validation.validate_tasks
+    """
+    fmt = file_format(path)
+    if fmt == "excel":
+        df = pd.read_excel(path)
+        df.columns = mapped_header(df.columns, resolve_column_mapping(df.columns, use_store=mapping_store)[1])
+        df = apply_task_dtypes(df)
+    elif chunked and fmt == "csv":
+        _, column_mapping, _ = resolve_column_mapping(read_task_header(path), use_store=mapping_store)
+        df = read_task_csv_chunked(path, column_mapping=column_mapping, spill_path=spill_path)
+    else:
+        with open(path, "rb") as tasks_file:
+            data = tasks_file.read()
+        _, column_mapping, _ = resolve_column_mapping(read_task_header(data, fmt), use_store=mapping_store)
+        df = read_task_file(data, file_format=fmt, column_mapping=column_mapping)
+    missing_columns = [col for col in ["ID", "Title", "Priority", "Original Estimates"] if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+    return validate_tasks(drop_completed_tasks(df))
+
+
+def load_roster(path):
+    """Load team members as Name,Capacity rows (header optional)"""
+    roster = read_table(path)
+    if "Name" not in roster.columns:
+        roster = read_table(path, header=None, names=["Name", "Capacity"])
+    capacity_col = next((col for col in roster.columns if str(col).startswith("Capacity")), None)
+    if capacity_col is None:
+        raise ValueError("Roster must have a Capacity column")
+
+    roster = roster.dropna(subset=["Name"])
+    capacities = pd.to_numeric(roster[capacity_col], errors="coerce")
+    return {str(name).strip(): float(capacity) for name, capacity in zip(roster["Name"], capacities) if capacity > 0}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Assign backlog tasks to team members across sprints.")
+    parser.add_argument("tasks", help="Task backlog (CSV, Excel, Parquet or Feather) with ID, Title, Priority, Original Estimates")
+    parser.add_argument("roster", help="Team roster (CSV or Excel) with Name,Capacity rows")
+    parser.add_argument("-o", "--output", default="Task_Assignments.csv", help="Assigned task file (.csv, .xlsx, .parquet or .feather)")
+    parser.add_argument("--metrics", default="plan_metrics.json", help="Metrics JSON output")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Stream a CSV backlog from disk, dropping completed tasks block by block")
+    parser.add_argument("--spill", help="With --chunked, keep the active tasks in this Arrow file")
+    parser.add_argument("--mapping-store", action="store_true",
+                        help="Use column mappings saved in the plan store (implied by --save-plan)")
+    parser.add_argument("--quarantine", help="Write tasks left out by validation to this file")
+    parser.add_argument("--sprints", type=positive_int, default=3, help="Number of sprints to plan")
+    parser.add_argument("--sprint-weeks", type=positive_int, default=2, help="Sprint duration in weeks")
+    parser.add_argument("--days-per-week", type=positive_int, default=5, help="Working days per week")
+    parser.add_argument("--hours-per-day", type=positive_int, default=8, help="Working hours per day")
+    parser.add_argument("--velocity-history", help="Completed work history; plans with the velocity forecast as capacity")
+    parser.add_argument("--save-plan", action="store_true", help="Also save the plan to the local plan store")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print per-sprint capacity logs")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        df_tasks, issues, quarantine = load_tasks(
+            args.tasks,
+            chunked=args.chunked,
+            spill_path=args.spill,
+            mapping_store=args.mapping_store or args.save_plan
+        )
+        team_members = load_roster(args.roster)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if not team_members:
+        print("error: the roster has no team members with capacity", file=sys.stderr)
+        return 2
+
+    coerced = int((issues["Action"] == "coerced").sum())
+    if coerced or len(quarantine):
+        print(f"validation: {coerced} values normalized, {len(quarantine)} tasks quarantined", file=sys.stderr)
+    if args.quarantine and len(quarantine):
+        write_task_file(quarantine, args.quarantine)
+
+    capacity_per_sprint = args.sprint_weeks * args.days_per_week * args.hours_per_day
+
+    sprint_capacity_plan = None
+    if args.velocity_history:
+        from velocity import forecast_velocity, load_velocity_history, velocity_matrix
+
+        with open(args.velocity_history, "rb") as history_file:
+            matrix = velocity_matrix(load_velocity_history(history_file))
+        forecast = forecast_velocity(matrix, args.sprints)
+        sprint_capacity_plan = forecast[forecast.index.isin(list(team_members))]
+        if sprint_capacity_plan.empty:
+            sprint_capacity_plan = None
+
+    results = assign_tasks(
+        df_tasks,
+        team_members,
+        args.sprints,
+        capacity_per_sprint,
+        working_days=args.sprint_weeks * args.days_per_week,
+        sprint_capacity_plan=sprint_capacity_plan,
+        log=None if args.quiet else lambda message: print(message, file=sys.stderr)
+    )
+    results["inputs_hash"] = plan_inputs_hash(
+        df_tasks,
+        team_members,
+        args.sprints,
+        args.sprint_weeks,
+        args.days_per_week,
+        args.hours_per_day,
+        sprint_capacity_plan
+    )
+
+    write_task_file(results["df"], args.output)
+    metrics = plan_metrics_summary(results)
+
+    if args.save_plan:
+        metrics["plan_id"] = save_plan(results, results["inputs_hash"], name=os.path.basename(args.tasks))
+
+    with open(args.metrics, "w") as metrics_file:
+        json.dump(metrics, metrics_file, indent=2)
+
+    print(f"Assigned {metrics['tasks_assigned']} of {metrics['tasks']} tasks "
+          f"({metrics['capacity_utilized_pct']}% of capacity) -> {args.output}, {args.metrics}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
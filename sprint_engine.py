@@ -0,0 +1,321 @@
+import pandas as pd
+
+from plan_metrics import plan_cube, plan_hash
+
+REQUIRED_COLUMNS = ["Priority", "Original Estimates"]
+
+
+def drop_completed_tasks(df):
+    """Remove tasks whose State is done, as the Upload Tasks tab does"""
+    if "State" in df.columns:
+        return df[df["State"].astype(str).str.lower() != "done"]
+    return df
+
+
+def plan_inputs_hash(df_tasks, team_members, num_sprints, sprint_duration, days_per_week, hours_per_day,
+                     sprint_capacity_plan=None):
+    """Hash of everything a plan is built from, used to find plans made from the same inputs"""
+    return plan_hash(
+        df_tasks,
+        team_members,
+        num_sprints=num_sprints,
+        sprint_duration=sprint_duration,
+        days_per_week=days_per_week,
+        hours_per_day=hours_per_day,
+        capacity_plan=None if sprint_capacity_plan is None else sprint_capacity_plan.to_dict()
+    )
+
+
+def assign_tasks(df, team_members, num_sprints, capacity_per_sprint, working_days=10,
+                 sprint_capacity_plan=None, log=None):
+    """
+    Distribute tasks across sprints and team members with balanced priorities.
+
+    Remaining capacity of each member is carried forward to the next sprint.
+
+    Args:
+        df: Task DataFrame with at least Priority and Original Estimates
+        team_members: Mapping of member name to total capacity in hours
+        num_sprints: Number of sprints to plan
+        capacity_per_sprint: Working hours per member per sprint
+        working_days: Working days per sprint, kept with the plan for projections
+        sprint_capacity_plan: Optional members x sprints DataFrame of forecast capacity
+            that replaces the fixed share for the members it contains
+        log: Optional callable receiving progress messages
+
+    Returns:
+        Results dict with the assigned DataFrame, per-member totals and sprint data
+
+    Raises:
+        ValueError: Required columns are missing or the sprint count or capacity is not positive
+    """
+    if num_sprints <= 0 or capacity_per_sprint <= 0:
+        raise ValueError(f"Sprints and capacity per sprint must be positive: {num_sprints}, {capacity_per_sprint}")
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Tasks must contain these columns: {', '.join(missing_columns)}")
+
+    if log is None:
+        log = lambda message: None
+
+    df = df.copy()
+
+    # Prepare data
+    assigned_hours = {member: 0 for member in team_members}
+    assigned_priorities = {member: {"high": 0, "medium": 0, "low": 0, "other": 0} for member in team_members}
+
+    # Add columns if missing or reset them
+    if "Assigned To" not in df.columns:
+        df["Assigned To"] = ""
+    else:
+        df["Assigned To"] = ""  # Reset assignments
+
+    if "Iteration Path" not in df.columns:
+        df["Iteration Path"] = ""
+    else:
+        df["Iteration Path"] = ""  # Reset iteration paths
+
+    if "Sprint" not in df.columns:
+        df["Sprint"] = ""
+    else:
+        df["Sprint"] = ""  # Reset sprint assignments
+
+    # Define priority order and sort tasks
+    priority_order = {"high": 1, "medium": 2, "low": 3}
+    df["PriorityOrder"] = df["Priority"].str.lower().map(priority_order).fillna(4)
+    df = df.sort_values("PriorityOrder")  # Sort by priority
+
+    # Tasks without a positive estimate are never planned (validation.validate_tasks quarantines them)
+    plannable = pd.to_numeric(df["Original Estimates"], errors="coerce") > 0
+
+    # Calculate priorities distribution targets per member
+    priorities_list = ["high", "medium", "low", "other"]
+    priority_counts = {}
+    for priority in priorities_list:
+        if priority == "other":
+            count = len(df[~df["Priority"].str.lower().isin(["high", "medium", "low"])])
+        else:
+            count = len(df[df["Priority"].str.lower() == priority])
+        priority_counts[priority] = count
+
+    # Calculate target distribution per member
+    member_count = len(team_members)
+    target_distribution = {
+        priority: max(1, round(count / member_count)) 
+        for priority, count in priority_counts.items() if count > 0
+    }
+
+    # Initialize sprint-specific tracking data
+    sprint_assignments = {}
+    sprint_capacities = {}
+    standard_capacities = {}
+    members_sprint_capacity = {}
+
+    # Set up tracking for each sprint
+    for sprint in range(1, num_sprints + 1):
+        sprint_name = f"Sprint {sprint}"
+        sprint_assignments[sprint_name] = []
+        sprint_capacities[sprint_name] = {member: 0 for member in team_members}
+        standard_capacities[sprint_name] = {}
+
+    # Initialize remaining capacity for each member based on their capacity percentage
+    # This tracks how much capacity is carried forward between sprints
+    remaining_capacity = {member: 0 for member in team_members}
+
+    # Process each sprint
+    for sprint_num in range(1, num_sprints + 1):
+        sprint_name = f"Sprint {sprint_num}"
+
+        # Calculate each member's capacity for this sprint
+        # Base capacity + any remaining capacity from previous sprint
+        for member, full_capacity in team_members.items():
+            if sprint_capacity_plan is not None and member in sprint_capacity_plan.index:
+                # Forecast velocity replaces the fixed share of the member's capacity
+                standard_capacities[sprint_name][member] = float(sprint_capacity_plan.at[member, sprint_name])
+            else:
+                # Calculate what percentage of full time this person is
+                capacity_percentage = full_capacity / (num_sprints * capacity_per_sprint)
+                # Capacity for this sprint is the percentage of the sprint's total hours
+                standard_capacities[sprint_name][member] = capacity_percentage * capacity_per_sprint
+            # Plus any remaining capacity from the previous sprint
+            members_sprint_capacity[member] = standard_capacities[sprint_name][member] + remaining_capacity[member]
+
+        # For logging/debugging: show the capacity for each member in each sprint
+        capacity_summary = ", ".join([f"{m}: {c:.1f}h" for m, c in members_sprint_capacity.items()])
+        log(f"{sprint_name} - Available capacity: {capacity_summary}")
+
+        # Create a copy of tasks that haven't been assigned yet and can be planned
+        unassigned_tasks = df[(df["Assigned To"] == "") & plannable].copy()
+
+        # Skip if no tasks left to assign
+        if len(unassigned_tasks) == 0:
+            continue
+
+        # Create priority task groups for this sprint
+        task_groups = {}
+        for priority in priorities_list:
+            if priority == "other":
+                task_groups[priority] = unassigned_tasks[~unassigned_tasks["Priority"].str.lower().isin(["high", "medium", "low"])].copy()
+            else:
+                task_groups[priority] = unassigned_tasks[unassigned_tasks["Priority"].str.lower() == priority].copy()
+
+            # Sort by estimate within priority group (smaller tasks first for better distribution)
+            if len(task_groups[priority]) > 0:
+                task_groups[priority] = task_groups[priority].sort_values("Original Estimates")
+
+        # Track assigned priorities for this sprint
+        sprint_assigned_priorities = {member: {"high": 0, "medium": 0, "low": 0, "other": 0} for member in team_members}
+
+        # First pass: ensure everyone gets a mix of priorities
+        available_priorities = [p for p in priorities_list if len(task_groups[p]) > 0]
+        current_priority_index = 0
+        cycle_count = 0
+
+        while available_priorities and cycle_count < 100:  # Safety limit
+            cycle_count += 1
+            current_priority = available_priorities[current_priority_index]
+
+            if len(task_groups[current_priority]) == 0:
+                # No more tasks of this priority
+                available_priorities.pop(current_priority_index)
+                if not available_priorities:
+                    break
+                current_priority_index = current_priority_index % len(available_priorities)
+                continue
+
+            # Sort members by who has the least of this priority in this sprint and most remaining capacity
+            members_sorted = sorted(
+                team_members.keys(),
+                key=lambda m: (
+                    sprint_assigned_priorities[m][current_priority],
+                    assigned_priorities[m][current_priority],  # Consider overall assignments too
+                    -members_sprint_capacity[m]  # Negated so higher capacity is first
+                )
+            )
+
+            # Try to assign to first member with capacity
+            task_assigned = False
+            for member in members_sorted:
+                # If no capacity left in this sprint for this member, skip
+                if members_sprint_capacity[member] <= 0:
+                    continue
+
+                # Try to find a task that fits the member's remaining sprint capacity
+                for idx in task_groups[current_priority].index:
+                    task = task_groups[current_priority].loc[idx]
+                    estimate = task["Original Estimates"]
+
+                    if estimate <= members_sprint_capacity[member]:
+                        task_id = task["ID"]
+
+                        # Assign in the original dataframe
+                        df.loc[df["ID"] == task_id, "Assigned To"] = member
+                        df.loc[df["ID"] == task_id, "Sprint"] = sprint_name
+                        df.loc[df["ID"] == task_id, "Iteration Path"] = f"/{sprint_name}/{current_priority}"
+
+                        # Update member statistics (both sprint-specific and overall)
+                        members_sprint_capacity[member] -= estimate
+                        sprint_capacities[sprint_name][member] += estimate
+                        assigned_hours[member] += estimate
+
+                        # Update priority counts
+                        sprint_assigned_priorities[member][current_priority] += 1
+                        assigned_priorities[member][current_priority] += 1
+
+                        # Add to sprint assignments
+                        sprint_assignments[sprint_name].append(task_id)
+
+                        # Remove task from the group
+                        task_groups[current_priority] = task_groups[current_priority].drop(idx)
+
+                        task_assigned = True
+                        break
+
+                if task_assigned:
+                    break
+
+            # If no task assigned this round, move to next priority
+            current_priority_index = (current_priority_index + 1) % len(available_priorities)
+
+            # If we've gone through all priorities and can't assign any more, break
+            if not task_assigned and current_priority_index == 0:
+                break
+
+        # Second pass - assign remaining tasks with balanced approach
+        for priority_level in priorities_list:
+            remaining_tasks = task_groups[priority_level]
+
+            if len(remaining_tasks) == 0:
+                continue
+
+            for idx in remaining_tasks.index:
+                task = remaining_tasks.loc[idx]
+                task_id = task["ID"]
+                estimate = task["Original Estimates"]
+
+                # Sort members by who has the least of this priority and most remaining capacity
+                shuffled_members = sorted(
+                    team_members.keys(),
+                    key=lambda m: (
+                        sprint_assigned_priorities[m][priority_level],
+                        -members_sprint_capacity[m]  # Negated so higher capacity is first
+                    )
+                )
+
+                # Try to assign to the best-fit member with capacity
+                for member in shuffled_members:
+                    if members_sprint_capacity[member] <= 0:
+                        continue
+
+                    if estimate <= members_sprint_capacity[member]:
+                        # Assign in the original dataframe
+                        df.loc[df["ID"] == task_id, "Assigned To"] = member
+                        df.loc[df["ID"] == task_id, "Sprint"] = sprint_name
+                        df.loc[df["ID"] == task_id, "Iteration Path"] = f"/{sprint_name}/{priority_level}"
+
+                        # Update member statistics
+                        members_sprint_capacity[member] -= estimate
+                        sprint_capacities[sprint_name][member] += estimate
+                        assigned_hours[member] += estimate
+
+                        # Update priority counts
+                        sprint_assigned_priorities[member][priority_level] += 1
+                        assigned_priorities[member][priority_level] += 1
+
+                        # Add to sprint assignments
+                        sprint_assignments[sprint_name].append(task_id)
+                        break
+
+        # At the end of the sprint, update the remaining capacity that gets carried forward
+        for member in team_members:
+            remaining_capacity[member] = members_sprint_capacity[member]
+
+        # Log how much capacity is being carried forward
+        remaining_summary = ", ".join([f"{m}: {c:.1f}h" for m, c in remaining_capacity.items()])
+        log(f"{sprint_name} - Remaining capacity carried forward: {remaining_summary}")
+
+    # Clean up
+    if "PriorityOrder" in df.columns:
+        df = df.drop(columns=["PriorityOrder"])
+
+    hash_config = {"num_sprints": num_sprints, "working_days": working_days}
+    if sprint_capacity_plan is not None:
+        # Forecast capacity changes the capacity charts, so it is part of the plan's identity
+        hash_config["standard_capacities"] = standard_capacities
+
+    return {
+        "df": df,
+        "assigned_hours": assigned_hours,
+        "assigned_priorities": assigned_priorities,
+        "team_members": team_members,
+        "plan_hash": plan_hash(df, team_members, **hash_config),
+        "cube": plan_cube(df),
+        "sprint_data": {
+            "sprint_assignments": sprint_assignments,
+            "sprint_capacities": sprint_capacities,
+            "standard_capacities": standard_capacities,
+            "num_sprints": num_sprints,
+            "working_days": working_days
+        }
+    }
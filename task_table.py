@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from bounded_cache import BoundedLRUCache
+from plan_metrics import PRIORITY_LEVELS, priority_bucket
+
+FILTER_COLUMNS = ["Assigned To", "Sprint", "Priority"]
+
+# Task indexes per plan, shared by every session served by this process
+task_index_cache = BoundedLRUCache(max_entries=8, max_bytes=512 * 1024 * 1024)
+
+
+def _positions_by_value(values):
+    """Row positions for each distinct value of a column"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)}
+
+
+def _sort_rank(column):
+    """Position of every row when the column is sorted ascending, missing values last"""
+    try:
+        return column.rank(method="first", na_option="bottom").to_numpy(dtype=np.int64)
+    except TypeError:
+        # Mixed value types, e.g. numeric and text priorities
+        return column.astype(str).rank(method="first").to_numpy(dtype=np.int64)
+
+
+def build_task_index(df):
+    """
+    Precompute everything needed to filter, sort and page a task table without touching the full frame.
+
+    Returns:
+        Dict with the Arrow table, per-value row positions for the filter columns,
+        lowercase search text and sort ranks of every column. The index is shared by
+        every session, so nothing in it is filled in later.
+    """
+    filters = {}
+    for column in FILTER_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = priority_bucket(df[column]) if column == "Priority" else df[column].fillna("").astype(str)
+        filters[column] = _positions_by_value(values.to_numpy())
+
+    title = df["Title"].astype(str) if "Title" in df.columns else ""
+    search_text = (df["ID"].astype(str) + " " + title).str.lower().to_numpy() if "ID" in df.columns else None
+
+    return {
+        "df": df,
+        "table": pa.Table.from_pandas(df, preserve_index=False),
+        "rows": len(df),
+        "filters": filters,
+        "search_text": search_text,
+        "ranks": {column: _sort_rank(df[column]) for column in df.columns}
+    }
+
+
+def get_task_index(plan_key, df):
+    """Task index for a plan, built once per plan hash"""
+    return task_index_cache.get_or_create(("task_index", plan_key), lambda: build_task_index(df))
+
+
+def query_tasks(index, filters=None, text="", sort_by=None, descending=False):
+    """
+    Row positions matching the filters, in display order.
+
+    Args:
+        index: Output of build_task_index
+        filters: Mapping of filter column to the accepted values; empty selections are ignored
+        text: Case-insensitive substring searched in ID and Title
+        sort_by: Column to sort by, or None to keep the plan order
+        descending: Sort direction
+    """
+    mask = np.ones(index["rows"], dtype=bool)
+    for column, accepted in (filters or {}).items():
+        if not accepted or column not in index["filters"]:
+            continue
+        selected = np.zeros(index["rows"], dtype=bool)
+        for value in accepted:
+            selected[index["filters"][column].get(value, [])] = True
+        mask &= selected
+
+    positions = np.flatnonzero(mask)
+
+    if text and index["search_text"] is not None:
+        # Search only the rows that survived the indexed filters
+        matches = pd.Series(index["search_text"][positions]).str.contains(text.lower(), regex=False).to_numpy()
+        positions = positions[matches]
+
+    if sort_by:
+        order = np.argsort(index["ranks"][sort_by][positions], kind="stable")
+        positions = positions[order[::-1] if descending else order]
+
+    return positions
+
+
+def task_page(index, positions, page, page_size):
+    """Arrow table holding only one page of the selected rows"""
+    start = page * page_size
+    return index["table"].take(pa.array(positions[start:start + page_size], type=pa.int64()))
+
+
+def show_task_table(task_index, key, column_config=None, sprint=None):
+    """
+    Filterable, sortable task table that sends only the visible page to the browser.
+
+    Args:
+        task_index: Output of task_table.get_task_index for the plan
+        key: Widget key prefix, unique per table
+        column_config: Column configuration passed to st.dataframe
+        sprint: Restrict the table to one sprint and hide the sprint filter
+    """
+    import streamlit as st
+
+    filter_values = task_index["filters"]
+    filters = {}
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        filters["Assigned To"] = st.multiselect(
+            "Team member", sorted(filter_values.get("Assigned To", {})),
+            format_func=lambda member: member or "Unassigned", key=f"{key}_member"
+        )
+    with col2:
+        if sprint is None:
+            sprint_options = sorted(filter_values.get("Sprint", {}), key=lambda name: (len(name), name))
+            filters["Sprint"] = st.multiselect(
+                "Sprint", sprint_options, format_func=lambda name: name or "Not planned", key=f"{key}_sprint"
+            )
+        else:
+            filters["Sprint"] = [sprint]
+    with col3:
+        filters["Priority"] = st.multiselect(
+            "Priority", [p for p in PRIORITY_LEVELS if p in filter_values.get("Priority", {})],
+            format_func=str.capitalize, key=f"{key}_priority"
+        )
+    with col4:
+        search = st.text_input("Search ID or title", key=f"{key}_search")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Sort by", ["Plan order"] + task_index["table"].column_names, key=f"{key}_sort")
+    with col2:
+        page_size = st.selectbox("Rows per page", [50, 100, 250, 500], key=f"{key}_page_size")
+    with col3:
+        descending = st.checkbox("Descending", key=f"{key}_descending")
+
+    positions = query_tasks(task_index, filters, search, None if sort_by == "Plan order" else sort_by, descending)
+    page_count = max(1, -(-len(positions) // page_size))
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=f"{key}_page") - 1
+
+    st.dataframe(
+        task_page(task_index, positions, page, page_size),
+        column_config=column_config,
+        use_container_width=True,
+        hide_index=True
+    )
+    first_row = page * page_size + 1 if len(positions) else 0
+    st.caption(f"Rows {first_row}-{min(len(positions), (page + 1) * page_size)} of {len(positions)} "
+               f"matching tasks ({task_index['rows']} in plan)")
@@ -0,0 +1,108 @@
+import pandas as pd
+
+# Numeric priorities as used by Azure DevOps (1 is the most urgent)
+NUMERIC_PRIORITIES = {1: "High", 2: "Medium", 3: "Low", 4: "Low"}
+CANONICAL_PRIORITIES = {"high": "High", "medium": "Medium", "low": "Low"}
+
+ISSUE_COLUMNS = ["Row", "ID", "Column", "Value", "Issue", "Action"]
+
+
+def _blank(values):
+    """Missing values and empty or whitespace-only strings"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.isna()
+    return values.isna() | (values.astype(str).str.strip() == "")
+
+
+def _issues(df, mask, column, issue, action):
+    """Issue report rows for the flagged tasks"""
+    flagged = df[mask.to_numpy()]
+    if isinstance(issue, pd.Series):
+        issue = issue.to_numpy()
+    return pd.DataFrame({
+        "Row": flagged.index + 1 if pd.api.types.is_integer_dtype(flagged.index) else flagged.index,
+        "ID": flagged["ID"].astype(str).to_numpy() if "ID" in flagged.columns else "",
+        "Column": column,
+        "Value": flagged[column].astype(str).to_numpy(),
+        "Issue": issue,
+        "Action": action
+    })
+
+
+def normalize_priorities(priority):
+    """
+    Canonical High/Medium/Low spelling for mixed-case, padded or numeric priorities.
+
+    Other values are kept as given and are planned as "other". The mapping is computed
+    once per distinct value, so categorical columns cost one pass over their categories.
+    """
+    uniques = pd.Series(pd.unique(priority.dropna().astype(object)), dtype=object)
+    text = uniques.astype(str).str.strip()
+    numbers = pd.to_numeric(text, errors="coerce")
+    fixed = text.str.lower().map(CANONICAL_PRIORITIES).fillna(numbers.map(NUMERIC_PRIORITIES)).fillna(text)
+    mapping = dict(zip(uniques, fixed))
+
+    normalized = priority.astype(object).map(mapping)
+    if isinstance(priority.dtype, pd.CategoricalDtype):
+        normalized = normalized.astype("category")
+    return normalized
+
+
+def validate_tasks(df):
+    """
+    Coerce task columns to the types the planner expects and quarantine the rows it cannot plan.
+
+    Every check is one vectorized pass over a column:
+    - Priority: mixed case, padding and numeric priorities are normalized (coerced)
+    - ID: missing or duplicated IDs are quarantined
+    - Original Estimates: text is parsed as numbers; missing, non-numeric and
+      non-positive estimates are quarantined
+
+    Returns:
+        (clean tasks, issue report with ISSUE_COLUMNS, quarantined rows with an Issue column)
+    """
+    reports = []
+
+    priority = df["Priority"]
+    normalized = normalize_priorities(priority)
+    coerced = priority.notna() & (normalized.astype(str) != priority.astype(str))
+    reports.append(_issues(df, coerced, "Priority", "Priority normalized to " + normalized[coerced].astype(str), "coerced"))
+
+    id_missing = _blank(df["ID"])
+    id_duplicate = df["ID"].duplicated(keep="first") & ~id_missing
+
+    raw_estimates = df["Original Estimates"]
+    estimates = pd.to_numeric(raw_estimates, errors="coerce")
+    estimate_missing = _blank(raw_estimates)
+    estimate_invalid = estimates.isna() & ~estimate_missing
+    estimate_not_positive = estimates <= 0
+    # Numeric columns were already parsed on load, so text estimates arrive as missing values
+    missing_issue = "Original Estimates is missing"
+    if pd.api.types.is_numeric_dtype(raw_estimates):
+        missing_issue += " or not a number"
+
+    # First failing check names the quarantine reason of each row
+    checks = [
+        (id_missing, "ID", "ID is missing"),
+        (id_duplicate, "ID", "Duplicate ID"),
+        (estimate_missing, "Original Estimates", missing_issue),
+        (estimate_invalid, "Original Estimates", "Original Estimates is not a number"),
+        (estimate_not_positive, "Original Estimates", "Original Estimates is not positive")
+    ]
+    quarantined = pd.Series(False, index=df.index)
+    reason = pd.Series("", index=df.index, dtype=object)
+    for mask, column, issue in checks:
+        reports.append(_issues(df, mask, column, issue, "quarantined"))
+        reason = reason.mask(mask & ~quarantined, issue)
+        quarantined |= mask
+
+    estimate_dtype = raw_estimates.dtype if pd.api.types.is_float_dtype(raw_estimates) else "float32"
+    keep = ~quarantined.to_numpy()
+    clean = df[keep].assign(
+        Priority=normalized[keep].array,
+        **{"Original Estimates": estimates[keep].astype(estimate_dtype).to_numpy()}
+    )
+
+    issues = pd.concat(reports, ignore_index=True).reindex(columns=ISSUE_COLUMNS)
+    quarantine = df[~keep].assign(Issue=reason[~keep].to_numpy())
+    return clean, issues, quarantine
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+
+# Column names accepted for each field of a velocity history export
+HISTORY_COLUMN_ALIASES = {
+    "Sprint": ["Sprint", "Iteration", "Iteration Path"],
+    "Member": ["Member", "Assigned To", "Name"],
+    "Completed": ["Completed", "Completed Work", "Completed Hours", "Hours"],
+}
+
+
+def normalize_velocity_history(df):
+    """
+    Normalize a history of completed work into Sprint / Member / Completed columns.
+
+    Args:
+        df: DataFrame with one row per completed item (or per member and sprint)
+
+    Returns:
+        DataFrame with columns Sprint, Member, Completed, in sprint order
+    """
+    renamed = {}
+    for target, aliases in HISTORY_COLUMN_ALIASES.items():
+        source = next((col for col in aliases if col in df.columns), None)
+        if source is None:
+            raise ValueError(f"Velocity history is missing a '{target}' column (accepted: {', '.join(aliases)})")
+        renamed[source] = target
+
+    history = df[list(renamed)].rename(columns=renamed)
+    history = history.dropna(subset=["Sprint", "Member"])
+    history["Sprint"] = history["Sprint"].astype(str).str.split("\\").str[-1]
+    history["Member"] = history["Member"].astype(str).str.strip()
+    history["Completed"] = pd.to_numeric(history["Completed"], errors="coerce").fillna(0.0)
+
+    # Keep sprints in the order of their finish date when the export has one,
+    # otherwise in the order they first appear in the file
+    if "Finish Date" in df.columns:
+        finish = pd.to_datetime(df.loc[history.index, "Finish Date"], errors="coerce")
+        sprint_order = finish.groupby(history["Sprint"]).max().sort_values().index
+    else:
+        sprint_order = history["Sprint"].unique()
+    history["Sprint"] = pd.Categorical(history["Sprint"], categories=sprint_order, ordered=True)
+
+    return history.sort_values("Sprint", kind="stable").reset_index(drop=True)
+
+
+def load_velocity_history(uploaded_file):
+    """Read a velocity history CSV or Excel file into normalized form"""
+    if getattr(uploaded_file, "name", "").lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(uploaded_file)
+    else:
+        df = pd.read_csv(uploaded_file)
+    return normalize_velocity_history(df)
+
+
+def velocity_matrix(history):
+    """Pivot the history into a members x sprints matrix of completed hours"""
+    return history.pivot_table(
+        index="Member",
+        columns="Sprint",
+        values="Completed",
+        aggfunc="sum",
+        fill_value=0.0,
+        observed=True,
+    )
+
+
+def rolling_velocity(matrix, window=3):
+    """Rolling mean velocity per member over the last `window` sprints"""
+    return matrix.T.rolling(window, min_periods=1).mean().T
+
+
+def forecast_velocity(matrix, num_sprints, window=6):
+    """
+    Forecast per-member velocity for the next sprints with a linear trend.
+
+    A least-squares line is fitted for every member at once over the most
+    recent `window` sprints, then extrapolated. Forecasts never go below zero.
+
+    Args:
+        matrix: Members x sprints matrix from velocity_matrix()
+        num_sprints: Number of future sprints to forecast
+        window: Number of most recent sprints used for the fit
+
+    Returns:
+        DataFrame indexed by member with columns "Sprint 1".."Sprint N"
+    """
+    columns = [f"Sprint {i}" for i in range(1, num_sprints + 1)]
+    if matrix.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    y = matrix.to_numpy(dtype=float)[:, -window:]
+    n = y.shape[1]
+    x = np.arange(n, dtype=float)
+    x_centered = x - x.mean()
+
+    intercept = y.mean(axis=1)
+    denominator = (x_centered ** 2).sum()
+    if denominator > 0:
+        slope = (y - intercept[:, None]) @ x_centered / denominator
+    else:
+        slope = np.zeros(len(y))
+
+    future_x = (n - 1 + np.arange(1, num_sprints + 1)) - x.mean()
+    forecast = np.clip(intercept[:, None] + slope[:, None] * future_x[None, :], 0, None)
+
+    return pd.DataFrame(forecast, index=matrix.index, columns=columns)